@@ -0,0 +1,219 @@
+"""Internal lead dashboard: streamlit run admin.py
+
+Reads the counters app.py maintains at write time, so a render costs the
+number of days, states and insurance types, not the number of leads.
+"""
+import hmac
+import os
+import tempfile
+from datetime import date, timedelta
+
+import pandas as pd
+import streamlit as st
+
+from catalog import INSURANCE_TYPES, LICENSED_STATES
+from export import FORMATS, export_to_file, filter_leads
+from health import load_health
+from journal import read_pending, slot_path
+from lead_stats import DAY, STATE, STATS_COLUMNS, TYPE, LeadStats, load_snapshot
+from lead_store import CsvLeadStore, SheetsLeadStore, SqliteLeadStore
+from sheets import QuotaGovernor, SheetsConnection
+from storage import LEAD_COLUMNS
+
+# Same settings and files as app.py
+SHEET_NAME = "Insurance Leads"
+WORKSHEET_NAME = "Sheet1"
+LEAD_STORE = os.environ.get('UIS_LEAD_STORE', 'sheets')
+CSV_FILE = 'insurance_leads_backup.csv'
+SQLITE_FILE = 'insurance_leads.db'
+STATS_FILE = 'insurance_leads_stats.json'
+JOURNAL_FILE = 'insurance_leads_journal.jsonl'
+JOURNAL_SLOTS = 16
+HEALTH_FILE = 'insurance_leads_health.json'
+
+st.set_page_config(page_title="Lead Dashboard - Universal Insurance Solutions", page_icon="📊", layout="wide")
+
+
+def check_password():
+    """Require st.secrets['admin_password']; the page shows and exports every lead's contact details"""
+    try:
+        password = str(st.secrets['admin_password'])
+    except Exception as e:
+        password = ''
+    if not password:
+        st.error("The dashboard is disabled until admin_password is set in .streamlit/secrets.toml.")
+        return False
+    if st.session_state.get('admin_ok'):
+        return True
+    entered = st.text_input("Admin password", type="password")
+    if entered and hmac.compare_digest(entered.encode('utf-8'), password.encode('utf-8')):
+        st.session_state.admin_ok = True
+        return True
+    return False
+
+
+@st.cache_data(ttl=30)
+def load_stats(mtime):
+    """Snapshot counts; mtime is part of the cache key so a new snapshot is picked up at once"""
+    return load_snapshot(STATS_FILE)
+
+
+@st.cache_resource
+def quota_governor():
+    """Admits this dashboard's Sheets calls, so rebuilds and exports stay under the per-minute quotas"""
+    return QuotaGovernor()
+
+
+def open_store():
+    """The store app.py writes to, for rebuilding the counters and for exports"""
+    if LEAD_STORE == 'sqlite':
+        return SqliteLeadStore(SQLITE_FILE)
+    if LEAD_STORE == 'sheets':
+        try:
+            creds_dict = dict(st.secrets["gcp_service_account"])
+        except Exception as e:
+            return CsvLeadStore(CSV_FILE)
+        import gspread
+        worksheet = gspread.service_account_from_dict(creds_dict).open(SHEET_NAME).worksheet(WORKSHEET_NAME)
+        return SheetsLeadStore(SheetsConnection(lambda: worksheet, governor=quota_governor()))
+    return CsvLeadStore(CSV_FILE)
+
+
+def all_leads(columns=LEAD_COLUMNS):
+    """Every lead in the store, plus leads that fell back to the backup CSV"""
+    store = open_store()
+    try:
+        yield from store.leads(columns)
+        if store.name != 'csv':
+            yield from CsvLeadStore(CSV_FILE).leads(columns)
+    finally:
+        store.close()
+
+
+def pending_leads():
+    """Leads app.py has accepted but not delivered to the store yet, from every journal slot"""
+    for slot in range(JOURNAL_SLOTS):
+        yield from read_pending(slot_path(JOURNAL_FILE, slot)).values()
+
+
+def rebuild_stats():
+    LeadStats(STATS_FILE).rebuild(all_leads(STATS_COLUMNS), pending_leads())
+
+
+def export_leads(file_format, start, end, states, types):
+    """Build the export in a temporary file, streaming leads through in chunks"""
+    f = tempfile.TemporaryFile()
+    export_to_file(filter_leads(all_leads(), start, end, states, types), file_format, f)
+    f.seek(0)
+    return f
+
+
+def bucket_frame(counts, keys, label):
+    """Counts for every expected key, zeros included, plus anything unexpected as 'Other'"""
+    rows = {key: counts.get(key, 0) for key in keys}
+    other = sum(n for key, n in counts.items() if key not in rows)
+    if other:
+        rows['Other'] = other
+    return pd.DataFrame({label: list(rows), 'Leads': list(rows.values())}).set_index(label)
+
+
+if not check_password():
+    st.stop()
+
+st.title("📊 Lead Dashboard")
+
+mtime = os.path.getmtime(STATS_FILE) if os.path.exists(STATS_FILE) else 0.0
+stats = load_stats(mtime)
+
+today = date.today()
+days = st.selectbox("Period", [7, 30, 90, 365], index=1, format_func=lambda n: f"Last {n} days")
+period = [(today - timedelta(days=offset)).isoformat() for offset in range(days - 1, -1, -1)]
+
+col1, col2, col3 = st.columns(3)
+col1.metric("Total leads", f"{stats['total']:,}")
+col2.metric("Today", f"{stats[DAY].get(today.isoformat(), 0):,}")
+col3.metric(f"Last {days} days", f"{sum(stats[DAY].get(day, 0) for day in period):,}")
+
+st.subheader("Leads per day")
+st.bar_chart(bucket_frame({day: stats[DAY].get(day, 0) for day in period}, period, 'Day'))
+
+col1, col2 = st.columns(2)
+with col1:
+    st.subheader("By state")
+    st.bar_chart(bucket_frame(stats[STATE], LICENSED_STATES, 'State'), horizontal=True)
+with col2:
+    st.subheader("By insurance type")
+    st.bar_chart(bucket_frame(stats[TYPE], list(INSURANCE_TYPES), 'Insurance type'), horizontal=True)
+
+st.caption(f"Counters updated {pd.Timestamp(mtime, unit='s'):%Y-%m-%d %H:%M:%S} UTC" if mtime
+           else "No leads recorded yet")
+if st.button("Rebuild counters from the lead store"):
+    with st.spinner("Counting every stored lead..."):
+        rebuild_stats()
+    st.rerun()
+
+st.subheader("Sheets health")
+health = load_health(HEALTH_FILE)
+if health is None:
+    st.caption("app.py has not reported yet")
+else:
+    sheets_health = health.get('sheets') or {}
+    store_health = health.get('store') or {}
+    token_health = health.get('token_refresher') or {}
+    write_p99 = (store_health.get('write_latency') or {}).get('p99_ms')
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Circuit breaker", sheets_health.get('state', 'n/a'),
+                f"opened {sheets_health['times_opened']}x" if 'times_opened' in sheets_health else None,
+                delta_color="off")
+    col2.metric("Rows waiting to be written",
+                f"{store_health['queued_rows']:,}" if 'queued_rows' in store_health else "n/a")
+    col3.metric("Write p99", f"{write_p99:,.0f} ms" if write_p99 is not None else "n/a")
+    col4.metric("Token refreshes", f"{token_health['refreshes']:,}" if 'refreshes' in token_health else "n/a",
+                f"{token_health['failures']} failed" if token_health.get('failures') else None, delta_color="off")
+    # A source whose stats() raised is reported as {'error': ...}
+    for label, source in (("Sheets", sheets_health), ("Store", store_health), ("Token refresh", token_health)):
+        error = source.get('error') or source.get('last_error')
+        if error:
+            st.warning(f"{label}: {error}")
+    quota = sheets_health.get('quota')
+    if quota:
+        st.dataframe(pd.DataFrame({kind: {
+            'Tokens left': f"{max(0, levels['tokens']):g} of {levels['capacity']}",
+            'Calls': levels['calls'],
+            'Throttled': levels['throttled_calls'],
+            'Deferred': levels['deferred_calls'],
+            'Wait p99 ms': round(levels['wait_p99_ms']),
+            'Total wait s': levels['total_wait_s'],
+        } for kind, levels in quota.items()}).T.rename_axis('Sheets quota'))
+    latency = sheets_health.get('latency')
+    if latency:
+        st.dataframe(pd.DataFrame.from_dict({method: {
+            'Calls': summary['count'],
+            'p50 ms': summary['p50_ms'],
+            'p99 ms': summary['p99_ms'],
+            'Max ms': summary['max_ms'],
+        } for method, summary in latency.items()}, orient='index').rename_axis('Sheets call latency'))
+    with st.expander("All metrics"):
+        st.json(health)
+    st.caption(f"Reported by process {health.get('pid', 'n/a')} at "
+               f"{pd.Timestamp(health.get('updated', 0), unit='s'):%Y-%m-%d %H:%M:%S} UTC")
+
+st.subheader("Export leads")
+col1, col2 = st.columns(2)
+with col1:
+    export_dates = st.date_input("Dates", value=(today - timedelta(days=days - 1), today))
+    # Only the start is set while the range is being picked
+    export_start, export_end = export_dates[0], export_dates[-1]
+    export_format = st.selectbox("Format", list(FORMATS), format_func=str.upper)
+with col2:
+    export_states = st.multiselect("States", LICENSED_STATES, placeholder="All states")
+    export_types = st.multiselect("Insurance types", list(INSURANCE_TYPES), placeholder="All types")
+_, mime, extension = FORMATS[export_format]
+# The export only runs when the button is clicked, on its own thread
+st.download_button(
+    "Download export",
+    data=lambda: export_leads(export_format, export_start.isoformat(), export_end.isoformat(),
+                              export_states, export_types),
+    file_name=f"leads_{export_start:%Y%m%d}_{export_end:%Y%m%d}.{extension}",
+    mime=mime,
+)
@@ -1,10 +1,28 @@
 import streamlit as st
-import pandas as pd
 from datetime import datetime
-import re
-import gspread
-from google.oauth2.service_account import Credentials
-import json
+import os
+import hashlib
+import atexit
+import math
+import time
+import itertools
+import threading
+from storage import LEAD_COLUMNS, append_lead_csv
+from journal import LeadJournal, JournalReplayer
+from sheets import QuotaGovernor, SheetsConnection, TokenRefresher, ensure_header
+from lead_store import CsvLeadStore, SheetsLeadStore, SqliteLeadStore
+from write_queue import LeadWriteQueue
+from perf import start_run
+from dedupe import LEAD_KEY_COLUMNS, LeadIndex
+from catalog import INSURANCE_TYPES, LICENSED_STATES
+from lead_stats import STATS_COLUMNS, LeadStats
+from health import HealthReporter
+from validation import normalize_email, normalize_phone, validate_email, validate_name, validate_phone
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+
+# Per-rerun profiling, a no-op unless UIS_PERF=1
+run_profile = start_run()
 
 # Page configuration
 st.set_page_config(
@@ -14,1527 +32,342 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
-# Force light theme in page config
-st.markdown("""
-    <meta name="viewport" content="width=device-width, initial-scale=1.0, maximum-scale=1.0, user-scalable=no">
-    <style>
-    /* Additional theme overrides for Streamlit Cloud */
-    .stApp {
-        background: #FFFFFF !important;
-    }
-    
-    /* Override any dark theme that might be applied by Streamlit Cloud */
-    [data-testid="stAppViewContainer"] {
-        background: #FFFFFF !important;
-    }
-    
-    
-    
-    
-    </style>
-""", unsafe_allow_html=True)
+@st.cache_data
+def static_asset_url(filename):
+    """URL of a file in ./static with a content hash, so browsers cache it until it changes"""
+    with open(os.path.join(STATIC_DIR, filename), 'rb') as f:
+        digest = hashlib.sha256(f.read()).hexdigest()[:12]
+    return f"app/static/{filename}?v={digest}"
 
-# Modern Professional CSS with Responsive Design
-st.markdown("""
-    <style>
-    /* Import Google Fonts */
-    @import url('https://fonts.googleapis.com/css2?family=Poppins:wght@400;500;600;700;800&family=Montserrat:wght@400;500;600;700&display=swap');
-    
-    /* Force Light Theme - Override Streamlit's default dark theme */
-    .stApp {
-        background-color: #FFFFFF !important;
-        color: #1F2937 !important;
-    }
-    
-    .stApp > header {
-        background-color: #FFFFFF !important;
-    }
-    
-    .stApp > div {
-        background-color: #FFFFFF !important;
-    }
-    
-    /* Override Streamlit's dark theme variables */
-    :root {
-        --primary-color: #3B82F6 !important;
-        --background-color: #FFFFFF !important;
-        --secondary-background-color: #F8FAFC !important;
-        --text-color: #1F2937 !important;
-        --font: 'Montserrat', sans-serif !important;
-    }
-    
-    /* Force light theme on all Streamlit components */
-    .stApp > div > div > div > div {
-        background-color: #FFFFFF !important;
-        color: #1F2937 !important;
-    }
-    
-    /* Global Styles */
-    * {
-        font-family: 'Montserrat', -apple-system, BlinkMacSystemFont, sans-serif;
-    }
-    
-    .main {
-        padding: 0;
-        max-width: 1400px;
-        margin: 0 auto;
-        background: linear-gradient(135deg, #F8FAFC 0%, #F1F5F9 50%, #E2E8F0 100%);
-        min-height: 100vh;
-        position: relative;
-    }
-    
-    .main::before {
-        content: '';
-        position: fixed;
-        top: 0;
-        left: 0;
-        right: 0;
-        bottom: 0;
-        background: url("data:image/svg+xml,%3Csvg width='60' height='60' viewBox='0 0 60 60' xmlns='http://www.w3.org/2000/svg'%3E%3Cg fill='none' fill-rule='evenodd'%3E%3Cg fill='%23CBD5E1' fill-opacity='0.03'%3E%3Cpath d='M36 34v-4h-2v4h-4v2h4v4h2v-4h4v-2h-4zm0-30V0h-2v4h-4v2h4v4h2V6h4V4h-4zM6 34v-4H4v4H0v2h4v4h2v-4h4v-2H6zM6 4V0H4v4H0v2h4v4h2V6h4V4H6z'/%3E%3C/g%3E%3C/g%3E%3C/svg%3E");
-        pointer-events: none;
-        z-index: 0;
-    }
-    
-    /* Modern Button Styling */
-    .stButton>button {
-        background: linear-gradient(135deg, #1D4ED8 0%, #2563EB 100%);
-        color: white;
-        border: none;
-        padding: 14px 28px;
-        font-size: 16px;
-        font-weight: 600;
-        font-family: 'Montserrat', sans-serif;
-        border-radius: 12px;
-        transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1);
-        box-shadow: 0 4px 6px -1px rgba(29, 78, 216, 0.15), 0 2px 4px -1px rgba(29, 78, 216, 0.1);
-        width: 100%;
-        letter-spacing: 0.025em;
-    }
-    
-    .stButton>button:hover {
-        transform: translateY(-2px);
-        box-shadow: 0 20px 25px -5px rgba(29, 78, 216, 0.2), 0 10px 10px -5px rgba(29, 78, 216, 0.1);
-        background: linear-gradient(135deg, #1E40AF 0%, #1D4ED8 100%);
-    }
-    
-    /* Hero Section */
-    .hero-section {
-        background: linear-gradient(135deg, #1E3A8A 0%, #3B82F6 50%, #60A5FA 100%);
-        padding: 30px 25px;
-        border-radius: 20px;
-        margin-bottom: 20px;
-        position: relative;
-        overflow: hidden;
-        box-shadow: 0 20px 40px -10px rgba(30, 58, 138, 0.3), 0 0 0 1px rgba(255, 255, 255, 0.1);
-        border: none;
-        backdrop-filter: blur(10px);
-    }
-    
-    .hero-section::before {
-        content: '';
-        position: absolute;
-        top: 0;
-        right: 0;
-        width: 40%;
-        height: 100%;
-        background: url("data:image/svg+xml,%3Csvg width='60' height='60' viewBox='0 0 60 60' xmlns='http://www.w3.org/2000/svg'%3E%3Cg fill='none' fill-rule='evenodd'%3E%3Cg fill='%239C92AC' fill-opacity='0.05'%3E%3Cpath d='M36 34v-4h-2v4h-4v2h4v4h2v-4h4v-2h-4zm0-30V0h-2v4h-4v2h4v4h2V6h4V4h-4zM6 34v-4H4v4H0v2h4v4h2v-4h4v-2H6zM6 4V0H4v4H0v2h4v4h2V6h4V4H6z'/%3E%3C/g%3E%3C/g%3E%3C/svg%3E");
-        opacity: 0.1;
-    }
-    
-    .hero-title {
-        color: white;
-        font-family: 'Poppins', sans-serif;
-        font-size: clamp(24px, 4vw, 32px);
-        font-weight: 700;
-        margin: 0;
-        line-height: 1.1;
-        position: relative;
-        z-index: 1;
-        text-shadow: 0 2px 4px rgba(0, 0, 0, 0.1);
-    }
-    
-    .hero-subtitle {
-        color: #E2E8F0;
-        font-family: 'Poppins', sans-serif;
-        font-size: clamp(14px, 2vw, 18px);
-        margin-top: 8px;
-        font-weight: 500;
-        position: relative;
-        z-index: 1;
-    }
-    
-    .hero-badges {
-        display: flex;
-        gap: 6px;
-        margin-top: 12px;
-        flex-wrap: wrap;
-        position: relative;
-        z-index: 1;
-        justify-content: center;
-    }
-    
-    .badge {
-        background: rgba(255, 255, 255, 0.2);
-        padding: 4px 10px;
-        border-radius: 16px;
-        color: white;
-        font-family: 'Montserrat', sans-serif;
-        font-size: 11px;
-        font-weight: 600;
-        border: 1px solid rgba(255, 255, 255, 0.3);
-        backdrop-filter: blur(10px);
-        transition: all 0.3s ease;
-        white-space: nowrap;
-    }
-    
-    .badge:hover {
-        background: rgba(255, 255, 255, 0.3);
-        transform: translateY(-1px);
-    }
-    
-    .hero-benefits {
-        display: flex;
-        flex-wrap: wrap;
-        gap: 12px;
-        margin-top: 20px;
-        justify-content: center;
-    }
-    
-    .hero-benefit-item {
-        background: rgba(255, 255, 255, 0.9);
-        padding: 10px 16px;
-        border-radius: 20px;
-        border: none;
-        transition: all 0.3s ease;
-        box-shadow: 0 2px 4px rgba(0, 0, 0, 0.1);
-        backdrop-filter: blur(10px);
-        min-width: 140px;
-        text-align: center;
-    }
-    
-    .hero-benefit-item:hover {
-        background: rgba(255, 255, 255, 1);
-        transform: translateY(-2px);
-        box-shadow: 0 4px 8px rgba(0, 0, 0, 0.15);
-    }
-    
-    .hero-benefit-item strong {
-        color: #1E3A8A;
-        font-family: 'Poppins', sans-serif;
-        font-size: 13px;
-        font-weight: 600;
-        display: block;
-        margin-bottom: 4px;
-    }
-    
-    .hero-benefit-item span {
-        color: #6B7280;
-        font-family: 'Inter', sans-serif;
-        font-size: 11px;
-        font-weight: 500;
-        display: block;
-    }
-    
-    /* Card Styling */
-    .expertise-card {
-        background: rgba(255, 255, 255, 0.9);
-        padding: 12px;
-        border-radius: 12px;
-        margin-bottom: 8px;
-        border: 1px solid rgba(255, 255, 255, 0.3);
-        transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1);
-        box-shadow: 0 4px 6px -1px rgba(0, 0, 0, 0.1), 0 2px 4px -1px rgba(0, 0, 0, 0.06);
-        backdrop-filter: blur(10px);
-        position: relative;
-        overflow: hidden;
-    }
-    
-    .expertise-card::before {
-        content: '';
-        position: absolute;
-        top: 0;
-        left: 0;
-        width: 3px;
-        height: 100%;
-        background: linear-gradient(135deg, #3B82F6 0%, #1D4ED8 100%);
-        transition: width 0.3s ease;
-    }
-    
-    .expertise-card:hover {
-        transform: translateX(6px) translateY(-2px);
-        box-shadow: 0 20px 25px -5px rgba(29, 78, 216, 0.15), 0 10px 10px -5px rgba(29, 78, 216, 0.1);
-        border-color: #3B82F6;
-        background: rgba(255, 255, 255, 0.95);
-    }
-    
-    .expertise-card:hover::before {
-        width: 5px;
-    }
-    
-    .expertise-title {
-        color: #1F2937;
-        font-family: 'Poppins', sans-serif;
-        font-size: 14px;
-        font-weight: 600;
-        margin: 0 0 4px 0;
-        display: flex;
-        align-items: center;
-        gap: 8px;
-        line-height: 1.3;
-        letter-spacing: 0.025em;
-        position: relative;
-        z-index: 1;
-    }
-    
-    .expertise-description {
-        color: #4B5563;
-        font-family: 'Inter', sans-serif;
-        font-size: 12px;
-        margin: 0;
-        line-height: 1.4;
-        font-weight: 500;
-        letter-spacing: 0.01em;
-        position: relative;
-        z-index: 1;
-    }
-    
-    /* Form Section */
-    .form-container {
-        background: rgba(255, 255, 255, 0.95);
-        padding: 25px;
-        border-radius: 20px;
-        box-shadow: 0 25px 50px -12px rgba(0, 0, 0, 0.15), 0 0 0 1px rgba(255, 255, 255, 0.8);
-        border: 1px solid rgba(255, 255, 255, 0.2);
-        backdrop-filter: blur(20px);
-        position: relative;
-        z-index: 1;
-    }
-    
-    .form-header {
-        color: #1F2937;
-        font-family: 'Poppins', sans-serif;
-        font-size: 22px;
-        font-weight: 600;
-        margin-bottom: 8px;
-    }
-    
-    .form-subheader {
-        color: #4B5563;
-        font-family: 'Montserrat', sans-serif;
-        font-size: 15px;
-        margin-bottom: 16px;
-        font-weight: 400;
-    }
-    
-    /* Input Fields */
-    .stTextInput>div>div>input,
-    .stSelectbox>div>div>div,
-    .stTextArea>div>div>textarea {
-        border-radius: 12px !important;
-        border: 2px solid #E5E7EB !important;
-        padding: 16px 20px !important;
-        font-size: 15px !important;
-        font-family: 'Inter', sans-serif !important;
-        font-weight: 500 !important;
-        transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1) !important;
-        background: rgba(255, 255, 255, 0.9) !important;
-        color: #1F2937 !important;
-        box-shadow: 0 4px 6px -1px rgba(0, 0, 0, 0.1), 0 2px 4px -1px rgba(0, 0, 0, 0.06) !important;
-        outline: none !important;
-        backdrop-filter: blur(10px) !important;
-    }
-    
-    /* Dropdown Arrow Styling - Hide custom arrow and style default */
-    .stSelectbox>div>div>div::after {
-        display: none !important;
-    }
-    
-    /* Style the default Streamlit dropdown arrow */
-    .stSelectbox>div>div>div[role="combobox"]::after,
-    .stSelectbox>div>div>div[role="combobox"]:after,
-    .stSelectbox>div>div>div::after {
-        color: #374151 !important;
-        font-size: 12px !important;
-    }
-    
-    .stSelectbox>div>div>div[role="combobox"]:hover::after,
-    .stSelectbox>div>div>div:hover::after {
-        color: #1F2937 !important;
-    }
-    
-    .stSelectbox>div>div>div[role="combobox"]:focus::after,
-    .stSelectbox>div>div>div:focus::after {
-        color: #3B82F6 !important;
-    }
-    
-    /* Target the specific Streamlit dropdown arrow element */
-    .stSelectbox div[data-baseweb="select"] div[role="combobox"]::after,
-    .stSelectbox div[data-baseweb="select"] div[role="combobox"]:after {
-        color: #374151 !important;
-        font-size: 12px !important;
-    }
-    
-    .stSelectbox div[data-baseweb="select"] div[role="combobox"]:hover::after {
-        color: #1F2937 !important;
-    }
-    
-    .stSelectbox div[data-baseweb="select"] div[role="combobox"]:focus::after {
-        color: #3B82F6 !important;
-    }
-    
-    /* Target SVG arrows specifically */
-    .stSelectbox svg {
-        color: #1F2937 !important;
-        fill: #1F2937 !important;
-        stroke: #1F2937 !important;
-    }
-    
-    .stSelectbox svg:hover {
-        color: #111827 !important;
-        fill: #111827 !important;
-        stroke: #111827 !important;
-    }
-    
-    .stSelectbox svg:focus {
-        color: #3B82F6 !important;
-        fill: #3B82F6 !important;
-        stroke: #3B82F6 !important;
-    }
-    
-    /* Target all possible arrow elements */
-    .stSelectbox [data-baseweb="select"] svg,
-    .stSelectbox [role="combobox"] svg,
-    .stSelectbox div[role="combobox"] svg {
-        color: #1F2937 !important;
-        fill: #1F2937 !important;
-        stroke: #1F2937 !important;
-    }
-    
-    .stTextInput>div>div>input:hover,
-    .stSelectbox>div>div>div:hover,
-    .stTextArea>div>div>textarea:hover {
-        border-color: #9CA3AF !important;
-        box-shadow: 0 2px 4px -1px rgba(0, 0, 0, 0.1) !important;
-        transform: translateY(-1px) !important;
-    }
-    
-    .stTextInput>div>div>input:focus,
-    .stSelectbox>div>div>div:focus,
-    .stTextArea>div>div>textarea:focus {
-        border-color: #3B82F6 !important;
-        box-shadow: 0 0 0 4px rgba(59, 130, 246, 0.15), 0 10px 15px -3px rgba(0, 0, 0, 0.1), 0 4px 6px -2px rgba(0, 0, 0, 0.05) !important;
-        background: rgba(255, 255, 255, 1) !important;
-        color: #1F2937 !important;
-        font-family: 'Inter', sans-serif !important;
-        transform: translateY(-2px) !important;
-    }
-    
-    /* Dropdown Options Styling */
-    .stSelectbox>div>div>div[role="combobox"] {
-        cursor: pointer !important;
-    }
-    
-    .stSelectbox>div>div>div[role="combobox"]:hover {
-        border-color: #9CA3AF !important;
-        box-shadow: 0 2px 4px -1px rgba(0, 0, 0, 0.1) !important;
-    }
-    
-    /* Dropdown Menu Styling */
-    .stSelectbox>div>div>div[role="listbox"] {
-        background: white !important;
-        border: 1px solid #D1D5DB !important;
-        border-radius: 8px !important;
-        box-shadow: 0 10px 15px -3px rgba(0, 0, 0, 0.1), 0 4px 6px -2px rgba(0, 0, 0, 0.05) !important;
-        z-index: 1000 !important;
-    }
-    
-    .stSelectbox>div>div>div[role="option"] {
-        color: #1F2937 !important;
-        font-family: 'Inter', sans-serif !important;
-        font-size: 15px !important;
-        padding: 12px 16px !important;
-        background: white !important;
-    }
-    
-    .stSelectbox>div>div>div[role="option"]:hover {
-        background: #F3F4F6 !important;
-        color: #1F2937 !important;
-    }
-    
-    .stSelectbox>div>div>div[role="option"][aria-selected="true"] {
-        background: #3B82F6 !important;
-        color: white !important;
-    }
-    
-    /* Labels */
-    .stTextInput>label,
-    .stSelectbox>label,
-    .stTextArea>label {
-        color: #1F2937 !important;
-        font-family: 'Inter', sans-serif !important;
-        font-weight: 500 !important;
-        font-size: 14px !important;
-        margin-bottom: 8px !important;
-        letter-spacing: 0.025em !important;
-    }
-    
-    /* Why Choose Us Section */
-    .benefits-grid {
-        display: grid;
-        grid-template-columns: repeat(2, 1fr);
-        gap: 6px;
-        margin-top: 8px;
-    }
-    
-    .benefit-item {
-        background: linear-gradient(135deg, #F8FAFC 0%, #F1F5F9 100%);
-        padding: 6px;
-        border-radius: 6px;
-        border-left: 2px solid #3B82F6;
-        transition: all 0.3s;
-    }
-    
-    .benefit-item:hover {
-        transform: translateY(-2px);
-        box-shadow: 0 4px 6px -1px rgba(0, 0, 0, 0.1);
-    }
-    
-    /* Success Message */
-    .success-animation {
-        background: linear-gradient(135deg, #10B981 0%, #059669 100%);
-        color: white;
-        padding: 30px;
-        border-radius: 20px;
-        text-align: center;
-        font-family: 'Inter', sans-serif;
-        font-size: 20px;
-        font-weight: 600;
-        box-shadow: 0 25px 50px -12px rgba(16, 185, 129, 0.3), 0 0 0 1px rgba(255, 255, 255, 0.1);
-        animation: slideInBounce 0.8s cubic-bezier(0.68, -0.55, 0.265, 1.55);
-        backdrop-filter: blur(20px);
-        position: relative;
-        overflow: hidden;
-    }
-    
-    .success-animation::before {
-        content: '';
-        position: absolute;
-        top: 0;
-        left: -100%;
-        width: 100%;
-        height: 100%;
-        background: linear-gradient(90deg, transparent, rgba(255, 255, 255, 0.2), transparent);
-        animation: shimmer 2s infinite;
-    }
-    
-    @keyframes slideInBounce {
-        0% {
-            transform: translateY(-30px) scale(0.8);
-            opacity: 0;
-        }
-        50% {
-            transform: translateY(10px) scale(1.05);
-            opacity: 0.8;
-        }
-        100% {
-            transform: translateY(0) scale(1);
-            opacity: 1;
-        }
-    }
-    
-    @keyframes shimmer {
-        0% {
-            left: -100%;
-        }
-        100% {
-            left: 100%;
-        }
-    }
-    
-    /* Footer */
-    .footer {
-        background: linear-gradient(135deg, #F9FAFB 0%, #F3F4F6 100%);
-        padding: 20px;
-        border-radius: 16px;
-        margin-top: 20px;
-        text-align: center;
-        border: 1px solid #E5E7EB;
-    }
-    
-    .footer-title {
-        color: #1F2937;
-        font-family: 'Poppins', sans-serif;
-        font-size: 18px;
-        font-weight: 600;
-        margin-bottom: 10px;
-    }
-    
-    .footer-contact {
-        color: #4B5563;
-        font-family: 'Inter', sans-serif;
-        font-size: 14px;
-        margin-bottom: 6px;
-        font-weight: 400;
-    }
-    
-    .footer-link {
-        color: #3B82F6;
-        font-weight: 600;
-        text-decoration: none;
-    }
-    
-    /* Mobile Responsive Design */
-    @media (max-width: 768px) {
-        /* Main container adjustments */
-        .main {
-            padding: 0 10px !important;
-            margin: 0 !important;
-        }
-        
-        /* Hero section mobile optimization */
-        .hero-section {
-            padding: 20px 15px !important;
-            margin: 10px 0 !important;
-            border-radius: 12px !important;
-        }
-        
-        .hero-title {
-            font-size: clamp(24px, 6vw, 32px) !important;
-            line-height: 1.2 !important;
-            margin-bottom: 8px !important;
-        }
-        
-        .hero-subtitle {
-            font-size: clamp(14px, 4vw, 18px) !important;
-            line-height: 1.3 !important;
-            margin-bottom: 15px !important;
-        }
-        
-        .hero-badges {
-            display: flex !important;
-            flex-wrap: wrap !important;
-            gap: 6px !important;
-            justify-content: center !important;
-            margin-top: 15px !important;
-        }
-        
-        .badge {
-            padding: 6px 12px !important;
-            font-size: 11px !important;
-            border-radius: 20px !important;
-            white-space: nowrap !important;
-        }
-        
-        /* Column layout for mobile */
-        div[data-testid="column"] {
-            padding: 0 5px !important;
-            margin-bottom: 15px !important;
-        }
-        
-        /* Expertise section mobile */
-        .expertise-container {
-            margin-bottom: 20px !important;
-        }
-        
-        .expertise-card {
-            padding: 12px !important;
-            margin-bottom: 8px !important;
-            border-radius: 8px !important;
-        }
-        
-        .expertise-title {
-            font-size: 14px !important;
-            margin-bottom: 6px !important;
-        }
-        
-        .expertise-description {
-            font-size: 12px !important;
-            line-height: 1.4 !important;
-        }
-        
-        /* Form container mobile */
-        .form-container {
-            padding: 20px 15px !important;
-            margin: 10px 0 !important;
-            border-radius: 12px !important;
-        }
-        
-        .form-header {
-            font-size: 20px !important;
-            margin-bottom: 8px !important;
-        }
-        
-        .form-subheader {
-            font-size: 14px !important;
-            margin-bottom: 20px !important;
-        }
-        
-        /* Input fields mobile */
-        .stTextInput>div>div>input,
-        .stSelectbox>div>div>div,
-        .stTextArea>div>div>textarea {
-            padding: 14px 16px !important;
-            font-size: 16px !important;
-            border-radius: 8px !important;
-        }
-        
-        .stTextInput>label,
-        .stSelectbox>label,
-        .stTextArea>label {
-            font-size: 14px !important;
-            margin-bottom: 6px !important;
-        }
-        
-        /* Button mobile */
-        .stButton>button {
-            font-size: 16px !important;
-            padding: 14px 24px !important;
-            width: 100% !important;
-            border-radius: 8px !important;
-        }
-        
-        /* Benefits grid mobile */
-        .benefits-grid {
-            grid-template-columns: 1fr !important;
-            gap: 8px !important;
-            margin-top: 15px !important;
-        }
-        
-        .benefit-item {
-            padding: 12px !important;
-            border-radius: 8px !important;
-        }
-        
-        /* Contact information mobile */
-        .contact-info {
-            margin-top: 20px !important;
-            padding: 15px !important;
-            border-radius: 10px !important;
-        }
-        
-        /* Success animation mobile */
-        .success-animation {
-            padding: 20px !important;
-            font-size: 16px !important;
-            border-radius: 12px !important;
-        }
-        
-        /* Hide Streamlit sidebar on mobile */
-        .stApp > div[data-testid="stSidebar"] {
-            display: none !important;
-        }
-        
-        /* Force single column layout */
-        .stApp > div[data-testid="stAppViewContainer"] > div {
-            padding: 0 !important;
-        }
-    }
-    
-    /* Extra small mobile devices */
-    @media (max-width: 480px) {
-        .main {
-            padding: 0 5px !important;
-        }
-        
-        .hero-section {
-            padding: 15px 10px !important;
-        }
-        
-        .hero-title {
-            font-size: clamp(20px, 7vw, 28px) !important;
-        }
-        
-        .hero-subtitle {
-            font-size: clamp(12px, 4vw, 16px) !important;
-        }
-        
-        .badge {
-            padding: 4px 8px !important;
-            font-size: 10px !important;
-        }
-        
-        .form-container {
-            padding: 15px 10px !important;
-        }
-        
-        .stTextInput>div>div>input,
-        .stSelectbox>div>div>div,
-        .stTextArea>div>div>textarea {
-            padding: 12px 14px !important;
-            font-size: 16px !important;
-        }
-        
-        .stButton>button {
-            padding: 12px 20px !important;
-            font-size: 15px !important;
-        }
-    }
-    
-    /* Landscape mobile orientation */
-    @media (max-width: 768px) and (orientation: landscape) {
-        .hero-section {
-            padding: 15px 20px !important;
-        }
-        
-        .hero-badges {
-            flex-wrap: wrap !important;
-            gap: 4px !important;
-        }
-        
-        .badge {
-            padding: 4px 8px !important;
-            font-size: 10px !important;
-        }
-    }
-    
-    @media (min-width: 769px) and (max-width: 1024px) {
-        /* iPad Specific */
-        .main {
-            padding: 0 15px;
-        }
-        
-        .hero-section {
-            padding: 20px 18px;
-        }
-        
-        .hero-title {
-            font-size: clamp(22px, 4vw, 30px);
-        }
-        
-        .hero-subtitle {
-            font-size: clamp(13px, 2vw, 17px);
-        }
-        
-        .expertise-card {
-            padding: 7px;
-            margin-bottom: 5px;
-        }
-        
-        .expertise-title {
-            font-size: 12px;
-        }
-        
-        .expertise-description {
-            font-size: 10px;
-        }
-        
-        .benefits-grid {
-            grid-template-columns: repeat(2, 1fr);
-        }
-    }
-    
-    /* Checkbox Styling */
-    .stCheckbox {
-        margin-top: 12px;
-    }
-    
-    .stCheckbox>label {
-        font-size: 14px !important;
-        color: #1F2937 !important;
-        font-family: 'Inter', sans-serif !important;
-        font-weight: 400 !important;
-    }
-    
-    .stCheckbox>div>div {
-        background: white !important;
-        border: 2px solid #D1D5DB !important;
-        border-radius: 4px !important;
-        width: 18px !important;
-        height: 18px !important;
-    }
-    
-    .stCheckbox>div>div:hover {
-        border-color: #3B82F6 !important;
-        background: #F8FAFC !important;
-    }
-    
-    .stCheckbox>div>div[data-checked="true"] {
-        background: #3B82F6 !important;
-        border-color: #3B82F6 !important;
-    }
-    
-    .stCheckbox>div>div[data-checked="true"]:after {
-        color: white !important;
-    }
-    
-    /* Additional checkbox styling for better compatibility */
-    .stCheckbox input[type="checkbox"] {
-        accent-color: #3B82F6 !important;
-    }
-    
-    .stCheckbox .stCheckbox label {
-        color: #1F2937 !important;
-        font-family: 'Inter', sans-serif !important;
-        font-weight: 400 !important;
-        margin-left: 8px !important;
-    }
-    
-    /* Fix for Streamlit checkbox styling */
-    .stCheckbox > div > label {
-        color: #1F2937 !important;
-        font-family: 'Inter', sans-serif !important;
-        font-weight: 400 !important;
-    }
-    
-    /* Error state styling for input fields */
-    .stTextInput>div>div>input[data-error="true"],
-    .stSelectbox>div>div>div[data-error="true"],
-    .stTextArea>div>div>textarea[data-error="true"] {
-        border-color: #EF4444 !important;
-        background: #FEF2F2 !important;
-        color: #DC2626 !important;
-        box-shadow: 0 0 0 3px rgba(239, 68, 68, 0.1) !important;
-    }
-    
-    .stTextInput>div>div>input[data-error="true"]::placeholder,
-    .stTextArea>div>div>textarea[data-error="true"]::placeholder {
-        color: #F87171 !important;
-    }
-    
-    /* Error labels */
-    .stTextInput>label[data-error="true"],
-    .stSelectbox>label[data-error="true"],
-    .stTextArea>label[data-error="true"] {
-        color: #DC2626 !important;
-    }
-    
-    /* Error state for checkboxes */
-    .stCheckbox[data-error="true"] > label {
-        color: #DC2626 !important;
-    }
-    
-    .stCheckbox[data-error="true"] > div > div {
-        border-color: #EF4444 !important;
-        background: #FEF2F2 !important;
-    }
-    
-    /* Warning text styling for placeholders */
-    .stTextInput>div>div>input::placeholder,
-    .stSelectbox>div>div>div::placeholder,
-    .stTextArea>div>div>textarea::placeholder {
-        color: #6B7280 !important;
-    }
-    
-    /* Red warning text in placeholders */
-    .stTextInput>div>div>input[placeholder*="⚠️"]::placeholder,
-    .stSelectbox>div>div>div[placeholder*="⚠️"]::placeholder,
-    .stTextArea>div>div>textarea[placeholder*="⚠️"]::placeholder {
-        color: #EF4444 !important;
-        font-weight: 500 !important;
-    }
-    
-    /* Red warning text in selectbox options */
-    .stSelectbox>div>div>div[role="option"] {
-        color: #1F2937 !important;
-    }
-    
-    .stSelectbox>div>div>div[role="option"]:contains("⚠️") {
-        color: #EF4444 !important;
-        font-weight: 500 !important;
-    }
-    
-    /* Force red color for warning text in all form elements */
-    .stTextInput>div>div>input[placeholder*="⚠️"],
-    .stSelectbox>div>div>div[data-value*="⚠️"],
-    .stTextArea>div>div>textarea[placeholder*="⚠️"] {
-        color: #EF4444 !important;
-    }
-    
-    /* Red warning text in selectbox dropdown */
-    .stSelectbox div[role="listbox"] div[role="option"]:first-child {
-        color: #EF4444 !important;
-        font-weight: 500 !important;
-    }
-    
-    /* Section Headers */
-    h3 {
-        color: #1F2937 !important;
-        font-family: 'Poppins', sans-serif !important;
-        font-weight: 600 !important;
-        font-size: 16px !important;
-        margin-top: 16px !important;
-        margin-bottom: 8px !important;
-    }
-    
-    /* Expander Styling */
-    .streamlit-expanderHeader {
-        background: #F9FAFB !important;
-        border-radius: 12px !important;
-        border: 1px solid #E5E7EB !important;
-    }
-    
-    /* Force light theme on all text elements */
-    .stApp h1, .stApp h2, .stApp h3, .stApp h4, .stApp h5, .stApp h6 {
-        color: #1F2937 !important;
-    }
-    
-    .stApp p, .stApp span, .stApp div {
-        color: #1F2937 !important;
-    }
-    
-    /* Override Streamlit's default text colors */
-    .stApp .stMarkdown {
-        color: #1F2937 !important;
-    }
-    
-    .stApp .stMarkdown p {
-        color: #1F2937 !important;
-    }
-    
-    .stApp .stMarkdown h1, .stApp .stMarkdown h2, .stApp .stMarkdown h3 {
-        color: #1F2937 !important;
-    }
-    
-    /* Force light theme on form elements */
-    .stApp .stTextInput label, .stApp .stSelectbox label, .stApp .stTextArea label {
-        color: #1F2937 !important;
-    }
-    
-    .stApp .stTextInput input, .stApp .stSelectbox select, .stApp .stTextArea textarea {
-        background-color: #FFFFFF !important;
-        color: #1F2937 !important;
-        border-color: #D1D5DB !important;
-    }
-    
-    /* Fix dropdown selected text color */
-    .stSelectbox > div > div > div {
-        color: #1F2937 !important;
-        background-color: #FFFFFF !important;
-    }
-    
-    .stSelectbox > div > div > div[role="combobox"] {
-        color: #1F2937 !important;
-        background-color: #FFFFFF !important;
-    }
-    
-    .stSelectbox > div > div > div[data-baseweb="select"] {
-        color: #1F2937 !important;
-        background-color: #FFFFFF !important;
-    }
-    
-    /* Fix placeholder and selected value text color */
-    .stSelectbox input {
-        color: #1F2937 !important;
-        background-color: #FFFFFF !important;
-        font-size: 15px !important;
-        font-weight: 500 !important;
-    }
-    
-    .stSelectbox input::placeholder {
-        color: #6B7280 !important;
-        font-size: 15px !important;
-    }
-    
-    .stSelectbox input[value] {
-        color: #1F2937 !important;
-        font-size: 15px !important;
-        font-weight: 500 !important;
-    }
-    
-    /* Force text color on all selectbox text elements */
-    .stSelectbox div[data-baseweb="select"] > div {
-        color: #1F2937 !important;
-        font-size: 15px !important;
-    }
-    
-    .stSelectbox div[data-baseweb="select"] > div > div {
-        color: #1F2937 !important;
-        font-size: 15px !important;
-    }
-    
-    .stSelectbox div[data-baseweb="select"] > div > div > div {
-        color: #1F2937 !important;
-        font-size: 15px !important;
-    }
-    
-    /* Specific targeting for selected values in dropdowns */
-    .stSelectbox div[data-baseweb="select"] div[role="combobox"] {
-        color: #1F2937 !important;
-        font-size: 15px !important;
-        font-weight: 500 !important;
-        background-color: #FFFFFF !important;
-    }
-    
-    .stSelectbox div[data-baseweb="select"] div[role="combobox"] span {
-        color: #1F2937 !important;
-        font-size: 15px !important;
-        font-weight: 500 !important;
-    }
-    
-    /* Target the actual text content in selectboxes */
-    .stSelectbox div[data-baseweb="select"] div[role="combobox"] div {
-        color: #1F2937 !important;
-        font-size: 15px !important;
-        font-weight: 500 !important;
-    }
-    
-    /* Force all text within selectbox containers to be black */
-    .stSelectbox div[data-baseweb="select"] * {
-        color: #1F2937 !important;
-    }
-    
-    /* Override any inherited text colors */
-    .stSelectbox div[data-baseweb="select"] div[role="combobox"] * {
-        color: #1F2937 !important;
-        font-size: 15px !important;
-    }
-    
-    /* Force text color on selected values - most specific targeting */
-    .stSelectbox div[data-baseweb="select"] div[role="combobox"] div[data-baseweb="select-value"] {
-        color: #1F2937 !important;
-        font-size: 15px !important;
-        font-weight: 500 !important;
-    }
-    
-    .stSelectbox div[data-baseweb="select"] div[role="combobox"] div[data-baseweb="select-value"] span {
-        color: #1F2937 !important;
-        font-size: 15px !important;
-        font-weight: 500 !important;
-    }
-    
-    /* Target any text content in the selectbox */
-    .stSelectbox div[data-baseweb="select"] div[role="combobox"] div[data-baseweb="select-value"] div {
-        color: #1F2937 !important;
-        font-size: 15px !important;
-        font-weight: 500 !important;
-    }
-    
-    /* Universal override for all text in selectboxes */
-    .stSelectbox div[data-baseweb="select"] div[role="combobox"] div[data-baseweb="select-value"] * {
-        color: #1F2937 !important;
-        font-size: 15px !important;
-        font-weight: 500 !important;
-    }
-    
-    /* Fix dropdown options text color */
-    .stSelectbox div[role="listbox"] div[role="option"] {
-        color: #1F2937 !important;
-        background-color: #FFFFFF !important;
-    }
-    
-    .stSelectbox div[role="listbox"] div[role="option"]:hover {
-        color: #1F2937 !important;
-        background-color: #F3F4F6 !important;
-    }
-    
-    .stSelectbox div[role="listbox"] div[role="option"][aria-selected="true"] {
-        color: #1F2937 !important;
-        background-color: #EFF6FF !important;
-    }
-    
-    /* Force text color on all selectbox elements */
-    .stSelectbox * {
-        color: #1F2937 !important;
-    }
-    
-    /* Override any Streamlit default text colors */
-    .stSelectbox .stSelectbox > div > div > div > div {
-        color: #1F2937 !important;
-    }
-    
-    /* Override any dark theme classes */
-    .stApp [data-testid="stAppViewContainer"] {
-        background-color: #FFFFFF !important;
-    }
-    
-    .stApp [data-testid="stHeader"] {
-        background-color: #FFFFFF !important;
-    }
-    
-    .stApp [data-testid="stSidebar"] {
-        background-color: #F8FAFC !important;
-    }
-    
-    /* Hide Streamlit Branding */
-    #MainMenu {visibility: hidden;}
-    footer {visibility: hidden;}
-    </style>
-    
-    <script>
-    // Function to apply error styling to form fields
-    function applyErrorStyling() {
-        // Check if there are error placeholders in form fields
-        const textInputs = document.querySelectorAll('.stTextInput>div>div>input');
-        const selectBoxes = document.querySelectorAll('.stSelectbox>div>div>div');
-        const checkboxes = document.querySelectorAll('.stCheckbox');
-        
-        // Apply error styling to text inputs with error placeholders
-        textInputs.forEach(input => {
-            if (input.placeholder && input.placeholder.includes('⚠️')) {
-                input.style.borderColor = '#EF4444';
-                input.style.background = '#FEF2F2';
-                input.style.color = '#DC2626';
-                input.style.boxShadow = '0 0 0 3px rgba(239, 68, 68, 0.1)';
-                // Make placeholder text red
-                input.style.setProperty('--placeholder-color', '#EF4444');
-            }
-        });
-        
-        // Apply error styling to select boxes with error options
-        selectBoxes.forEach(select => {
-            if (select.textContent && select.textContent.includes('⚠️')) {
-                select.style.borderColor = '#EF4444';
-                select.style.background = '#FEF2F2';
-                select.style.color = '#DC2626';
-                select.style.boxShadow = '0 0 0 3px rgba(239, 68, 68, 0.1)';
-                // Make warning text red
-                select.style.setProperty('--placeholder-color', '#EF4444');
-            }
-        });
-        
-        // Apply error styling to checkboxes with error text
-        checkboxes.forEach(checkbox => {
-            const label = checkbox.querySelector('label');
-            if (label && label.textContent && label.textContent.includes('⚠️')) {
-                const checkboxDiv = checkbox.querySelector('div>div');
-                if (checkboxDiv) {
-                    checkboxDiv.style.borderColor = '#EF4444';
-                    checkboxDiv.style.background = '#FEF2F2';
-                }
-                label.style.color = '#DC2626';
-            }
-        });
-        
-        // Force red color for warning text in all form elements
-        const allInputs = document.querySelectorAll('input, select, textarea');
-        allInputs.forEach(input => {
-            if (input.placeholder && input.placeholder.includes('⚠️')) {
-                input.style.color = '#EF4444';
-            }
-            if (input.textContent && input.textContent.includes('⚠️')) {
-                input.style.color = '#EF4444';
-            }
-        });
-        
-        // Target selectbox options specifically
-        const selectOptions = document.querySelectorAll('.stSelectbox div[role="option"]');
-        selectOptions.forEach(option => {
-            if (option.textContent && option.textContent.includes('⚠️')) {
-                option.style.color = '#EF4444';
-                option.style.fontWeight = '500';
-            }
-        });
-    }
-    
-    // Function to fix dropdown arrows
-    function fixDropdownArrows() {
-        // Find all dropdown arrows and make them darker
-        const arrows = document.querySelectorAll('.stSelectbox [data-baseweb="select"] [role="combobox"]::after, .stSelectbox [data-baseweb="select"] [role="combobox"]:after');
-        arrows.forEach(arrow => {
-            arrow.style.color = '#1F2937';
-        });
-        
-        // Target SVG arrows specifically and make them darker
-        const svgArrows = document.querySelectorAll('.stSelectbox svg');
-        svgArrows.forEach(svg => {
-            svg.style.color = '#1F2937';
-            svg.style.fill = '#1F2937';
-            svg.style.stroke = '#1F2937';
-            
-            // Also target any path elements inside the SVG
-            const paths = svg.querySelectorAll('path');
-            paths.forEach(path => {
-                path.style.fill = '#1F2937';
-                path.style.stroke = '#1F2937';
-                path.setAttribute('fill', '#1F2937');
-                path.setAttribute('stroke', '#1F2937');
-            });
-            
-            // Target any polygon elements inside the SVG
-            const polygons = svg.querySelectorAll('polygon');
-            polygons.forEach(polygon => {
-                polygon.style.fill = '#1F2937';
-                polygon.style.stroke = '#1F2937';
-                polygon.setAttribute('fill', '#1F2937');
-                polygon.setAttribute('stroke', '#1F2937');
-            });
-        });
-        
-        // Target any pseudo-elements
-        const selectBoxes = document.querySelectorAll('.stSelectbox [role="combobox"]');
-        selectBoxes.forEach(box => {
-            const style = window.getComputedStyle(box, '::after');
-            if (style.content && style.content !== 'none') {
-                box.style.setProperty('--arrow-color', '#1F2937');
-            }
-        });
-        
-        // Force update any existing SVG elements
-        const allSvgs = document.querySelectorAll('svg');
-        allSvgs.forEach(svg => {
-            if (svg.closest('.stSelectbox')) {
-                svg.style.color = '#1F2937';
-                svg.style.fill = '#1F2937';
-                svg.style.stroke = '#1F2937';
-            }
-        });
-    }
-    
-    // Function to fix dropdown text colors
-    function fixDropdownTextColors() {
-        // Fix selected text color in dropdowns
-        const selectBoxes = document.querySelectorAll('.stSelectbox > div > div > div');
-        selectBoxes.forEach(select => {
-            select.style.color = '#1F2937';
-            select.style.backgroundColor = '#FFFFFF';
-        });
-        
-        // Fix input elements within selectboxes
-        const inputs = document.querySelectorAll('.stSelectbox input');
-        inputs.forEach(input => {
-            input.style.color = '#1F2937';
-            input.style.backgroundColor = '#FFFFFF';
-            input.style.fontSize = '15px';
-            input.style.fontWeight = '500';
-        });
-        
-        // Fix selected values in combobox
-        const comboboxes = document.querySelectorAll('.stSelectbox div[role="combobox"]');
-        comboboxes.forEach(combobox => {
-            combobox.style.color = '#1F2937';
-            combobox.style.fontSize = '15px';
-            combobox.style.fontWeight = '500';
-            combobox.style.backgroundColor = '#FFFFFF';
-            
-            // Target all child elements
-            const children = combobox.querySelectorAll('*');
-            children.forEach(child => {
-                if (child.tagName !== 'SVG' && child.tagName !== 'PATH' && child.tagName !== 'POLYGON') {
-                    child.style.color = '#1F2937';
-                    child.style.fontSize = '15px';
-                    child.style.fontWeight = '500';
-                }
-            });
-        });
-        
-        // Fix placeholder text color
-        const placeholders = document.querySelectorAll('.stSelectbox input::placeholder');
-        placeholders.forEach(placeholder => {
-            placeholder.style.color = '#6B7280';
-            placeholder.style.fontSize = '15px';
-        });
-        
-        // Fix dropdown options text color
-        const options = document.querySelectorAll('.stSelectbox div[role="option"]');
-        options.forEach(option => {
-            option.style.color = '#1F2937';
-            option.style.backgroundColor = '#FFFFFF';
-        });
-        
-        // Fix all text elements in selectboxes
-        const textElements = document.querySelectorAll('.stSelectbox div[data-baseweb="select"] *');
-        textElements.forEach(element => {
-            if (element.tagName !== 'SVG' && element.tagName !== 'PATH' && element.tagName !== 'POLYGON') {
-                element.style.color = '#1F2937';
-            }
-        });
-        
-        // Force text color on all selectbox children
-        const allSelectElements = document.querySelectorAll('.stSelectbox *');
-        allSelectElements.forEach(element => {
-            if (element.tagName !== 'SVG' && element.tagName !== 'PATH' && element.tagName !== 'POLYGON') {
-                element.style.color = '#1F2937';
-            }
-        });
-        
-        // Additional fix for BaseWeb select components
-        const baseWebSelects = document.querySelectorAll('[data-baseweb="select"]');
-        baseWebSelects.forEach(select => {
-            const textElements = select.querySelectorAll('*');
-            textElements.forEach(element => {
-                if (element.tagName !== 'SVG' && element.tagName !== 'PATH' && element.tagName !== 'POLYGON') {
-                    element.style.color = '#1F2937';
-                }
-            });
-        });
-    }
-    
-    // Apply error styling when page loads
-    document.addEventListener('DOMContentLoaded', function() {
-        applyErrorStyling();
-        fixDropdownArrows();
-        fixDropdownTextColors();
-    });
-    
-    // Apply error styling after form submission
-    setTimeout(function() {
-        applyErrorStyling();
-        fixDropdownArrows();
-        fixDropdownTextColors();
-    }, 100);
-    
-    // Apply error styling when form fields are updated
-    const observer = new MutationObserver(function(mutations) {
-        mutations.forEach(function(mutation) {
-            if (mutation.addedNodes.length > 0 || mutation.type === 'attributes') {
-                setTimeout(function() {
-                    applyErrorStyling();
-                    fixDropdownArrows();
-                    fixDropdownTextColors();
-                }, 50);
-            }
-        });
-    });
-    
-    observer.observe(document.body, {
-        childList: true,
-        subtree: true,
-        attributes: true,
-        attributeFilter: ['placeholder', 'textContent']
-    });
-    
-    // Additional interval check to ensure arrows and text colors are styled
-    setInterval(function() {
-        fixDropdownArrows();
-        fixDropdownTextColors();
-    }, 500);
-    
-    // More frequent check specifically for selected values
-    setInterval(function() {
-        // Force selected values to be black and properly sized
-        const allSelectElements = document.querySelectorAll('.stSelectbox *');
-        allSelectElements.forEach(element => {
-            if (element.tagName !== 'SVG' && element.tagName !== 'PATH' && element.tagName !== 'POLYGON') {
-                element.style.color = '#1F2937';
-                if (element.tagName === 'INPUT' || element.tagName === 'DIV' || element.tagName === 'SPAN') {
-                    element.style.fontSize = '15px';
-                    element.style.fontWeight = '500';
-                }
-            }
-        });
-        
-        // Specifically target combobox content
-        const comboboxes = document.querySelectorAll('[data-baseweb="select"] div[role="combobox"]');
-        comboboxes.forEach(combobox => {
-            combobox.style.color = '#1F2937';
-            combobox.style.fontSize = '15px';
-            combobox.style.fontWeight = '500';
-            combobox.style.backgroundColor = '#FFFFFF';
-        });
-    }, 200);
-    </script>
-""", unsafe_allow_html=True)
+# Theme stylesheet and script are served from ./static (see .streamlit/config.toml)
+# so reruns only send these small reference tags instead of the full theme
+with run_profile.section('theme'):
+    st.markdown(f"""
+        <meta name="viewport" content="width=device-width, initial-scale=1.0, maximum-scale=1.0, user-scalable=no">
+        <link rel="stylesheet" href="{static_asset_url('theme.css')}">
+    """, unsafe_allow_html=True)
+    st.html(f"""
+        <script>
+        if (!document.getElementById('uis-theme-js')) {{
+            const script = document.createElement('script');
+            script.id = 'uis-theme-js';
+            script.src = '{static_asset_url('theme.js')}';
+            document.head.appendChild(script);
+        }}
+        </script>
+    """, unsafe_allow_javascript=True)
 
 # Initialize session state
 if 'submissions_count' not in st.session_state:
     st.session_state.submissions_count = 0
 if 'show_success' not in st.session_state:
     st.session_state.show_success = False
-if 'success_timer' not in st.session_state:
-    st.session_state.success_timer = 0
+if 'success_at' not in st.session_state:
+    st.session_state.success_at = 0.0
 if 'submitted_data' not in st.session_state:
     st.session_state.submitted_data = {}
 
-# Insurance expertise areas
-INSURANCE_TYPES = {
-    "Medicare": {"icon": "🏥", "description": "Medicare Advantage, Supplement & Prescription Plans"},
-    "Health Insurance": {"icon": "💊", "description": "Federal & State Marketplace Plans"},
-    "Life Insurance": {"icon": "🛡️", "description": "Term, Permanent & Hybrid Long-Term Care"},
-    "Annuities": {"icon": "💰", "description": "Income Strategies with Living Benefits"},
-    "Home, Auto & Business": {"icon": "🏠", "description": "Complete Property & Casualty Coverage"},
-    "Long-Term Care": {"icon": "🤝", "description": "Traditional & Hybrid LTC Solutions"},
-    "Travel Medical": {"icon": "✈️", "description": "International Coverage & Pre-existing Conditions"},
-    "Disability": {"icon": "⚕️", "description": "Industry-Specific Income Protection"}
-}
-
-# States where licensed
-LICENSED_STATES = [
-    "Massachusetts", "New Hampshire", "Connecticut", "Rhode Island",
-    "Maine", "Vermont", "New York", "New Jersey", "Pennsylvania",
-    "Florida", "California", "Texas", "Illinois", "Ohio"
-]
-
 # Google Sheets Configuration
 SHEET_NAME = "Insurance Leads"
 WORKSHEET_NAME = "Sheet1"
+SHEETS_BATCH_MAX_ROWS = 100
+SHEETS_BATCH_MAX_DELAY = 0.5  # seconds
+# Per-minute Sheets API quota for the service account; reads and writes are counted separately
+SHEETS_READS_PER_MINUTE = 60
+SHEETS_WRITES_PER_MINUTE = 60
+# Open the sheet in a background thread so the first page render does not wait on auth and the sheet lookup
+SHEETS_WARM_UP = os.environ.get('UIS_SHEETS_WARM_UP', '1') != '0'
+# Renew the service account's access token this many seconds before it expires
+SHEETS_TOKEN_REFRESH_MARGIN = 300
+# Connections kept alive to the Google APIs, and how long a call may take to connect and to respond
+SHEETS_POOL_SIZE = 4
+SHEETS_CONNECT_TIMEOUT = 5.0
+SHEETS_READ_TIMEOUT = 30.0
+
+# Where leads are stored: 'sheets' (falls back to 'csv' when Sheets is not configured), 'sqlite' or 'csv'
+LEAD_STORE = os.environ.get('UIS_LEAD_STORE', 'sheets')
+
+# Local storage
+CSV_FILE = 'insurance_leads_backup.csv'
+SQLITE_FILE = 'insurance_leads.db'
+JOURNAL_FILE = 'insurance_leads_journal.jsonl'
+
+# Background delivery
+WRITE_QUEUE_SIZE = 500
+WRITE_WORKERS = 2
+
+# Duplicate detection: 'flag' stores repeats with Status 'Duplicate', 'suppress' drops them
+LEAD_INDEX_FILE = 'insurance_leads_index.txt'
+DUPLICATE_POLICY = 'flag'
+
+# Dashboard counters, read by admin.py
+STATS_FILE = 'insurance_leads_stats.json'
+
+# Circuit breaker, quota, batching and token refresh metrics, rewritten every HEALTH_INTERVAL seconds for admin.py
+HEALTH_FILE = 'insurance_leads_health.json'
+HEALTH_INTERVAL = 15.0
+
+def connect_google_sheets(creds_dict, token_refresher=None):
+    """Open the leads worksheet and make sure it has a header row"""
+    # The Google client libraries take a few hundred ms to import, so only load them when Sheets is configured
+    from google.oauth2.service_account import Credentials
+    from google_http import pooled_client
+
+    scope = ['https://spreadsheets.google.com/feeds',
+            'https://www.googleapis.com/auth/drive']
+    creds = Credentials.from_service_account_info(creds_dict, scopes=scope)
+    # One pooled keep-alive session per connection, shared by every session's calls
+    client = pooled_client(creds, SHEETS_POOL_SIZE, SHEETS_CONNECT_TIMEOUT, SHEETS_READ_TIMEOUT)
+    sheet = client.open(SHEET_NAME)
+    worksheet = sheet.worksheet(WORKSHEET_NAME)
+    
+    # Only row 1 is read, so startup cost does not grow with the number of leads
+    ensure_header(worksheet, LEAD_COLUMNS)
+    
+    # Renew the token ahead of expiry instead of inside a lead's append
+    if token_refresher is not None:
+        token_refresher.watch(creds)
+    
+    return worksheet
+
+def connect_fake_sheets():
+    """In-process worksheet used by benchmarks (UIS_FAKE_SHEETS=1) instead of the Google API"""
+    from fake_sheets import shared_worksheet
+    worksheet = shared_worksheet()
+    ensure_header(worksheet, LEAD_COLUMNS)
+    return worksheet
 
 @st.cache_resource
-def init_google_sheets():
-    """Initialize Google Sheets connection"""
-    try:
-        creds_dict = st.secrets["gcp_service_account"]
-        scope = ['https://spreadsheets.google.com/feeds',
-                'https://www.googleapis.com/auth/drive']
-        creds = Credentials.from_service_account_info(creds_dict, scopes=scope)
-        client = gspread.authorize(creds)
-        sheet = client.open(SHEET_NAME)
-        worksheet = sheet.worksheet(WORKSHEET_NAME)
-        
-        if not worksheet.get_all_values():
-            headers = ['Timestamp', 'Name', 'Email', 'Phone', 'State', 'Insurance_Type', 'Notes', 'Status', 'Source']
-            worksheet.append_row(headers)
-        
-        return worksheet
-    except Exception as e:
-        return None
+def init_quota_governor():
+    """One token-bucket governor shared by every session's Sheets calls"""
+    return QuotaGovernor(SHEETS_READS_PER_MINUTE, SHEETS_WRITES_PER_MINUTE)
 
-def validate_email(email):
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return re.match(pattern, email) is not None
+@st.cache_resource
+def init_token_refresher():
+    """One background token refresher, following the credentials of the current connection"""
+    refresher = TokenRefresher(margin=SHEETS_TOKEN_REFRESH_MARGIN)
+    atexit.register(refresher.close)
+    return refresher
 
-def validate_phone(phone):
-    digits_only = re.sub(r'\D', '', phone)
-    return len(digits_only) == 10
+@st.cache_resource
+def init_google_sheets():
+    """Initialize Google Sheets connection, or None when Sheets is not configured"""
+    if os.environ.get('UIS_FAKE_SHEETS'):
+        connect = connect_fake_sheets
+    else:
+        try:
+            creds_dict = dict(st.secrets["gcp_service_account"])
+        except Exception as e:
+            return None
+        token_refresher = init_token_refresher()
+        connect = lambda: connect_google_sheets(creds_dict, token_refresher)
+    # Connection failures are handled by the circuit breaker, which reconnects
+    # with backoff instead of pinning the process to the CSV fallback
+    connection = SheetsConnection(connect, governor=init_quota_governor())
+    if SHEETS_WARM_UP:
+        # Sheets calls made while this is still running wait for it instead of connecting again
+        return connection.warm_up()
+    connection.try_connect()
+    return connection
 
-def save_to_google_sheets(worksheet, data):
+def save_lead(store, data):
+    """Store a lead synchronously, falling back to the local CSV if the store fails"""
     try:
-        row = [
-            data['Timestamp'],
-            data['Name'],
-            data['Email'],
-            data['Phone'],
-            data['State'],
-            data['Insurance_Type'],
-            data['Notes'],
-            data['Status'],
-            data['Source']
-        ]
-        worksheet.append_row(row)
+        store.save(data)
         return True
     except Exception as e:
         return save_to_local_csv(data)
 
 def save_to_local_csv(data):
     """Fallback to local CSV if Google Sheets fails"""
-    import os
-    csv_file = 'insurance_leads_backup.csv'
     try:
-        if os.path.exists(csv_file):
-            df = pd.read_csv(csv_file)
-            df = pd.concat([df, pd.DataFrame([data])], ignore_index=True)
-        else:
-            df = pd.DataFrame([data])
-        df.to_csv(csv_file, index=False)
+        append_lead_csv(CSV_FILE, data)
         return True
     except:
         return False
 
+@st.cache_resource
+def init_lead_store(_sheets):
+    """Open the store selected by LEAD_STORE, using the local CSV when it is unavailable"""
+    store = None
+    if LEAD_STORE == 'sqlite':
+        try:
+            store = SqliteLeadStore(SQLITE_FILE)
+        except Exception as e:
+            store = None
+    elif LEAD_STORE == 'sheets' and _sheets:
+        # Leads from all sessions are grouped into one append_rows call
+        store = SheetsLeadStore(_sheets, max_rows=SHEETS_BATCH_MAX_ROWS, max_delay=SHEETS_BATCH_MAX_DELAY)
+    if store is None:
+        store = CsvLeadStore(CSV_FILE)
+    atexit.register(store.close, 10.0)
+    return store
+
+@st.cache_resource
+def init_lead_journal(_store):
+    """Open the lead journal and start replaying leads left over from previous runs"""
+    try:
+        journal = LeadJournal(JOURNAL_FILE)
+    except Exception as e:
+        return None, None
+    replayer = JournalReplayer(journal, _store.submit).start()
+    return journal, replayer
+
+@st.cache_resource
+def init_write_queue(_journal, _store):
+    """Start the worker pool that delivers leads so the form never waits on the store"""
+    write_queue = LeadWriteQueue(_journal, _store.submit,
+                                 maxsize=WRITE_QUEUE_SIZE, workers=WRITE_WORKERS)
+    # Registered after the store, so it drains first on shutdown
+    atexit.register(write_queue.close)
+    return write_queue
+
+def in_background(name, target, *args):
+    """Run target in a daemon thread, so first-start work stays off the page render"""
+    threading.Thread(target=target, args=args, name=name, daemon=True).start()
+
+def build_lead_index(lead_index, store):
+    """Index the lead store and the backup CSV; lookups answer from the keys indexed so far until this is done"""
+    csv_leads = CsvLeadStore(CSV_FILE).leads(LEAD_KEY_COLUMNS)
+    try:
+        if store.name == 'csv':
+            lead_index.warm_up(csv_leads)
+        else:
+            # Leads that fell back to the backup CSV are not in the store
+            lead_index.warm_up(itertools.chain(store.leads(LEAD_KEY_COLUMNS), csv_leads))
+    except Exception as e:
+        # Store unreachable: index the CSV in memory only, so the next start rebuilds
+        lead_index.warm_up(CsvLeadStore(CSV_FILE).leads(LEAD_KEY_COLUMNS), persist=False)
+
+@st.cache_resource
+def init_lead_index(_store):
+    """Load the duplicate index, building it from the lead store and the backup CSV on first start"""
+    lead_index = LeadIndex(LEAD_INDEX_FILE, bloom_capacity=200000)
+    try:
+        if not lead_index.load():
+            in_background('lead-index-warm-up', build_lead_index, lead_index, _store)
+    except Exception as e:
+        return None
+    return lead_index
+
+def build_lead_stats(lead_stats, store, journal):
+    """Count every stored or journaled lead once, then start flushing the counters"""
+    try:
+        leads = store.leads(STATS_COLUMNS)
+        if store.name != 'csv':
+            # Leads that fell back to the backup CSV are not in the store
+            leads = itertools.chain(leads, CsvLeadStore(CSV_FILE).leads(STATS_COLUMNS))
+        # Leads accepted but not delivered yet are in the journal, not the store
+        pending = [data for _, data in journal.pending()] if journal else []
+        lead_stats.rebuild(leads, pending)
+    except Exception as e:
+        # Store unreachable: write no snapshot, so the next start rebuilds
+        pass
+    # Flushing before the rebuild has written the snapshot would be overwritten by it
+    lead_stats.start()
+
+@st.cache_resource
+def init_lead_stats(_store, _journal):
+    """Start the dashboard counters, counting every stored lead once on first start"""
+    lead_stats = LeadStats(STATS_FILE)
+    atexit.register(lead_stats.close)
+    if lead_stats.exists():
+        return lead_stats.start()
+    # Reading every lead from the sheet would hold up the first page render
+    in_background('lead-stats-rebuild', build_lead_stats, lead_stats, _store, _journal)
+    return lead_stats
+
+@st.cache_resource
+def init_health_reporter(_sheets, _store):
+    """Write the connection, store and token refresher metrics where admin.py can read them"""
+    reporter = HealthReporter(HEALTH_FILE, HEALTH_INTERVAL)
+    if _sheets is not None:
+        reporter.add('sheets', _sheets.stats)
+        if not os.environ.get('UIS_FAKE_SHEETS'):
+            reporter.add('token_refresher', init_token_refresher().stats)
+    if hasattr(_store, 'stats'):
+        reporter.add('store', _store.stats)
+    atexit.register(reporter.close)
+    return reporter.start()
+
 # Initialize Google Sheets
-worksheet = init_google_sheets()
+sheets = init_google_sheets()
+lead_store = init_lead_store(sheets)
+journal, replayer = init_lead_journal(lead_store)
+write_queue = init_write_queue(journal, lead_store) if journal else None
+lead_index = init_lead_index(lead_store)
+lead_stats = init_lead_stats(lead_store, journal)
+init_health_reporter(sheets, lead_store)
 
 # Hero Section
-st.markdown("""
-<div class="hero-section">
-    <h1 class="hero-title">Universal Insurance Solutions</h1>
-    <p class="hero-subtitle">Your Trusted Insurance Partner in Shrewsbury, MA</p>
-    <div class="hero-badges">
-        <span class="badge">✓ Licensed in 14 States</span>
-        <span class="badge">✓ 40+ Major Carriers</span>
-        <span class="badge">✓ Free Coverage Analysis</span>
-        <span class="badge">✓ 24-48 Hour Response</span>
-        <span class="badge">✓ Expert Guidance</span>
-        <span class="badge">✓ Personalized Service</span>
-        <span class="badge">✓ No Hidden Fees</span>
-        <span class="badge">✓ Multiple Carriers</span>
+with run_profile.section('hero'):
+    st.markdown("""
+    <div class="hero-section">
+        <h1 class="hero-title">Universal Insurance Solutions</h1>
+        <p class="hero-subtitle">Your Trusted Insurance Partner in Shrewsbury, MA</p>
+        <div class="hero-badges">
+            <span class="badge">✓ Licensed in 14 States</span>
+            <span class="badge">✓ 40+ Major Carriers</span>
+            <span class="badge">✓ Free Coverage Analysis</span>
+            <span class="badge">✓ 24-48 Hour Response</span>
+            <span class="badge">✓ Expert Guidance</span>
+            <span class="badge">✓ Personalized Service</span>
+            <span class="badge">✓ No Hidden Fees</span>
+            <span class="badge">✓ Multiple Carriers</span>
+        </div>
+    
     </div>
+    """, unsafe_allow_html=True)
+
+# Success countdown: 15s display + 5s delay before the form resets
+SUCCESS_DISPLAY_SECONDS = 15
+SUCCESS_RESET_SECONDS = 20
+
+def reset_after_success():
+    """Clear success state and form fields so the form starts fresh"""
+    st.session_state.show_success = False
+    st.session_state.success_at = 0.0
+    st.session_state.submitted_data = {}
+    # Clear any error states
+    if 'show_errors' in st.session_state:
+        del st.session_state.show_errors
+    # Clear form data to reset fields
+    for key in ['first_name', 'last_name', 'email', 'phone', 'state', 'insurance_type']:
+        if key in st.session_state:
+            del st.session_state[key]
+
+@st.fragment(run_every=1)
+def success_countdown():
+    """Countdown based on the submission time, refreshed without rerunning the whole page"""
+    elapsed = time.time() - st.session_state.success_at
+    remaining = max(0, math.ceil(SUCCESS_RESET_SECONDS - elapsed))
+    
+    if remaining <= 0:
+        reset_after_success()
+        st.rerun()
     
-</div>
-""", unsafe_allow_html=True)
+    # Different messages based on timer phase
+    if elapsed <= SUCCESS_DISPLAY_SECONDS:
+        message = f"✅ Success! Your request has been received. Form will reset in {remaining} seconds..."
+        bg_color = "#F0FDF4"
+        border_color = "#10B981"
+        text_color = "#047857"
+    else:
+        message = f"🔄 Preparing to reset form... {remaining} seconds remaining..."
+        bg_color = "#FEF3C7"
+        border_color = "#F59E0B"
+        text_color = "#92400E"
+    
+    st.markdown(f"""
+    <div style="margin-top: 20px; padding: 16px; background: {bg_color}; border-radius: 12px; border-left: 4px solid {border_color};">
+        <p style="color: {text_color}; margin: 0; font-family: 'Inter', sans-serif; font-size: 14px; font-weight: 500;">
+            {message}
+        </p>
+    </div>
+    """, unsafe_allow_html=True)
 
 # Handle success message display and auto-cleanup
 if st.session_state.show_success:
-    st.session_state.success_timer += 1
-    
     # Show success message
     st.markdown("""
     <div class="success-animation">
@@ -1559,68 +392,34 @@ if st.session_state.show_success:
                 st.write(f"**State:** {st.session_state.submitted_data.get('State', 'N/A')}")
                 st.write(f"**Insurance Type:** {st.session_state.submitted_data.get('Insurance_Type', 'N/A')}")
     
-    # Show countdown and auto-cleanup after 20 seconds (15s display + 5s delay)
-    remaining = 20 - st.session_state.success_timer
-    
-    # Different messages based on timer phase
-    if st.session_state.success_timer <= 15:
-        message = f"✅ Success! Your request has been received. Form will reset in {remaining} seconds..."
-        bg_color = "#F0FDF4"
-        border_color = "#10B981"
-        text_color = "#047857"
-    else:
-        message = f"🔄 Preparing to reset form... {remaining} seconds remaining..."
-        bg_color = "#FEF3C7"
-        border_color = "#F59E0B"
-        text_color = "#92400E"
-    
-    st.markdown(f"""
-    <div style="margin-top: 20px; padding: 16px; background: {bg_color}; border-radius: 12px; border-left: 4px solid {border_color};">
-        <p style="color: {text_color}; margin: 0; font-family: 'Inter', sans-serif; font-size: 14px; font-weight: 500;">
-            {message}
-        </p>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    # Auto-cleanup after 20 seconds (15s display + 5s delay)
-    if st.session_state.success_timer >= 20:
-        # Clear success state and reset form
-        st.session_state.show_success = False
-        st.session_state.success_timer = 0
-        st.session_state.submitted_data = {}
-        # Clear any error states
-        if 'show_errors' in st.session_state:
-            del st.session_state.show_errors
-        # Clear form data to reset fields
-        for key in ['first_name', 'last_name', 'email', 'phone', 'state', 'insurance_type']:
-            if key in st.session_state:
-                del st.session_state[key]
-        st.rerun()
-    else:
-        # Increment timer and rerun
-        st.rerun()
+    # Only the countdown fragment refreshes until the form resets
+    success_countdown()
+    run_profile.finish()
+    st.stop()
 
 # Create responsive columns
 col1, col2 = st.columns([1, 1.2], gap="large")
 
-# Left Column - Areas of Expertise
-with col1:
-    st.markdown("### Our Areas of Expertise")
-    
-    for insurance_type, details in INSURANCE_TYPES.items():
-        st.markdown(f"""
-        <div class="expertise-card">
-            <h4 class="expertise-title">
-                <span style="font-size: 18px;">{details['icon']}</span>
-                {insurance_type}
-            </h4>
-            <p class="expertise-description">{details['description']}</p>
-        </div>
-        """, unsafe_allow_html=True)
-    
+@st.cache_data
+def expertise_markdown():
+    """Heading and every expertise card as one markdown block, built once per process"""
+    cards = "".join(f"""<div class="expertise-card">
+<h4 class="expertise-title">
+<span style="font-size: 18px;">{details['icon']}</span>
+{insurance_type}
+</h4>
+<p class="expertise-description">{details['description']}</p>
+</div>
+""" for insurance_type, details in INSURANCE_TYPES.items())
+    return f"### Our Areas of Expertise\n\n<div class=\"expertise-container\">\n{cards}</div>"
+
+# Left Column - Areas of Expertise, sent as a single element instead of one per card
+with col1, run_profile.section('expertise'):
+    st.markdown(expertise_markdown(), unsafe_allow_html=True)
+
 
 # Right Column - Form
-with col2:
+with col2, run_profile.section('form'):
     st.markdown("""
     <div class="form-container">
         <h2 class="form-header">Get Your Free Coverage Analysis</h2>
@@ -1711,70 +510,96 @@ with col2:
             """, unsafe_allow_html=True)
             
             if submitted:
-                errors = []
+                with run_profile.section('submit'):
+                    errors = []
                 
-                if not first_name or len(first_name.strip()) < 2:
-                    errors.append("Please enter your first name")
+                    if not first_name or not validate_name(first_name):
+                        errors.append("Please enter your first name")
                 
-                if not last_name or len(last_name.strip()) < 2:
-                    errors.append("Please enter your last name")
+                    if not last_name or not validate_name(last_name):
+                        errors.append("Please enter your last name")
                 
-                if not email or not validate_email(email):
-                    errors.append("Please enter a valid email address")
+                    if not email or not validate_email(email):
+                        errors.append("Please enter a valid email address")
                 
-                if not phone or not validate_phone(phone):
-                    errors.append("Please enter a valid 10-digit phone number")
+                    if not phone or not validate_phone(phone):
+                        errors.append("Please enter a valid 10-digit phone number")
                 
-                if state == "Select your state...":
-                    errors.append("Please select your state")
+                    if state == "Select your state...":
+                        errors.append("Please select your state")
                 
-                if insurance_interest == "Select insurance type...":
-                    errors.append("Please select an insurance type")
+                    if insurance_interest == "Select insurance type...":
+                        errors.append("Please select an insurance type")
                 
                 
-                if errors:
-                    # Set session state to show field errors
-                    st.session_state.show_errors = True
-                else:
-                    # Clear error state on successful validation
-                    if 'show_errors' in st.session_state:
-                        del st.session_state.show_errors
+                    if errors:
+                        # Set session state to show field errors
+                        st.session_state.show_errors = True
+                    else:
+                        # Clear error state on successful validation
+                        if 'show_errors' in st.session_state:
+                            del st.session_state.show_errors
                     
-                    # Prepare data
-                    data = {
-                        'Timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                        'Name': f"{first_name.strip()} {last_name.strip()}",
-                        'Email': email.strip().lower(),
-                        'Phone': re.sub(r'\D', '', phone),
-                        'State': state,
-                        'Insurance_Type': insurance_interest,
-                        'Notes': '',
-                        'Status': 'New',
-                        'Source': 'Web Form'
-                    }
+                        # Prepare data
+                        data = {
+                            'Timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                            'Name': f"{first_name.strip()} {last_name.strip()}",
+                            'Email': normalize_email(email),
+                            'Phone': normalize_phone(phone),
+                            'State': state,
+                            'Insurance_Type': insurance_interest,
+                            'Notes': '',
+                            'Status': 'New',
+                            'Source': 'Web Form'
+                        }
                     
-                    # Save data
-                    if worksheet:
-                        success = save_to_google_sheets(worksheet, data)
-                    else:
-                        success = save_to_local_csv(data)
+                        # Repeat submissions are spotted from the local index, never by reading the sheet
+                        duplicate_of = lead_index.matches(data) if lead_index else []
+                        if duplicate_of:
+                            data['Status'] = 'Duplicate'
+                            data['Notes'] = f"Matches an earlier lead by {' and '.join(duplicate_of).lower()}"
                     
-                    if success:
-                        st.session_state.submissions_count += 1
-                        st.session_state.show_success = True
-                        st.session_state.success_timer = 0
+                        # Save data: once the journal append is durable the write queue
+                        # delivers the lead in the background. If the queue is full the
+                        # lead stays in the journal and the replayer delivers it later.
+                        with run_profile.section('storage'):
+                            success = False
+                            suppressed = bool(duplicate_of) and DUPLICATE_POLICY == 'suppress'
+                            if suppressed:
+                                success = True
+                            elif journal:
+                                try:
+                                    record_id = journal.append(data)
+                                    success = True
+                                except Exception as e:
+                                    success = False
+                                if success:
+                                    write_queue.put(record_id, data)
+                            if not success:
+                                success = save_lead(lead_store, data)
+                            if success and lead_index:
+                                lead_index.add(data)
+                            if success and lead_stats and not suppressed:
+                                lead_stats.record(data)
+                    
+                        if success:
+                            st.session_state.submissions_count += 1
+                            st.session_state.show_success = True
+                            st.session_state.success_at = time.time()
                         
-                        # Store submitted data for display
-                        st.session_state.submitted_data = {
-                            'Name': data['Name'],
-                            'Email': data['Email'],
-                            'Phone': phone,
-                            'State': data['State'],
-                            'Insurance_Type': data['Insurance_Type']
-                        }
+                            # Store submitted data for display
+                            st.session_state.submitted_data = {
+                                'Name': data['Name'],
+                                'Email': data['Email'],
+                                'Phone': phone,
+                                'State': data['State'],
+                                'Insurance_Type': data['Insurance_Type']
+                            }
                         
-                        # Force rerun to show success message
-                        st.rerun()
-                    else:
-                        st.error("❌ System error. Please try again or call us directly.")
+                            # Force rerun to show success message
+                            run_profile.finish()
+                            st.rerun()
+                        else:
+                            st.error("❌ System error. Please try again or call us directly.")
 
+run_profile.finish()
@@ -0,0 +1,237 @@
+"""Date-partitioned Parquet archive of leads for reporting.
+
+compact_csv() and pull_sheet() roll leads from the backup CSV and, once,
+from the sheet into Parquet files laid out as
+``<archive>/date=YYYY-MM-DD/part-*.parquet``. A query that filters on date
+only opens the matching partitions, and columnar storage means it only reads
+the columns it asks for. State and Insurance_Type are dictionary encoded.
+
+The CSV is append-only, so compaction is incremental: a checkpoint file in
+the archive records the byte offset already archived and each run only
+reads what was appended since. Usage:
+
+    python archive.py [--csv insurance_leads_backup.csv] [--archive leads_archive] [--pull-sheet]
+"""
+import argparse
+import csv
+import json
+import os
+from collections import defaultdict
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from lead_store import open_store
+from storage import LEAD_COLUMNS, locked_file
+
+CHECKPOINT_FILE = '_checkpoint.json'
+UNKNOWN_DATE = 'unknown'
+DICTIONARY_COLUMNS = ('State', 'Insurance_Type')
+CHUNK_ROWS = 200000
+
+SCHEMA = pa.schema([
+    ('Timestamp', pa.timestamp('s')),
+    *[(column, pa.dictionary(pa.int32(), pa.string()) if column in DICTIONARY_COLUMNS else pa.string())
+      for column in LEAD_COLUMNS[1:]],
+])
+PARTITIONING = ds.partitioning(pa.schema([('date', pa.string())]), flavor='hive')
+
+
+def _read_checkpoint(archive_dir):
+    path = os.path.join(archive_dir, CHECKPOINT_FILE)
+    if not os.path.exists(path):
+        return {'csv_offset': 0, 'sheet_pulled': False}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _write_checkpoint(archive_dir, checkpoint):
+    path = os.path.join(archive_dir, CHECKPOINT_FILE)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(checkpoint, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _lead_date(timestamp):
+    """Partition key of a lead: the date part of its 'YYYY-MM-DD HH:MM:SS' timestamp"""
+    date = timestamp[:10]
+    if len(date) == 10 and date[4] == '-' and date[7] == '-' and date.replace('-', '').isdigit():
+        return date
+    return UNKNOWN_DATE
+
+
+def lead_table(rows):
+    """Arrow table of lead rows given as lists in LEAD_COLUMNS order"""
+    columns = list(zip(*rows)) if rows else [()] * len(LEAD_COLUMNS)
+    arrays = [pc.strptime(pa.array(columns[0], pa.string()), format='%Y-%m-%d %H:%M:%S',
+                          unit='s', error_is_null=True)]
+    for column, values in zip(LEAD_COLUMNS[1:], columns[1:]):
+        array = pa.array(values, pa.string())
+        arrays.append(array.dictionary_encode() if column in DICTIONARY_COLUMNS else array)
+    return pa.Table.from_arrays(arrays, schema=SCHEMA)
+
+
+def _write_partitions(archive_dir, rows, part_name):
+    """Write rows grouped by lead date, one file per date named part_name"""
+    by_date = defaultdict(list)
+    for row in rows:
+        by_date[_lead_date(row[0])].append(row)
+    for date, date_rows in by_date.items():
+        partition = os.path.join(archive_dir, f'date={date}')
+        os.makedirs(partition, exist_ok=True)
+        pq.write_table(lead_table(date_rows), os.path.join(partition, part_name), compression='zstd')
+
+
+def _remove_parts(archive_dir, keep):
+    """Delete part files that keep(name) rejects, left by a compaction that did not finish"""
+    for entry in os.scandir(archive_dir):
+        if entry.is_dir() and entry.name.startswith('date='):
+            for part in os.scandir(entry.path):
+                if part.name.startswith('part-') and not keep(part.name):
+                    os.remove(part.path)
+
+
+class _CsvLines:
+    """Binary lines of a CSV from offset up to end, tracking the offset of the last line read"""
+
+    def __init__(self, f, offset, end):
+        self.f = f
+        self.offset = offset
+        self.end = end
+        f.seek(offset)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.offset >= self.end:
+            raise StopIteration
+        line = self.f.readline(self.end - self.offset)
+        if not line:
+            raise StopIteration
+        self.offset += len(line)
+        return line.decode('utf-8')
+
+
+def _csv_part_offset(name):
+    return int(name[len('part-csv-'):-len('.parquet')]) if name.startswith('part-csv-') else None
+
+
+def compact_csv(csv_file, archive_dir, chunk_rows=CHUNK_ROWS):
+    """Archive rows appended to csv_file since the last compaction; returns the number archived"""
+    os.makedirs(archive_dir, exist_ok=True)
+    checkpoint = _read_checkpoint(archive_dir)
+    offset = checkpoint['csv_offset']
+    # Parts written past the checkpoint come from a run that stopped before saving it
+    _remove_parts(archive_dir, lambda name: _csv_part_offset(name) is None or _csv_part_offset(name) < offset)
+    if not os.path.exists(csv_file):
+        return 0
+    with open(csv_file, 'rb') as f:
+        # Appends happen under this lock, so the size read here ends on a complete row
+        with locked_file(f):
+            end = os.fstat(f.fileno()).st_size
+        if end < offset:
+            raise ValueError(f'{csv_file} is smaller than the archived offset {offset}; was it replaced?')
+        header = next(csv.reader(_CsvLines(f, 0, end)), None)
+        if header is None:
+            return 0
+        order = [header.index(column) if column in header else None for column in LEAD_COLUMNS]
+        lines = _CsvLines(f, offset, end)
+        reader = csv.reader(lines)
+        if offset == 0:
+            next(reader, None)
+        archived = 0
+        while True:
+            chunk_start = lines.offset
+            rows = []
+            for record in reader:
+                if not record:
+                    continue
+                rows.append([record[i] if i is not None and i < len(record) else '' for i in order])
+                if len(rows) >= chunk_rows:
+                    break
+            if not rows:
+                break
+            _write_partitions(archive_dir, rows, f'part-csv-{chunk_start}.parquet')
+            checkpoint['csv_offset'] = lines.offset
+            _write_checkpoint(archive_dir, checkpoint)
+            archived += len(rows)
+    return archived
+
+
+def pull_sheet(store, archive_dir, chunk_rows=CHUNK_ROWS):
+    """Archive every lead in a SheetsLeadStore once; later calls are no-ops. Returns the number archived.
+
+    Leads are paged through store.leads() and written chunk_rows at a time,
+    so the store's quota governor admits every read.
+    """
+    os.makedirs(archive_dir, exist_ok=True)
+    checkpoint = _read_checkpoint(archive_dir)
+    if checkpoint.get('sheet_pulled'):
+        return 0
+    # Parts from a pull that stopped before saving the checkpoint
+    _remove_parts(archive_dir, lambda name: not name.startswith('part-sheet-'))
+    archived = 0
+    rows = []
+    for data in store.leads(LEAD_COLUMNS):
+        rows.append([data.get(column, '') for column in LEAD_COLUMNS])
+        if len(rows) >= chunk_rows:
+            _write_partitions(archive_dir, rows, f'part-sheet-{archived}.parquet')
+            archived += len(rows)
+            rows = []
+    if rows:
+        _write_partitions(archive_dir, rows, f'part-sheet-{archived}.parquet')
+        archived += len(rows)
+    checkpoint['sheet_pulled'] = True
+    _write_checkpoint(archive_dir, checkpoint)
+    return archived
+
+
+def dataset(archive_dir):
+    return ds.dataset(archive_dir, format='parquet', partitioning=PARTITIONING)
+
+
+def query(archive_dir, columns=None, start=None, end=None, where=None):
+    """Read archived leads as an Arrow table.
+
+    start and end are inclusive 'YYYY-MM-DD' dates; they prune partitions so
+    files outside the range are never opened. where is an optional extra
+    pyarrow.dataset expression, e.g. ds.field('State') == 'Massachusetts'.
+    """
+    expression = where
+    for bound in ((ds.field('date') >= start) if start else None,
+                  (ds.field('date') <= end) if end else None):
+        if bound is not None:
+            expression = bound if expression is None else expression & bound
+    table = dataset(archive_dir).to_table(columns=columns, filter=expression)
+    # Each part file has its own dictionaries; group_by and joins need them merged
+    return table.unify_dictionaries()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compact leads into the date-partitioned Parquet archive')
+    parser.add_argument('--csv', default='insurance_leads_backup.csv')
+    parser.add_argument('--archive', default='leads_archive')
+    parser.add_argument('--pull-sheet', action='store_true',
+                        help='also archive the sheet, once, using .streamlit/secrets.toml')
+    parser.add_argument('--secrets', default=os.path.join('.streamlit', 'secrets.toml'))
+    parser.add_argument('--sheet', default='Insurance Leads')
+    parser.add_argument('--worksheet', default='Sheet1')
+    args = parser.parse_args()
+
+    print(f'archived {compact_csv(args.csv, args.archive)} leads from {args.csv}')
+    if args.pull_sheet:
+        store = open_store('sheets', args.csv, None, args.secrets, args.sheet, args.worksheet)
+        try:
+            print(f'archived {pull_sheet(store, args.archive)} leads from the sheet')
+        finally:
+            store.close()
+
+
+if __name__ == '__main__':
+    main()
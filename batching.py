@@ -0,0 +1,107 @@
+"""Background batching of rows written by many threads"""
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future
+
+from perf import LatencyHistogram
+
+
+class RowBatcher:
+    """Coalesce rows submitted from any thread into one write_rows call per batch.
+
+    Used for Sheets append_rows calls and for SQLite insert transactions.
+    submit() returns a Future that resolves once the batch containing the row
+    has been written, or carries the exception if the write failed. A batch is
+    flushed when it reaches max_rows or when its oldest row has waited
+    max_delay seconds.
+    """
+
+    def __init__(self, write_rows, max_rows=100, max_delay=0.5, name='row-batcher'):
+        self.write_rows = write_rows
+        self.max_rows = max_rows
+        self.max_delay = max_delay
+        self._cond = threading.Condition()
+        self._rows = []
+        self._oldest_at = None
+        self._closed = False
+        self._batch_sizes = Counter()
+        self._rows_sent = 0
+        self._failed_batches = 0
+        self._latency = LatencyHistogram()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, row):
+        future = Future()
+        with self._cond:
+            if self._closed:
+                raise RuntimeError('RowBatcher is closed')
+            if not self._rows:
+                self._oldest_at = time.monotonic()
+            self._rows.append((row, future))
+            self._cond.notify()
+        return future
+
+    def _next_batch(self):
+        with self._cond:
+            while not self._rows and not self._closed:
+                self._cond.wait()
+            if not self._rows:
+                return None
+            deadline = self._oldest_at + self.max_delay
+            while len(self._rows) < self.max_rows and not self._closed:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            batch = self._rows[:self.max_rows]
+            del self._rows[:self.max_rows]
+            # Rows left behind keep their original age so they go out on the next pass
+            return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            self._flush(batch)
+
+    def _flush(self, batch):
+        started = time.perf_counter()
+        try:
+            self.write_rows([row for row, _ in batch])
+            self._latency.record(time.perf_counter() - started)
+        except Exception as e:
+            with self._cond:
+                self._failed_batches += 1
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        with self._cond:
+            self._batch_sizes[len(batch)] += 1
+            self._rows_sent += len(batch)
+        for _, future in batch:
+            future.set_result(True)
+
+    def stats(self):
+        """Return batch size and write latency metrics for monitoring"""
+        with self._cond:
+            batches = sum(self._batch_sizes.values())
+            return {
+                'batches_sent': batches,
+                'rows_sent': self._rows_sent,
+                'failed_batches': self._failed_batches,
+                'queued_rows': len(self._rows),
+                'mean_batch_size': self._rows_sent / batches if batches else 0.0,
+                'max_batch_size': max(self._batch_sizes, default=0),
+                'batch_size_counts': dict(self._batch_sizes),
+                'write_latency': self._latency.summary(),
+            }
+
+    def close(self, timeout=None):
+        """Flush queued rows and stop the flusher thread"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join(timeout)
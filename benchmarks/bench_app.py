@@ -0,0 +1,202 @@
+"""Headless benchmark of app.py driven through Streamlit's AppTest.
+
+Usage: python benchmarks/bench_app.py [--runs 30] [--save-baseline] [--tolerance 0.5]
+
+Google Sheets is replaced by the in-process fake worksheet (UIS_FAKE_SHEETS=1)
+and the app runs in a temporary directory so its journal and CSV files do not
+touch the checkout. Each scenario reports script-run latency, peak Python
+memory allocated during the run and the number of elements (including layout
+blocks) the run sends, one delta each. Results are compared against
+benchmarks/baseline_app.json; the script exits non-zero when a p50 latency or
+memory figure is worse than the baseline by more than --tolerance, or when a
+run sends more elements than the baseline. The exact element counts are
+asserted, without timing, by tests/test_app_elements.py.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+APP = os.path.abspath(os.path.join(ROOT, 'app.py'))
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline_app.json')
+sys.path.insert(0, ROOT)
+
+VALID_FORM = {
+    'first_name': 'Jane',
+    'last_name': 'Doe',
+    'email': 'Jane.Doe@Example.com',
+    'phone': '(555) 123-4567',
+    'state': 'Massachusetts',
+    'insurance_type': 'Medicare',
+}
+
+
+def new_app():
+    from streamlit.testing.v1 import AppTest
+    return AppTest.from_file(APP, default_timeout=30)
+
+
+def fill_form(at, form):
+    for key in ('first_name', 'last_name', 'email', 'phone'):
+        at.text_input(key=key).input(form[key])
+    at.selectbox(key='state').select(form['state'])
+    at.selectbox(key='insurance_type').select(form['insurance_type'])
+
+
+def timed(action):
+    """Run action once and return its wall time in seconds"""
+    start = time.perf_counter()
+    at = action()
+    elapsed = time.perf_counter() - start
+    if at.exception:
+        raise RuntimeError(f'app raised: {at.exception}')
+    return elapsed
+
+
+def element_count(at):
+    """Elements and blocks below the page's root containers, i.e. the deltas of the last run"""
+    def descendants(node):
+        children = getattr(node, 'children', None) or {}
+        return sum(1 + descendants(child) for child in children.values())
+    return descendants(at.main) + descendants(at.sidebar)
+
+
+def peak_memory(action):
+    """Run action once under tracemalloc and return the peak bytes allocated.
+
+    Kept separate from timed() because tracing slows the run down several times.
+    """
+    tracemalloc.start()
+    action()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def first_render():
+    return new_app().run()
+
+
+def rerun():
+    at = new_app().run()
+    return lambda: at.run()
+
+
+def invalid_submit():
+    at = new_app().run()
+    fill_form(at, {**VALID_FORM, 'email': 'not-an-email'})
+
+    def submit():
+        at.button[0].click().run()
+        if not at.session_state.show_errors:
+            raise RuntimeError('invalid submission was accepted')
+        return at
+    return submit
+
+
+def valid_submit():
+    at = new_app().run()
+    fill_form(at, VALID_FORM)
+
+    def submit():
+        at.button[0].click().run()
+        if not at.session_state.show_success:
+            raise RuntimeError('valid submission was rejected')
+        return at
+    return submit
+
+
+# Each scenario is a setup function returning the action to measure; first_render
+# is measured as a whole since building the AppTest is part of a first visit
+SCENARIOS = {
+    'first_render': lambda: first_render,
+    'rerun': rerun,
+    'invalid_submit': invalid_submit,
+    'valid_submit': valid_submit,
+}
+
+
+def run_scenario(setup, runs):
+    latencies = sorted(timed(setup()) for _ in range(runs))
+    peaks = [peak_memory(setup()) for _ in range(3)]
+    return {
+        'p50_ms': statistics.median(latencies) * 1000,
+        'p90_ms': latencies[int(0.9 * (len(latencies) - 1))] * 1000,
+        'per_sec': len(latencies) / sum(latencies),
+        'peak_kb': statistics.median(peaks) / 1024,
+        'elements': element_count(setup()()),
+    }
+
+
+def compare(results, baseline, tolerance):
+    regressions = []
+    for name, current in results.items():
+        reference = baseline.get(name)
+        if not reference:
+            continue
+        for metric in ('p50_ms', 'peak_kb'):
+            if current[metric] > reference[metric] * (1 + tolerance):
+                regressions.append(f'{name}.{metric}: {current[metric]:.1f} vs baseline {reference[metric]:.1f}')
+        # Element counts are exact, so any increase is a regression
+        if 'elements' in reference and current['elements'] > reference['elements']:
+            regressions.append(f"{name}.elements: {current['elements']} vs baseline {reference['elements']}")
+    return regressions
+
+
+def wait_for_delivery(expected, timeout=10.0):
+    from fake_sheets import shared_worksheet
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        delivered = shared_worksheet().row_count() - 1
+        if delivered >= expected:
+            return delivered
+        time.sleep(0.05)
+    return shared_worksheet().row_count() - 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=30)
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--tolerance', type=float, default=0.5,
+                        help='allowed relative slowdown before failing (default 0.5 = 50%%)')
+    args = parser.parse_args()
+
+    os.environ['UIS_FAKE_SHEETS'] = '1'
+    workdir = tempfile.mkdtemp(prefix='uis-bench-')
+    os.chdir(workdir)
+
+    results = {}
+    print(f"{'scenario':>16} {'p50 ms':>9} {'p90 ms':>9} {'runs/s':>9} {'peak KB':>9} {'elements':>9}")
+    for name, setup in SCENARIOS.items():
+        results[name] = run_scenario(setup, args.runs)
+        r = results[name]
+        print(f"{name:>16} {r['p50_ms']:>9.1f} {r['p90_ms']:>9.1f} {r['per_sec']:>9.1f} {r['peak_kb']:>9.0f} "
+              f"{r['elements']:>9}")
+    print(f"valid submissions/sec through the script path: {results['valid_submit']['per_sec']:.1f}")
+    submitted = args.runs + 4
+    print(f'leads delivered to the fake sheet: {wait_for_delivery(submitted)} of {submitted}')
+
+    if args.save_baseline:
+        with open(BASELINE, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f'baseline saved to {BASELINE}')
+        return 0
+    if not os.path.exists(BASELINE):
+        print('no baseline yet, run with --save-baseline')
+        return 0
+    with open(BASELINE, encoding='utf-8') as f:
+        regressions = compare(results, json.load(f), args.tolerance)
+    for regression in regressions:
+        print(f'REGRESSION {regression}')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
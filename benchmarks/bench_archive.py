@@ -0,0 +1,121 @@
+"""Benchmark analytics queries on the Parquet archive against the backup CSV.
+
+Usage: python benchmarks/bench_archive.py [--rows 1000000] [--days 365]
+
+A backup CSV of --rows leads spread over --days days is generated and
+compacted into the archive. Each query is then answered from the CSV with
+pandas (reading only the needed columns) and from the archive, and the
+best of three timings is reported for each. Needs pandas and pyarrow.
+"""
+import argparse
+import csv
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import pandas as pd  # noqa: E402
+import pyarrow.dataset as ds  # noqa: E402
+
+from archive import compact_csv, query  # noqa: E402
+from storage import LEAD_COLUMNS  # noqa: E402
+
+STATES = ['Massachusetts', 'New Hampshire', 'Connecticut', 'Rhode Island', 'New York', 'New Jersey',
+          'Pennsylvania', 'Florida', 'Texas', 'California', 'Illinois', 'Ohio', 'Georgia', 'Virginia']
+TYPES = ['Medicare', 'Life Insurance', 'Health Insurance', 'Final Expense', 'Annuities', 'Dental & Vision']
+
+
+def generate_csv(csv_file, rows, days):
+    """Leads in timestamp order, the way the app appends them"""
+    rng = random.Random(0)
+    start = datetime(2024, 1, 1)
+    step = days * 86400 / rows
+    with open(csv_file, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f, lineterminator='\n')
+        writer.writerow(LEAD_COLUMNS)
+        for i in range(rows):
+            timestamp = (start + timedelta(seconds=i * step)).strftime('%Y-%m-%d %H:%M:%S')
+            writer.writerow([timestamp, f'Lead {i}', f'lead{i}@example.com', str(5550000000 + i),
+                             rng.choice(STATES), rng.choice(TYPES), '', 'New', 'Web Form'])
+
+
+def csv_types_in_month(csv_file):
+    df = pd.read_csv(csv_file, usecols=['Timestamp', 'Insurance_Type'])
+    return df[df['Timestamp'].str.startswith('2024-03')]['Insurance_Type'].value_counts()
+
+
+def archive_types_in_month(archive_dir):
+    table = query(archive_dir, columns=['Insurance_Type'], start='2024-03-01', end='2024-03-31')
+    return table.group_by('Insurance_Type').aggregate([('Insurance_Type', 'count')])
+
+
+def csv_states(csv_file):
+    return pd.read_csv(csv_file, usecols=['State'])['State'].value_counts()
+
+
+def archive_states(archive_dir):
+    return query(archive_dir, columns=['State']).group_by('State').aggregate([('State', 'count')])
+
+
+def csv_one_day_in_state(csv_file):
+    df = pd.read_csv(csv_file, usecols=['Timestamp', 'State'])
+    return int((df['Timestamp'].str.startswith('2024-06-15') & (df['State'] == 'Massachusetts')).sum())
+
+
+def archive_one_day_in_state(archive_dir):
+    return query(archive_dir, columns=['State'], start='2024-06-15', end='2024-06-15',
+                 where=ds.field('State') == 'Massachusetts').num_rows
+
+
+QUERIES = [
+    ('lead count by type, one month', csv_types_in_month, archive_types_in_month),
+    ('lead count by state, all time', csv_states, archive_states),
+    ('leads in one state on one day', csv_one_day_in_state, archive_one_day_in_state),
+]
+
+
+def best_of(fn, arg, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(arg)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def disk_usage(path):
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(root, name))
+               for root, _, names in os.walk(path) for name in names)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--days', type=int, default=365)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_file = os.path.join(tmp, 'insurance_leads_backup.csv')
+        archive_dir = os.path.join(tmp, 'leads_archive')
+        generate_csv(csv_file, args.rows, args.days)
+        start = time.perf_counter()
+        archived = compact_csv(csv_file, archive_dir)
+        print(f'compacted {archived:,} leads in {time.perf_counter() - start:.1f} s; '
+              f'CSV {disk_usage(csv_file) / 1e6:.1f} MB, archive {disk_usage(archive_dir) / 1e6:.1f} MB')
+
+        print(f"{'query':>32} {'CSV ms':>10} {'archive ms':>11} {'speedup':>8}")
+        for label, on_csv, on_archive in QUERIES:
+            csv_time = best_of(on_csv, csv_file)
+            archive_time = best_of(on_archive, archive_dir)
+            print(f'{label:>32} {csv_time * 1000:>10.1f} {archive_time * 1000:>11.1f} '
+                  f'{csv_time / archive_time:>7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""Benchmark column-wise lead validation against checking one row at a time.
+
+Usage: python benchmarks/bench_bulk_validation.py [--rows 1000000] [--chunk-rows 50000]
+
+Generates partner rows (about 1 in 5 invalid) as string DataFrames of
+chunk-rows rows, the shape bulk_import.read_chunks produces, and times
+validation.validate_frame over all of them. The per-row loop applies the same
+rules with the form's validate_* functions on a sample of the rows. Exits
+non-zero if column-wise validation is under the 100k rows/sec target.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import pandas as pd  # noqa: E402
+
+from catalog import INSURANCE_TYPES, LICENSED_STATES  # noqa: E402
+from validation import (INSURANCE_TYPE_LOOKUP, STATE_LOOKUP, normalize_email,  # noqa: E402
+                        normalize_phone, validate_email, validate_frame, validate_name, validate_phone)
+
+TARGET_ROWS_PER_SEC = 100000
+COLUMNS = ['First_Name', 'Last_Name', 'Email', 'Phone', 'State', 'Insurance_Type', 'Notes', 'Timestamp']
+
+
+def generate_frame(rows, start, rng):
+    states = LICENSED_STATES + ['Alaska']
+    types = list(INSURANCE_TYPES) + ['Pet Insurance']
+    data = []
+    for i in range(start, start + rows):
+        bad = rng.random() < 0.02
+        data.append([
+            'J' if bad else f'First{i}',
+            f'Last{i}',
+            f'lead{i}@example' if rng.random() < 0.02 else f' Lead{i}@Example.com ',
+            f'({i % 900 + 100}) 555-{i % 10000:04d}' if rng.random() > 0.02 else '555-1234',
+            rng.choice(states).lower() if rng.random() < 0.3 else rng.choice(states),
+            rng.choice(types),
+            '',
+            '',
+        ])
+    frame = pd.DataFrame(data, columns=COLUMNS, dtype=str)
+    frame.index = range(start + 2, start + 2 + rows)
+    return frame
+
+
+def validate_rows(frame):
+    """The form's checks applied one row at a time, for comparison"""
+    accepted = rejected = 0
+    for first, last, email, phone, state, insurance_type, _, _ in frame.itertuples(index=False):
+        ok = (validate_name(first) and validate_name(last) and validate_email(email.strip())
+              and validate_phone(phone) and state.strip().lower() in STATE_LOOKUP
+              and insurance_type.strip().lower() in INSURANCE_TYPE_LOOKUP)
+        if ok:
+            normalize_email(email)
+            normalize_phone(phone)
+            accepted += 1
+        else:
+            rejected += 1
+    return accepted, rejected
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--chunk-rows', type=int, default=50000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    frames = [generate_frame(min(args.chunk_rows, args.rows - start), start, rng)
+              for start in range(0, args.rows, args.chunk_rows)]
+
+    accepted = rejected = 0
+    started = time.perf_counter()
+    for frame in frames:
+        ok, bad = validate_frame(frame)
+        accepted += len(ok)
+        rejected += len(bad)
+    vectorized = time.perf_counter() - started
+    vectorized_rate = args.rows / vectorized
+    print(f'column-wise: {args.rows:,} rows in {vectorized:.2f} s = {vectorized_rate:,.0f} rows/s '
+          f'({accepted:,} accepted, {rejected:,} rejected)')
+
+    sample = frames[0]
+    started = time.perf_counter()
+    row_accepted, _ = validate_rows(sample)
+    per_row = time.perf_counter() - started
+    print(f'row by row:  {len(sample):,} rows in {per_row:.2f} s = {len(sample) / per_row:,.0f} rows/s')
+
+    expected = len(validate_frame(sample)[0])
+    if row_accepted != expected:
+        print(f'MISMATCH: row by row accepted {row_accepted}, column-wise accepted {expected}')
+        sys.exit(1)
+    if vectorized_rate < TARGET_ROWS_PER_SEC:
+        print(f'FAILED: below the {TARGET_ROWS_PER_SEC:,} rows/s target')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
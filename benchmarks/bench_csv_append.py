@@ -0,0 +1,86 @@
+"""Benchmark the local CSV fallback writer as the backup file grows.
+
+Usage: python benchmarks/bench_csv_append.py [--max-rows 50000] [--samples 200]
+
+The per-write cost of append_lead_csv should stay flat regardless of how many
+leads are already in the file. If pandas is installed, the previous
+read-concat-rewrite implementation is measured alongside for comparison.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from storage import LEAD_COLUMNS, append_lead_csv  # noqa: E402
+
+
+def sample_lead(i):
+    return {
+        'Timestamp': '2024-01-01 12:00:00',
+        'Name': f'Lead {i}',
+        'Email': f'lead{i}@example.com',
+        'Phone': f'{5550000000 + i}',
+        'State': 'Massachusetts',
+        'Insurance_Type': 'Medicare',
+        'Notes': '',
+        'Status': 'New',
+        'Source': 'Web Form',
+    }
+
+
+def legacy_append(csv_file, data):
+    import pandas as pd
+    if os.path.exists(csv_file):
+        df = pd.read_csv(csv_file)
+        df = pd.concat([df, pd.DataFrame([data])], ignore_index=True)
+    else:
+        df = pd.DataFrame([data])
+    df.to_csv(csv_file, index=False)
+
+
+def prefill(csv_file, rows):
+    """Write rows directly so growing the file is not part of the measurement"""
+    with open(csv_file, 'w', encoding='utf-8') as f:
+        f.write(','.join(LEAD_COLUMNS) + '\n')
+        for i in range(rows):
+            f.write(','.join(str(sample_lead(i)[c]) for c in LEAD_COLUMNS) + '\n')
+
+
+def measure(writer, csv_file, samples):
+    start = time.perf_counter()
+    for i in range(samples):
+        writer(csv_file, sample_lead(i))
+    return (time.perf_counter() - start) / samples * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--max-rows', type=int, default=50000)
+    parser.add_argument('--samples', type=int, default=200)
+    args = parser.parse_args()
+
+    try:
+        import pandas  # noqa: F401
+        writers = [('append_lead_csv', append_lead_csv), ('legacy pandas', legacy_append)]
+    except ImportError:
+        writers = [('append_lead_csv', append_lead_csv)]
+
+    sizes = [0, 1000, 10000, args.max_rows]
+    print(f"{'existing rows':>14} " + ' '.join(f'{name + " us/write":>24}' for name, _ in writers))
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_file = os.path.join(tmp, 'insurance_leads_backup.csv')
+        for size in sizes:
+            results = []
+            for _, writer in writers:
+                prefill(csv_file, size)
+                # The legacy writer is O(rows); keep its sample count small at large sizes
+                samples = args.samples if writer is append_lead_csv else max(5, args.samples // 20)
+                results.append(measure(writer, csv_file, samples))
+            print(f'{size:>14} ' + ' '.join(f'{r:>24.1f}' for r in results))
+
+
+if __name__ == '__main__':
+    main()
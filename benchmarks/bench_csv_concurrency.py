@@ -0,0 +1,142 @@
+"""Stress the local CSV fallback with many processes writing at once.
+
+Usage: python benchmarks/bench_csv_concurrency.py [--processes 8] [--writes 500] [--threads 2] [--legacy]
+
+Each process (and each thread inside it) appends its own uniquely named leads
+to one shared file. Afterwards the file is parsed and checked: exactly one
+header, every expected lead present once, no extra or malformed rows. With
+--legacy the previous pandas read-concat-rewrite writer is run the same way
+to show the leads it loses. Exits non-zero if any lead is lost or torn.
+"""
+import argparse
+import csv
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from storage import LEAD_COLUMNS, append_lead_csv  # noqa: E402
+
+
+def sample_lead(worker, i):
+    return {
+        'Timestamp': '2024-01-01 12:00:00',
+        'Name': f'w{worker}-{i}',
+        'Email': f'w{worker}.{i}@example.com',
+        'Phone': f'{5550000000 + i}',
+        'State': 'Massachusetts',
+        # Commas, quotes and newlines make torn or interleaved rows easy to spot
+        'Insurance_Type': 'Medicare',
+        'Notes': f'Call after 5pm, "urgent"\nworker {worker}',
+        'Status': 'New',
+        'Source': 'Web Form',
+    }
+
+
+def legacy_append(csv_file, data):
+    import pandas as pd
+    if os.path.exists(csv_file):
+        df = pd.read_csv(csv_file)
+        df = pd.concat([df, pd.DataFrame([data])], ignore_index=True)
+    else:
+        df = pd.DataFrame([data])
+    df.to_csv(csv_file, index=False)
+
+
+def run_process(csv_file, process_index, threads, writes, legacy, start_event):
+    write = legacy_append if legacy else append_lead_csv
+    errors = []
+
+    def run_thread(thread_index):
+        worker = process_index * threads + thread_index
+        for i in range(writes):
+            try:
+                write(csv_file, sample_lead(worker, i))
+            except Exception as e:
+                # The legacy writer can read a half-written file and fail outright
+                errors.append(e)
+
+    start_event.wait()
+    pool = [threading.Thread(target=run_thread, args=(t,)) for t in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    if errors:
+        sys.exit(min(len(errors), 100))
+
+
+def verify(csv_file, workers, writes):
+    """Return (lost, duplicated, malformed, headers) counts for the finished file"""
+    expected = {f'w{w}-{i}' for w in range(workers) for i in range(writes)}
+    seen = set()
+    duplicated = malformed = headers = 0
+    with open(csv_file, newline='', encoding='utf-8') as f:
+        for row in csv.reader(f):
+            if row == LEAD_COLUMNS:
+                headers += 1
+                continue
+            if len(row) != len(LEAD_COLUMNS) or row[1] not in expected:
+                malformed += 1
+                continue
+            lead = dict(zip(LEAD_COLUMNS, row))
+            worker = int(lead['Name'][1:].split('-')[0])
+            i = int(lead['Name'].split('-')[1])
+            if lead != sample_lead(worker, i):
+                malformed += 1
+                continue
+            if lead['Name'] in seen:
+                duplicated += 1
+            seen.add(lead['Name'])
+    return len(expected - seen), duplicated, malformed, headers
+
+
+def run(processes, threads, writes, legacy):
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_file = os.path.join(tmp, 'leads.csv')
+        start_event = multiprocessing.Event()
+        pool = [multiprocessing.Process(target=run_process,
+                                        args=(csv_file, p, threads, writes, legacy, start_event))
+                for p in range(processes)]
+        for process in pool:
+            process.start()
+        start = time.perf_counter()
+        start_event.set()
+        for process in pool:
+            process.join()
+        elapsed = time.perf_counter() - start
+        failed_writes = sum(process.exitcode for process in pool)
+        lost, duplicated, malformed, headers = verify(csv_file, processes * threads, writes)
+    total = processes * threads * writes
+    label = 'legacy pandas rewrite' if legacy else 'append_lead_csv'
+    print(f'{label}: {processes} processes x {threads} threads x {writes} writes = {total} leads')
+    print(f'  elapsed {elapsed:.2f} s, {total / elapsed:,.0f} writes/s')
+    print(f'  lost {lost}, duplicated {duplicated}, malformed {malformed}, '
+          f'headers {headers}, failed writes {failed_writes}')
+    return lost == duplicated == malformed == failed_writes == 0 and headers == 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--processes', type=int, default=8)
+    parser.add_argument('--threads', type=int, default=2)
+    parser.add_argument('--writes', type=int, default=500)
+    parser.add_argument('--legacy', action='store_true',
+                        help='also run the old pandas writer for comparison (needs pandas)')
+    args = parser.parse_args()
+
+    ok = run(args.processes, args.threads, args.writes, legacy=False)
+    if args.legacy:
+        # Fewer writes: the legacy writer rereads the whole file every time
+        run(args.processes, args.threads, min(args.writes, 50), legacy=True)
+    if not ok:
+        print('FAILED: leads were lost or torn')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
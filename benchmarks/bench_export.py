@@ -0,0 +1,115 @@
+"""Benchmark streaming exports against building the whole file with pandas.
+
+Usage: python benchmarks/bench_export.py [--rows 200000] [--no-pandas]
+
+Leads are read from a generated backup CSV through CsvLeadStore.leads(),
+the way admin.py and export.py read them. Each run happens in a fresh
+process so peak RSS growth over the post-import baseline can be compared.
+Time to first byte is how long a download would wait for its first chunk.
+"""
+import argparse
+import csv
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from storage import LEAD_COLUMNS  # noqa: E402
+
+STATES = ['Massachusetts', 'New York', 'Florida', 'Texas', 'Ohio']
+TYPES = ['Medicare', 'Life Insurance', 'Annuities', 'Disability']
+
+
+def generate_csv(csv_file, rows):
+    with open(csv_file, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f, lineterminator='\n')
+        writer.writerow(LEAD_COLUMNS)
+        for i in range(rows):
+            writer.writerow([f'2024-{i % 12 + 1:02d}-15 12:00:00', f'Lead {i}', f'lead{i}@example.com',
+                             str(5550000000 + i), STATES[i % len(STATES)], TYPES[i % len(TYPES)],
+                             'Prefers a call after 5pm', 'New', 'Web Form'])
+
+
+def max_rss_mb():
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    scale = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+
+
+def run_streaming(csv_file, file_format, out_file, result):
+    import export
+    # export imports these lazily; load them before the baseline so only the export is measured
+    import archive  # noqa: F401
+    import openpyxl  # noqa: F401
+    from lead_store import CsvLeadStore
+
+    baseline = max_rss_mb()
+    stream = export.FORMATS[file_format][0]
+    start = time.perf_counter()
+    first_byte = None
+    with open(out_file, 'wb') as f:
+        for data in stream(CsvLeadStore(csv_file).leads()):
+            if first_byte is None:
+                first_byte = time.perf_counter() - start
+            f.write(data)
+    result.put((time.perf_counter() - start, first_byte, max_rss_mb() - baseline))
+
+
+def run_pandas(csv_file, file_format, out_file, result):
+    import pandas as pd
+    import pyarrow  # noqa: F401
+    import openpyxl  # noqa: F401
+    from lead_store import CsvLeadStore
+
+    baseline = max_rss_mb()
+    start = time.perf_counter()
+    df = pd.DataFrame(list(CsvLeadStore(csv_file).leads()), columns=LEAD_COLUMNS)
+    if file_format == 'csv':
+        df.to_csv(out_file, index=False)
+    elif file_format == 'xlsx':
+        df.to_excel(out_file, index=False)
+    else:
+        df.to_parquet(out_file, index=False)
+    elapsed = time.perf_counter() - start
+    # Nothing can be sent until the whole file exists
+    result.put((elapsed, elapsed, max_rss_mb() - baseline))
+
+
+def measure(target, csv_file, file_format, out_file):
+    context = multiprocessing.get_context('spawn')
+    result = context.Queue()
+    process = context.Process(target=target, args=(csv_file, file_format, out_file, result))
+    process.start()
+    elapsed, first_byte, rss = result.get()
+    process.join()
+    return elapsed, first_byte, rss, os.path.getsize(out_file)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--no-pandas', action='store_true', help='skip the pandas comparison')
+    args = parser.parse_args()
+
+    methods = [('streaming', run_streaming)]
+    if not args.no_pandas:
+        methods.append(('pandas', run_pandas))
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_file = os.path.join(tmp, 'insurance_leads_backup.csv')
+        generate_csv(csv_file, args.rows)
+        print(f'{args.rows:,} leads')
+        print(f"{'format':>8} {'method':>10} {'total s':>8} {'first byte s':>13} {'RSS +MB':>8} {'file MB':>8}")
+        for file_format in ('csv', 'xlsx', 'parquet'):
+            for label, target in methods:
+                out_file = os.path.join(tmp, f'export.{file_format}')
+                elapsed, first_byte, rss, size = measure(target, csv_file, file_format, out_file)
+                print(f'{file_format:>8} {label:>10} {elapsed:>8.2f} {first_byte:>13.3f} '
+                      f'{rss:>8.1f} {size / 1e6:>8.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,166 @@
+"""Benchmark per-append latency over warm (pooled keep-alive) and cold connections.
+
+Usage: python benchmarks/bench_http_pool.py [--appends 200] [--rtt 0.02] [--idle-timeout 1.0]
+
+A local HTTPS server with a throwaway self-signed certificate stands in for
+the Sheets API values:append endpoint. Loopback has next to no latency, so
+the server adds --rtt seconds to every request and two more round trips to
+every new connection, the TCP and TLS handshakes a real one costs. Appends
+are sent three ways:
+
+  pooled      one session from google_http.pool_session, so connections are reused
+  cold        a new session per append, so every append pays the handshakes
+  idle        the pooled session, waiting past the server's --idle-timeout between
+              appends, so the server has closed the connection each time
+
+The script exits non-zero if warm appends are not faster than cold ones.
+"""
+import argparse
+import datetime
+import gzip
+import http.server
+import json
+import os
+import ssl
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import requests  # noqa: E402
+from cryptography import x509  # noqa: E402
+from cryptography.hazmat.primitives import hashes, serialization  # noqa: E402
+from cryptography.hazmat.primitives.asymmetric import ec  # noqa: E402
+from cryptography.x509.oid import NameOID  # noqa: E402
+
+from google_http import pool_session  # noqa: E402
+from perf import percentile  # noqa: E402
+
+ROW = ['2024-01-01 12:00:00', 'Jane Doe', 'jane@example.com', '5551234567',
+       'Massachusetts', 'Medicare', '', 'New', 'Web Form']
+
+
+def write_certificate(directory):
+    """Self-signed certificate for localhost; returns (cert_file, key_file)"""
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, 'localhost')])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (x509.CertificateBuilder().subject_name(name).issuer_name(name)
+            .public_key(key.public_key()).serial_number(x509.random_serial_number())
+            .not_valid_before(now - datetime.timedelta(minutes=5))
+            .not_valid_after(now + datetime.timedelta(days=1))
+            .add_extension(x509.SubjectAlternativeName([x509.DNSName('localhost')]), critical=False)
+            .sign(key, hashes.SHA256()))
+    cert_file = os.path.join(directory, 'cert.pem')
+    key_file = os.path.join(directory, 'key.pem')
+    with open(cert_file, 'wb') as f:
+        f.write(cert.public_bytes(serialization.Encoding.PEM))
+    with open(key_file, 'wb') as f:
+        f.write(key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8,
+                                  serialization.NoEncryption()))
+    return cert_file, key_file
+
+
+def make_handler(rtt, idle_timeout, stats):
+    class AppendHandler(http.server.BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        # Headers and body go out as separate writes; do not hold the body back for an ACK
+        disable_nagle_algorithm = True
+        timeout = idle_timeout
+
+        def setup(self):
+            super().setup()
+            with stats['lock']:
+                stats['connections'] += 1
+            # TCP and TLS handshakes
+            time.sleep(2 * rtt)
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get('Content-Length', 0)))
+            time.sleep(rtt)
+            body = json.dumps({'updates': {'updatedRange': 'Sheet1!A2:I2', 'updatedRows': 1,
+                                           'updatedColumns': len(ROW), 'updatedCells': len(ROW)}}).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            if 'gzip' in self.headers.get('User-Agent', '') and 'gzip' in self.headers.get('Accept-Encoding', ''):
+                body = gzip.compress(body)
+                self.send_header('Content-Encoding', 'gzip')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return AppendHandler
+
+
+def start_server(rtt, idle_timeout, cert_file, key_file):
+    stats = {'connections': 0, 'lock': threading.Lock()}
+    server = http.server.ThreadingHTTPServer(('localhost', 0), make_handler(rtt, idle_timeout, stats))
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(cert_file, key_file)
+    server.socket = context.wrap_socket(server.socket, server_side=True)
+    threading.Thread(target=server.serve_forever, name='https-stand-in', daemon=True).start()
+    return server, stats
+
+
+def append(session, url, cert_file):
+    started = time.perf_counter()
+    response = session.post(url, json={'values': [ROW]}, params={'valueInputOption': 'RAW'},
+                            verify=cert_file, timeout=(5.0, 30.0))
+    response.raise_for_status()
+    response.json()
+    return time.perf_counter() - started
+
+
+def run(mode, url, cert_file, args):
+    latencies = []
+    session = pool_session(requests.Session())
+    # The first append opens the pooled connection in every mode
+    append(session, url, cert_file)
+    for _ in range(args.appends if mode != 'idle' else args.idle_appends):
+        if mode == 'cold':
+            session.close()
+            session = pool_session(requests.Session())
+        elif mode == 'idle':
+            time.sleep(args.idle_timeout * 1.5)
+        latencies.append(append(session, url, cert_file))
+    session.close()
+    return sorted(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--appends', type=int, default=200)
+    parser.add_argument('--idle-appends', type=int, default=8)
+    parser.add_argument('--rtt', type=float, default=0.02, help='simulated network round trip in seconds')
+    parser.add_argument('--idle-timeout', type=float, default=1.0,
+                        help='seconds the server keeps an idle connection open')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='uis-https-') as directory:
+        cert_file, key_file = write_certificate(directory)
+        server, stats = start_server(args.rtt, args.idle_timeout, cert_file, key_file)
+        url = f'https://localhost:{server.server_address[1]}/v4/spreadsheets/sheet-id/values/Sheet1!A1:append'
+        results = {}
+        print(f"{'mode':>8} {'appends':>8} {'connections':>12} {'p50 ms':>8} {'p99 ms':>8} {'mean ms':>8}")
+        for mode in ('pooled', 'cold', 'idle'):
+            before = stats['connections']
+            latencies = run(mode, url, cert_file, args)
+            results[mode] = latencies
+            print(f'{mode:>8} {len(latencies):>8} {stats["connections"] - before:>12} '
+                  f'{percentile(latencies, 50) * 1000:>8.1f} {percentile(latencies, 99) * 1000:>8.1f} '
+                  f'{statistics.mean(latencies) * 1000:>8.1f}')
+        server.shutdown()
+
+    if percentile(results['pooled'], 50) >= percentile(results['cold'], 50):
+        print('FAILED: pooled appends are not faster than cold ones')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
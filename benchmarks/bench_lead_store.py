@@ -0,0 +1,106 @@
+"""Compare write throughput and latency of the SQLite and CSV lead stores.
+
+Usage: python benchmarks/bench_lead_store.py [--writes 2000] [--threads 8]
+
+Two workloads are run against a fresh store in a temp directory:
+
+  save    one thread calling save() in a loop, one durable write per lead
+  submit  many threads calling submit() and waiting on the Future, the way
+          the app's write queue workers and journal replayer use the store
+
+Both report writes/sec and p50/p99 per-lead latency in milliseconds.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from lead_store import CsvLeadStore, SqliteLeadStore  # noqa: E402
+from perf import percentile  # noqa: E402
+
+
+def sample_lead(i):
+    return {
+        'Timestamp': '2024-01-01 12:00:00',
+        'Name': f'Lead {i}',
+        'Email': f'lead{i}@example.com',
+        'Phone': f'{5550000000 + i}',
+        'State': 'Massachusetts',
+        'Insurance_Type': 'Medicare',
+        'Notes': '',
+        'Status': 'New',
+        'Source': 'Web Form',
+    }
+
+
+def run_save(store, writes):
+    latencies = []
+    start = time.perf_counter()
+    for i in range(writes):
+        began = time.perf_counter()
+        store.save(sample_lead(i))
+        latencies.append(time.perf_counter() - began)
+    return latencies, time.perf_counter() - start
+
+
+def run_submit(store, writes, threads):
+    latencies = []
+    lock = threading.Lock()
+
+    def worker(offset):
+        mine = []
+        for i in range(offset, writes, threads):
+            began = time.perf_counter()
+            store.submit(sample_lead(i)).result()
+            mine.append(time.perf_counter() - began)
+        with lock:
+            latencies.extend(mine)
+
+    pool = [threading.Thread(target=worker, args=(t,)) for t in range(threads)]
+    start = time.perf_counter()
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    return latencies, time.perf_counter() - start
+
+
+def report(label, workload, latencies, elapsed):
+    latencies.sort()
+    print(f'{label:>8} {workload:>8} {len(latencies) / elapsed:>12,.0f} '
+          f'{percentile(latencies, 50) * 1000:>9.3f} {percentile(latencies, 99) * 1000:>9.3f}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--writes', type=int, default=2000)
+    parser.add_argument('--threads', type=int, default=8)
+    args = parser.parse_args()
+
+    stores = [
+        ('csv', lambda tmp: CsvLeadStore(os.path.join(tmp, 'leads.csv'))),
+        ('sqlite', lambda tmp: SqliteLeadStore(os.path.join(tmp, 'leads.db'))),
+    ]
+    print(f"{'store':>8} {'workload':>8} {'writes/s':>12} {'p50 ms':>9} {'p99 ms':>9}")
+    for label, open_store in stores:
+        for workload in ('save', 'submit'):
+            with tempfile.TemporaryDirectory() as tmp:
+                store = open_store(tmp)
+                if workload == 'save':
+                    latencies, elapsed = run_save(store, args.writes)
+                else:
+                    latencies, elapsed = run_submit(store, args.writes, args.threads)
+                store.close()
+                report(label, workload, latencies, elapsed)
+                if label == 'sqlite' and workload == 'submit':
+                    stats = store.stats()
+                    print(f"{'':>8} {'':>8} {stats['batches_sent']} transactions, "
+                          f"mean batch {stats['mean_batch_size']:.1f} leads")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,153 @@
+"""Benchmark the lead submit path under simulated Google Sheets conditions.
+
+Usage: python benchmarks/bench_remote_conditions.py [--leads 40] [--sessions 8]
+
+Each scenario configures a fake worksheet (latency, random failures, quota,
+outage) and pushes the same burst of leads through two paths:
+
+  legacy    append_row per lead on the calling thread, CSV on failure
+  pipeline  the app's journal -> write queue -> batcher -> breaker/quota governor path
+
+and reports what a submitting session waits for, how long until every lead
+was written (to the sheet, or to the CSV for the legacy path), and how many
+leads ended up in the CSV fallback instead of the sheet.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from batching import RowBatcher  # noqa: E402
+from fake_sheets import FakeWorksheet, lognormal_latency  # noqa: E402
+from journal import JournalReplayer, LeadJournal  # noqa: E402
+from sheets import CircuitBreaker, QuotaGovernor, SheetsConnection  # noqa: E402
+from storage import LEAD_COLUMNS, append_lead_csv, lead_row  # noqa: E402
+from write_queue import LeadWriteQueue  # noqa: E402
+
+SCENARIOS = {
+    'healthy': dict(latency=lognormal_latency(0.3)),
+    'slow': dict(latency=lognormal_latency(1.5, sigma=0.6)),
+    'flaky': dict(latency=lognormal_latency(0.3), failure_rate=0.2),
+    'quota': dict(latency=lognormal_latency(0.3), write_quota=10),
+    'outage': dict(latency=lognormal_latency(0.3)),
+}
+OUTAGE_SECONDS = 3.0
+
+
+def make_worksheet(name):
+    worksheet = FakeWorksheet([LEAD_COLUMNS], seed=42, **SCENARIOS[name])
+    if name == 'outage':
+        worksheet.down = True
+        threading.Timer(OUTAGE_SECONDS, setattr, (worksheet, 'down', False)).start()
+    return worksheet
+
+
+def sample_lead(i):
+    return {
+        'Timestamp': '2024-01-01 12:00:00', 'Name': f'Lead {i}', 'Email': f'lead{i}@example.com',
+        'Phone': f'{5550000000 + i}', 'State': 'Massachusetts', 'Insurance_Type': 'Medicare',
+        'Notes': '', 'Status': 'New', 'Source': 'Web Form',
+    }
+
+
+def run_sessions(leads, sessions, submit):
+    """Submit leads from concurrent sessions and return each submit's latency"""
+    latencies = []
+    lock = threading.Lock()
+
+    def session(offset):
+        for i in range(offset, leads, sessions):
+            start = time.perf_counter()
+            submit(sample_lead(i))
+            with lock:
+                latencies.append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=session, args=(s,)) for s in range(sessions)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies
+
+
+def legacy(name, leads, sessions, tmp):
+    worksheet = make_worksheet(name)
+    csv_file = os.path.join(tmp, f'legacy-{name}.csv')
+    fallbacks = []
+
+    def submit(data):
+        try:
+            worksheet.append_row(lead_row(data))
+        except Exception:
+            append_lead_csv(csv_file, data)
+            fallbacks.append(data)
+
+    start = time.perf_counter()
+    latencies = run_sessions(leads, sessions, submit)
+    return latencies, time.perf_counter() - start, len(fallbacks), worksheet
+
+
+def pipeline(name, leads, sessions, tmp, timeout):
+    worksheet = make_worksheet(name)
+    governor = QuotaGovernor(writes_per_minute=SCENARIOS[name].get('write_quota', 60))
+    connection = SheetsConnection(lambda: worksheet, CircuitBreaker(base_delay=0.5, max_delay=2.0), governor)
+    batcher = RowBatcher(connection.append_rows, max_rows=100, max_delay=0.2)
+    journal = LeadJournal(os.path.join(tmp, f'journal-{name}.jsonl'))
+
+    def deliver(data):
+        return batcher.submit(lead_row(data))
+
+    replayer = JournalReplayer(journal, deliver, retry_interval=0.5).start()
+    write_queue = LeadWriteQueue(journal, deliver)
+
+    def submit(data):
+        write_queue.put(journal.append(data), data)
+
+    start = time.perf_counter()
+    latencies = run_sessions(leads, sessions, submit)
+    deadline = time.monotonic() + timeout
+    while journal.pending() and time.monotonic() < deadline:
+        time.sleep(0.02)
+    drained = time.perf_counter() - start
+    write_queue.close()
+    batcher.close()
+    replayer.notify()
+    return latencies, drained, len(journal.pending()), worksheet, connection, batcher
+
+
+def ms(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(pct / 100 * len(values)))] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--leads', type=int, default=40)
+    parser.add_argument('--sessions', type=int, default=8)
+    parser.add_argument('--timeout', type=float, default=60.0)
+    args = parser.parse_args()
+
+    print(f"{'scenario':>9} {'path':>9} {'submit p50':>11} {'submit p99':>11} {'finished in':>13} "
+          f"{'in sheet':>9} {'to CSV':>7} {'pending':>8} {'API calls':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in SCENARIOS:
+            latencies, elapsed, fallbacks, worksheet = legacy(name, args.leads, args.sessions, tmp)
+            print(f'{name:>9} {"legacy":>9} {ms(latencies, 50):>9.0f}ms {ms(latencies, 99):>9.0f}ms '
+                  f'{elapsed:>12.1f}s {worksheet.row_count() - 1:>9} {fallbacks:>7} {0:>8} '
+                  f'{sum(worksheet.calls.values()):>10}')
+            latencies, elapsed, pending, worksheet, connection, batcher = pipeline(
+                name, args.leads, args.sessions, tmp, args.timeout)
+            stats = batcher.stats()
+            print(f'{name:>9} {"pipeline":>9} {ms(latencies, 50):>9.0f}ms {ms(latencies, 99):>9.0f}ms '
+                  f'{elapsed:>12.1f}s {worksheet.row_count() - 1:>9} {0:>7} {pending:>8} '
+                  f'{sum(worksheet.calls.values()):>10}   '
+                  f'(mean batch {stats["mean_batch_size"]:.1f}, breaker opened '
+                  f'{connection.breaker.stats()["times_opened"]}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""Benchmark the worksheet header check done at startup.
+
+Usage: python benchmarks/bench_sheets_init.py [--rows 100000] [--repeat 5]
+
+Compares the previous get_all_values() check, which downloads the whole
+sheet, with ensure_header(), which reads only row 1, against a fake worksheet
+already holding --rows leads.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from fake_sheets import FakeWorksheet  # noqa: E402
+from sheets import ensure_header  # noqa: E402
+from storage import LEAD_COLUMNS  # noqa: E402
+
+
+def legacy_header_check(worksheet, header):
+    if not worksheet.get_all_values():
+        worksheet.append_row(header)
+
+
+def build_worksheet(rows):
+    lead = ['2024-01-01 12:00:00', 'Jane Doe', 'jane@example.com', '5551234567',
+            'Massachusetts', 'Medicare', '', 'New', 'Web Form']
+    return FakeWorksheet([LEAD_COLUMNS] + [lead] * rows)
+
+
+def measure(check, worksheet, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        check(worksheet, LEAD_COLUMNS)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    worksheet = build_worksheet(args.rows)
+    print(f'worksheet with {args.rows} leads')
+    print(f"{'get_all_values check':>24}: {measure(legacy_header_check, worksheet, args.repeat):10.3f} ms")
+    print(f"{'ensure_header':>24}: {measure(ensure_header, worksheet, args.repeat):10.3f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,178 @@
+"""Cold-start benchmark of app.py: import profile and time to first render.
+
+Usage: python benchmarks/bench_startup.py [--runs 5] [--top 15] [--sheets-connect 1.5]
+    [--think-time 0 2] [--save-baseline] [--tolerance 0.25]
+
+Every run is a fresh Python process, the way an autoscaled container
+starts. The child imports Streamlit's AppTest, then runs app.py once with
+no Sheets credentials; "first render" is the wall time of that first script
+run, which includes importing everything app.py needs that Streamlit has not
+already loaded. One extra run under ``python -X importtime`` lists the
+modules app.py itself pulls in, by cumulative import time, and the total per
+top-level package.
+
+The same cold start is then timed with Sheets configured, using the fake
+worksheet with a --sheets-connect second delay standing in for
+service-account auth and the spreadsheet lookup, once with the connection
+opened in the background (the default) and once with UIS_SHEETS_WARM_UP=0,
+which connects before the first render as before. Those runs also time the
+first form submit, made each --think-time seconds after the page appeared;
+it only waits if the connection is still being opened.
+
+Absolute timings depend on the machine, so the regression check uses first
+render divided by the Streamlit import time of the same process, which
+scales with CPU speed the same way. The median of that ratio is compared
+with benchmarks/baseline_startup.json; the script exits non-zero when it is
+larger by more than --tolerance.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+APP = os.path.abspath(os.path.join(ROOT, 'app.py'))
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline_startup.json')
+MARKER = 'uis-startup-app-run'
+FORM = {
+    'first_name': 'Jane',
+    'last_name': 'Doe',
+    'email': 'jane.doe@example.com',
+    'phone': '(555) 123-4567',
+}
+
+
+def child(think_time):
+    """Runs in the fresh process: time the Streamlit import, the first script run and optionally a submit"""
+    started = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+    imported = time.perf_counter()
+    # Everything importtime logs after this line was imported by the app run
+    print(MARKER, file=sys.stderr, flush=True)
+    at = AppTest.from_file(APP, default_timeout=60).run()
+    rendered = time.perf_counter()
+    if at.exception:
+        raise SystemExit(f'app raised: {at.exception}')
+    result = {'streamlit_import_ms': (imported - started) * 1000,
+              'first_render_ms': (rendered - imported) * 1000,
+              'render_per_import': (rendered - imported) / (imported - started)}
+    if think_time is not None:
+        # A visitor takes a while to fill in the form
+        time.sleep(think_time)
+        for key, value in FORM.items():
+            at.text_input(key=key).input(value)
+        at.selectbox(key='state').select('Massachusetts')
+        at.selectbox(key='insurance_type').select('Medicare')
+        submit_started = time.perf_counter()
+        at.button[0].click().run()
+        result['first_submit_ms'] = (time.perf_counter() - submit_started) * 1000
+        if at.exception:
+            raise SystemExit(f'app raised: {at.exception}')
+    print(json.dumps(result), flush=True)
+    # Skip waiting for the lead to reach the fake sheet on exit
+    os._exit(0)
+
+
+def spawn(extra_args=(), env_overrides=None, think_time=None):
+    env = dict(os.environ)
+    for name in ('UIS_FAKE_SHEETS', 'UIS_PERF', 'UIS_SHEETS_WARM_UP', 'UIS_LEAD_STORE'):
+        env.pop(name, None)
+    env.update(env_overrides or {})
+    command = [sys.executable, *extra_args, os.path.abspath(__file__), '--child']
+    if think_time is not None:
+        command += ['--submit-after', str(think_time)]
+    with tempfile.TemporaryDirectory(prefix='uis-startup-') as workdir:
+        result = subprocess.run(command, cwd=workdir, env=env, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1]), result.stderr
+
+
+def median_runs(runs, metrics, **spawn_args):
+    results = [spawn(**spawn_args)[0] for _ in range(runs)]
+    return {metric: statistics.median(result[metric] for result in results) for metric in metrics}
+
+
+def import_profile(stderr):
+    """(module, cumulative_us) for each top-level import made by the app run, plus per-package totals"""
+    lines = stderr.splitlines()
+    lines = lines[lines.index(MARKER) + 1:] if MARKER in lines else []
+    modules = []
+    packages = defaultdict(int)
+    for line in lines:
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        name = name.strip()
+        modules.append((name, int(cumulative)))
+        # The outermost entry of a chain already includes its children
+        if depth == 0:
+            packages[name.split('.')[0]] += int(cumulative)
+    return modules, packages
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--submit-after', type=float, help=argparse.SUPPRESS)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=15)
+    parser.add_argument('--sheets-connect', type=float, default=1.5,
+                        help='seconds the fake Sheets connection takes to open (0 to skip those runs)')
+    parser.add_argument('--think-time', type=float, nargs='+', default=[0.0, 2.0],
+                        help='seconds between the first render and the submit')
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='allowed relative slowdown before failing (default 0.25 = 25%%)')
+    args = parser.parse_args()
+    if args.child:
+        child(args.submit_after)
+        return 0
+
+    _, stderr = spawn(['-X', 'importtime'])
+    modules, packages = import_profile(stderr)
+    print(f'imports made by the first app run: {len(modules)} modules, '
+          f'{sum(packages.values()) / 1000:.1f} ms')
+    print(f"{'package':>28} {'cumulative ms':>14}")
+    for name, us in sorted(packages.items(), key=lambda item: -item[1])[:args.top]:
+        print(f'{name:>28} {us / 1000:>14.1f}')
+
+    result = median_runs(args.runs, ('streamlit_import_ms', 'first_render_ms', 'render_per_import'))
+    print(f"median of {args.runs} cold starts: streamlit import {result['streamlit_import_ms']:.0f} ms, "
+          f"first render {result['first_render_ms']:.0f} ms ({result['render_per_import']:.2f}x the import)")
+
+    if args.sheets_connect:
+        print(f'with Sheets configured and a {args.sheets_connect:g} s connection:')
+        for label, warm_up in (('background warm-up', '1'), ('connect before render', '0')):
+            for think_time in args.think_time:
+                sheets = median_runs(args.runs, ('first_render_ms', 'first_submit_ms'), think_time=think_time,
+                                     env_overrides={'UIS_FAKE_SHEETS': f'connect={args.sheets_connect}',
+                                                    'UIS_SHEETS_WARM_UP': warm_up})
+                print(f"{label:>24}: first render {sheets['first_render_ms']:>5.0f} ms, "
+                      f"submit {think_time:g} s later {sheets['first_submit_ms']:>5.0f} ms")
+
+    if args.save_baseline:
+        with open(BASELINE, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f'baseline saved to {BASELINE}')
+        return 0
+    if not os.path.exists(BASELINE):
+        print('no baseline yet, run with --save-baseline')
+        return 0
+    with open(BASELINE, encoding='utf-8') as f:
+        baseline = json.load(f)
+    limit = baseline['render_per_import'] * (1 + args.tolerance)
+    if result['render_per_import'] > limit:
+        print(f"REGRESSION render_per_import: {result['render_per_import']:.2f} vs baseline "
+              f"{baseline['render_per_import']:.2f}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,128 @@
+"""Benchmark save latency around access token expiry, with and without the background refresher.
+
+Usage: python benchmarks/bench_token_refresh.py [--period 3] [--duration 15] [--interval 0.02]
+    [--call-latency 0.02] [--refresh-latency 0.3]
+
+A real token lives an hour; here it needs refreshing every --period seconds
+so a run covers several "hours". Every save goes through SheetsConnection
+and SheetsLeadStore.save, the form's synchronous path, to a fake worksheet
+that calls credentials.before_request() the way gspread's authorized session
+does, so google-auth's own lazy refresh behaves as in production. A refresh
+takes --refresh-latency seconds. The latency histogram of each mode shows
+the saves that paid for a refresh; the script exits non-zero if any save
+still refreshed the token with the refresher running.
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from google.auth import credentials as google_credentials  # noqa: E402
+from google.auth._helpers import REFRESH_THRESHOLD  # noqa: E402
+
+from fake_sheets import FakeWorksheet, fixed_latency  # noqa: E402
+from lead_store import SheetsLeadStore  # noqa: E402
+from perf import LatencyHistogram  # noqa: E402
+from sheets import SheetsConnection, TokenRefresher  # noqa: E402
+from storage import LEAD_COLUMNS  # noqa: E402
+
+LEAD = {'Timestamp': '2024-01-01 12:00:00', 'Name': 'Jane Doe', 'Email': 'jane@example.com',
+        'Phone': '5551234567', 'State': 'Massachusetts', 'Insurance_Type': 'Medicare',
+        'Notes': '', 'Status': 'New', 'Source': 'Web Form'}
+
+
+class FakeCredentials(google_credentials.Credentials):
+    """Credentials whose token needs refreshing every period seconds, counting refreshes per thread"""
+
+    def __init__(self, period, refresh_latency):
+        super().__init__()
+        self.period = period
+        self.refresh_latency = refresh_latency
+        self.refreshes_by_thread = {}
+
+    def refresh(self, request):
+        name = threading.current_thread().name
+        self.refreshes_by_thread[name] = self.refreshes_by_thread.get(name, 0) + 1
+        time.sleep(self.refresh_latency)
+        self.token = f'token-{time.monotonic()}'
+        # google-auth treats a token as stale REFRESH_THRESHOLD before its expiry
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        self.expiry = now + REFRESH_THRESHOLD + timedelta(seconds=self.period)
+
+
+class AuthorizedWorksheet:
+    """Applies the credentials to every call, as gspread's AuthorizedSession does"""
+
+    def __init__(self, worksheet, credentials):
+        self.worksheet = worksheet
+        self.credentials = credentials
+
+    def __getattr__(self, name):
+        method = getattr(self.worksheet, name)
+
+        def call(*args, **kwargs):
+            self.credentials.before_request(None, 'POST', 'https://sheets.googleapis.com/', {})
+            return method(*args, **kwargs)
+        return call
+
+
+def run(refresher, args):
+    credentials = FakeCredentials(args.period, args.refresh_latency)
+    credentials.refresh(None)
+    worksheet = FakeWorksheet([LEAD_COLUMNS], latency=fixed_latency(args.call_latency))
+    connection = SheetsConnection(lambda: AuthorizedWorksheet(worksheet, credentials))
+    store = SheetsLeadStore(connection)
+    if refresher is not None:
+        refresher.watch(credentials)
+    histogram = LatencyHistogram()
+    deadline = time.monotonic() + args.duration
+    while time.monotonic() < deadline:
+        started = time.perf_counter()
+        store.save(LEAD)
+        histogram.record(time.perf_counter() - started)
+        time.sleep(args.interval)
+    store.close()
+    if refresher is not None:
+        refresher.close()
+    in_request = sum(n for name, n in credentials.refreshes_by_thread.items()
+                     if name != 'sheets-token-refresher')
+    # The refresh made before the run started is not a save's
+    return histogram, in_request - 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--period', type=float, default=3.0, help='seconds between token refreshes')
+    parser.add_argument('--duration', type=float, default=15.0)
+    parser.add_argument('--interval', type=float, default=0.02, help='seconds between saves')
+    parser.add_argument('--call-latency', type=float, default=0.02)
+    parser.add_argument('--refresh-latency', type=float, default=0.3)
+    args = parser.parse_args()
+
+    margin = REFRESH_THRESHOLD.total_seconds() + args.period / 2
+    results = {
+        'lazy refresh': run(None, args),
+        'background refresher': run(TokenRefresher(margin=margin, retry_delay=args.period / 4), args),
+    }
+    labels = [label for label, _ in LatencyHistogram().buckets()]
+    print(f"{'save latency':>14}" + ''.join(f'{name:>22}' for name in results))
+    for i, label in enumerate(labels):
+        counts = [histogram.buckets()[i][1] for histogram, _ in results.values()]
+        if any(counts):
+            print(f'{label:>14}' + ''.join(f'{n:>22,}' for n in counts))
+    for name, (histogram, in_request) in results.items():
+        summary = histogram.summary()
+        print(f"{name}: {summary['count']:,} saves, p50 <= {summary['p50_ms']:g} ms, "
+              f"p99 <= {summary['p99_ms']:g} ms, max {summary['max_ms']:.0f} ms, "
+              f'{in_request} refreshes inside a save')
+    if results['background refresher'][1]:
+        print('FAILED: saves still refreshed the token')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,227 @@
+"""Import partner lead lists through the same rules as the web form.
+
+Files are read in chunks. Each chunk is validated a whole column at a time
+(see validation.validate_frame), accepted leads are written to the store in
+batches and rejected rows go to a report with the reason for each. Usage:
+
+    python bulk_import.py partner_leads.csv [--store csv|sqlite|sheets] [--rejects rejects.csv]
+        [--source-label "Partner Import"] [--start-row 2] [--dry-run]
+
+Recognised columns (case and spacing do not matter): First Name, Last Name
+(or a single Name), Email, Phone, State, Insurance Type, and optionally
+Notes and Timestamp. Row numbers in the report are spreadsheet rows, with
+the header on row 1.
+"""
+import argparse
+import csv
+import os
+import sys
+import time
+from datetime import datetime
+
+import pandas as pd
+
+from lead_stats import LeadStats
+from lead_store import open_store
+from storage import LEAD_COLUMNS
+from validation import validate_frame
+
+CHUNK_ROWS = 50000
+BATCH_ROWS = 500
+REQUIRED_COLUMNS = ['First_Name', 'Last_Name', 'Email', 'Phone', 'State', 'Insurance_Type']
+OPTIONAL_COLUMNS = ['Notes', 'Timestamp']
+COLUMN_ALIASES = {
+    'first_name': 'First_Name', 'firstname': 'First_Name', 'first': 'First_Name',
+    'last_name': 'Last_Name', 'lastname': 'Last_Name', 'last': 'Last_Name', 'surname': 'Last_Name',
+    'name': 'Name', 'full_name': 'Name',
+    'email': 'Email', 'email_address': 'Email', 'e_mail': 'Email',
+    'phone': 'Phone', 'phone_number': 'Phone', 'telephone': 'Phone', 'mobile': 'Phone',
+    'state': 'State',
+    'insurance_type': 'Insurance_Type', 'insurance_interest': 'Insurance_Type', 'insurance': 'Insurance_Type',
+    'product': 'Insurance_Type', 'type': 'Insurance_Type',
+    'notes': 'Notes', 'note': 'Notes', 'comments': 'Notes',
+    'timestamp': 'Timestamp', 'date': 'Timestamp', 'created': 'Timestamp',
+}
+TIMESTAMP_PATTERN = r'^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}$'
+REPORT_COLUMNS = ['Reasons'] + REQUIRED_COLUMNS + OPTIONAL_COLUMNS
+
+
+class ImportStopped(Exception):
+    """A store write failed; summary['next_row'] is where to resume with --start-row"""
+
+    def __init__(self, summary, error):
+        super().__init__(f"{error}; resume with --start-row {summary['next_row']}")
+        self.summary = summary
+
+
+def canonical_column(header):
+    key = str(header or '').strip().lower().replace(' ', '_').replace('-', '_')
+    return COLUMN_ALIASES.get(key)
+
+
+def _cell(value):
+    """Spreadsheet cell as the text a person would have typed"""
+    if value is None:
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        # Phone numbers typed into Excel come back as floats
+        return str(int(value))
+    if isinstance(value, datetime):
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    return str(value)
+
+
+def _xlsx_chunks(path, chunk_rows):
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = [_cell(value) for value in next(rows, [])]
+        width = len(header)
+        chunk = []
+        for row in rows:
+            values = [_cell(value) for value in row[:width]]
+            chunk.append(values + [''] * (width - len(values)))
+            if len(chunk) >= chunk_rows:
+                yield pd.DataFrame(chunk, columns=header, dtype=str)
+                chunk = []
+        if chunk:
+            yield pd.DataFrame(chunk, columns=header, dtype=str)
+    finally:
+        workbook.close()
+
+
+def read_chunks(path, chunk_rows=CHUNK_ROWS):
+    """DataFrames of up to chunk_rows rows with canonical column names, all values strings.
+
+    The index of each frame is the spreadsheet row number of the lead.
+    """
+    if path.lower().endswith(('.xlsx', '.xlsm')):
+        frames = _xlsx_chunks(path, chunk_rows)
+    else:
+        frames = pd.read_csv(path, dtype=str, keep_default_na=False, chunksize=chunk_rows,
+                             encoding='utf-8-sig')
+    next_row = 2
+    for frame in frames:
+        frame = frame.rename(columns=canonical_column)
+        frame = frame.loc[:, [column for column in frame.columns if column]]
+        frame = frame.loc[:, ~frame.columns.duplicated()]
+        frame.index = range(next_row, next_row + len(frame))
+        next_row += len(frame)
+        if 'Name' in frame.columns and 'First_Name' not in frame.columns:
+            parts = frame['Name'].str.strip().str.split(n=1, expand=True).reindex(columns=[0, 1])
+            frame['First_Name'] = parts[0].fillna('')
+            frame['Last_Name'] = parts[1].fillna('')
+        for column in REQUIRED_COLUMNS + OPTIONAL_COLUMNS:
+            if column not in frame.columns:
+                frame[column] = ''
+        yield frame[REQUIRED_COLUMNS + OPTIONAL_COLUMNS].fillna('')
+
+
+def to_leads(frame, accepted, source_label, now):
+    """Lead dicts in LEAD_COLUMNS order for the accepted rows of frame"""
+    timestamp = frame.loc[accepted.index, 'Timestamp'].str.strip()
+    leads = accepted.assign(
+        Timestamp=timestamp.where(timestamp.str.match(TIMESTAMP_PATTERN), now),
+        Notes=frame.loc[accepted.index, 'Notes'],
+        Status='New',
+        Source=source_label,
+    )
+    return leads[LEAD_COLUMNS].to_dict('records')
+
+
+def import_file(path, store, rejects_file=None, source_label='Partner Import', start_row=2,
+                chunk_rows=CHUNK_ROWS, batch_rows=BATCH_ROWS, lead_stats=None, dry_run=False):
+    """Validate and store every lead in path; returns a summary dict.
+
+    If a store write fails, ImportStopped is raised; its summary's next_row
+    is where to resume with start_row, so no lead is written twice.
+    """
+    summary = {'rows': 0, 'accepted': 0, 'rejected': 0, 'validation_seconds': 0.0, 'next_row': start_row}
+    now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    rejects = None
+    try:
+        for frame in read_chunks(path, chunk_rows):
+            frame = frame[frame.index >= start_row]
+            if frame.empty:
+                continue
+            started = time.perf_counter()
+            accepted, rejected = validate_frame(frame)
+            summary['validation_seconds'] += time.perf_counter() - started
+            summary['rows'] += len(frame)
+            summary['rejected'] += len(rejected)
+            if rejects_file and len(rejected):
+                if rejects is None:
+                    rejects = open(rejects_file, 'w', newline='', encoding='utf-8')
+                    rejects_writer = csv.writer(rejects, lineterminator='\n')
+                    rejects_writer.writerow(['Row'] + REPORT_COLUMNS)
+                rejects_writer.writerows([row_number] + values for row_number, values
+                                         in zip(rejected.index, rejected[REPORT_COLUMNS].values.tolist()))
+            leads = to_leads(frame, accepted, source_label, now)
+            rows = list(accepted.index)
+            for i in range(0, len(leads), batch_rows):
+                batch = leads[i:i + batch_rows]
+                if not dry_run:
+                    try:
+                        store.save_many(batch)
+                    except Exception as e:
+                        raise ImportStopped(summary, e) from e
+                    if lead_stats is not None:
+                        for data in batch:
+                            lead_stats.record(data)
+                summary['accepted'] += len(batch)
+                # Every row before the next accepted lead has been handled
+                summary['next_row'] = rows[i + batch_rows] if i + batch_rows < len(rows) else frame.index[-1] + 1
+            if not leads:
+                summary['next_row'] = frame.index[-1] + 1
+    finally:
+        if rejects is not None:
+            rejects.close()
+        if lead_stats is not None:
+            lead_stats.flush()
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Import a partner lead list (CSV or XLSX)')
+    parser.add_argument('path')
+    parser.add_argument('--store', choices=['csv', 'sqlite', 'sheets'], default='csv')
+    parser.add_argument('--csv', default='insurance_leads_backup.csv')
+    parser.add_argument('--sqlite', default='insurance_leads.db')
+    parser.add_argument('--secrets', default=os.path.join('.streamlit', 'secrets.toml'))
+    parser.add_argument('--sheet', default='Insurance Leads')
+    parser.add_argument('--worksheet', default='Sheet1')
+    parser.add_argument('--stats', default='insurance_leads_stats.json',
+                        help='dashboard counters to update, as written by app.py')
+    parser.add_argument('--rejects', help='CSV report of rejected rows and why')
+    parser.add_argument('--source-label', default='Partner Import', help='value for the Source column')
+    parser.add_argument('--start-row', type=int, default=2, help='first spreadsheet row to import')
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS)
+    parser.add_argument('--batch-rows', type=int, default=BATCH_ROWS)
+    parser.add_argument('--dry-run', action='store_true', help='validate and report without storing')
+    args = parser.parse_args()
+
+    store = None if args.dry_run else open_store(args.store, args.csv, args.sqlite, args.secrets,
+                                                 args.sheet, args.worksheet)
+    lead_stats = None if args.dry_run else LeadStats(args.stats)
+    started = time.perf_counter()
+    try:
+        summary = import_file(args.path, store, args.rejects, args.source_label, args.start_row,
+                              args.chunk_rows, args.batch_rows, lead_stats, args.dry_run)
+    except ImportStopped as e:
+        print(f"import stopped after {e.summary['accepted']:,} leads: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        if store is not None:
+            store.close()
+    elapsed = time.perf_counter() - started
+    rate = summary['rows'] / summary['validation_seconds'] if summary['validation_seconds'] else 0
+    print(f"{summary['rows']:,} rows: {summary['accepted']:,} accepted, {summary['rejected']:,} rejected "
+          f"in {elapsed:.1f} s (validation {rate:,.0f} rows/s)")
+    if summary['rejected'] and args.rejects:
+        print(f'rejected rows written to {args.rejects}')
+
+
+if __name__ == '__main__':
+    main()
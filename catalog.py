@@ -0,0 +1,20 @@
+"""Insurance products and states offered on the lead form"""
+
+# Insurance expertise areas
+INSURANCE_TYPES = {
+    "Medicare": {"icon": "🏥", "description": "Medicare Advantage, Supplement & Prescription Plans"},
+    "Health Insurance": {"icon": "💊", "description": "Federal & State Marketplace Plans"},
+    "Life Insurance": {"icon": "🛡️", "description": "Term, Permanent & Hybrid Long-Term Care"},
+    "Annuities": {"icon": "💰", "description": "Income Strategies with Living Benefits"},
+    "Home, Auto & Business": {"icon": "🏠", "description": "Complete Property & Casualty Coverage"},
+    "Long-Term Care": {"icon": "🤝", "description": "Traditional & Hybrid LTC Solutions"},
+    "Travel Medical": {"icon": "✈️", "description": "International Coverage & Pre-existing Conditions"},
+    "Disability": {"icon": "⚕️", "description": "Industry-Specific Income Protection"}
+}
+
+# States where licensed
+LICENSED_STATES = [
+    "Massachusetts", "New Hampshire", "Connecticut", "Rhode Island",
+    "Maine", "Vermont", "New York", "New Jersey", "Pennsylvania",
+    "Florida", "California", "Texas", "Illinois", "Ohio"
+]
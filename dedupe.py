@@ -0,0 +1,155 @@
+"""Duplicate lead detection by normalized email and phone"""
+import hashlib
+import math
+import os
+import threading
+
+from validation import normalize_email, normalize_phone
+
+EMAIL = 'Email'
+PHONE = 'Phone'
+# Columns warm_up() needs from a store's leads()
+LEAD_KEY_COLUMNS = (EMAIL, PHONE)
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter; membership may give false positives, never false negatives"""
+
+    def __init__(self, capacity, error_rate=0.01):
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, key):
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key):
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+class LeadIndex:
+    """Normalized emails and phones of known leads, kept in memory and persisted locally.
+
+    Lookups are set membership, optionally fronted by a Bloom filter so most
+    new leads are ruled out without touching the sets. The index file starts
+    with a marker line written only by a complete build, followed by one line
+    per key, 'e<TAB>email' or 'p<TAB>phone'; new keys are appended to it once
+    such a build has been saved.
+    """
+
+    COMPLETE = '#\tcomplete\n'
+
+    def __init__(self, path, bloom_capacity=None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._keys = {EMAIL: set(), PHONE: set()}
+        self._bloom = BloomFilter(bloom_capacity) if bloom_capacity else None
+        self._file = None
+        # Whether the index file holds a complete build; until then new keys are kept in _unsaved
+        self._persisted = False
+        self._unsaved = []
+
+    def _key(self, field, value):
+        if field == EMAIL:
+            return normalize_email(value)
+        return normalize_phone(value)
+
+    def _add_key(self, field, key):
+        if not key or key in self._keys[field]:
+            return False
+        self._keys[field].add(key)
+        if self._bloom is not None:
+            self._bloom.add(f'{field}:{key}')
+        return True
+
+    def load(self):
+        """Read the persisted index; returns False if there is none or its build never finished"""
+        if not os.path.exists(self.path):
+            return False
+        with self._lock, open(self.path, encoding='utf-8') as f:
+            if f.readline() != self.COMPLETE:
+                return False
+            for line in f:
+                prefix, _, key = line.rstrip('\n').partition('\t')
+                self._add_key(EMAIL if prefix == 'e' else PHONE, key)
+            self._persisted = True
+        return True
+
+    def warm_up(self, leads=(), persist=True):
+        """Build the index in one streaming pass over leads, e.g. a store's leads(LEAD_KEY_COLUMNS).
+
+        The keys are collected without holding the lock, so matches() keeps
+        answering from what is already loaded, and merged in at the end. With
+        persist the index file is rewritten from the result and marked
+        complete.
+        """
+        keys = {EMAIL: set(), PHONE: set()}
+        for data in leads:
+            keys[EMAIL].add(self._key(EMAIL, data.get(EMAIL) or ''))
+            keys[PHONE].add(self._key(PHONE, data.get(PHONE) or ''))
+        with self._lock:
+            for field in (EMAIL, PHONE):
+                for key in keys[field]:
+                    self._add_key(field, key)
+            if not persist:
+                return
+            emails, phones = list(self._keys[EMAIL]), list(self._keys[PHONE])
+            self._unsaved = []
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.COMPLETE)
+            f.writelines(f'e\t{key}\n' for key in emails)
+            f.writelines(f'p\t{key}\n' for key in phones)
+            # Keys added while the file was written
+            with self._lock:
+                f.writelines(self._unsaved)
+                f.close()
+                if self._file is not None:
+                    self._file.close()
+                    self._file = None
+                os.replace(tmp_path, self.path)
+                self._persisted = True
+                self._unsaved = []
+
+    def _contains(self, field, key):
+        if not key:
+            return False
+        if self._bloom is not None and f'{field}:{key}' not in self._bloom:
+            return False
+        return key in self._keys[field]
+
+    def matches(self, data):
+        """Return the fields ('Email', 'Phone') of data that match a known lead"""
+        with self._lock:
+            return [field for field in (EMAIL, PHONE)
+                    if self._contains(field, self._key(field, data.get(field, '')))]
+
+    def add(self, data):
+        """Remember a lead's email and phone, appending new keys to the index file once it is complete"""
+        with self._lock:
+            lines = []
+            for field, prefix in ((EMAIL, 'e'), (PHONE, 'p')):
+                key = self._key(field, data.get(field, ''))
+                if self._add_key(field, key):
+                    lines.append(f'{prefix}\t{key}\n')
+            if not lines:
+                return
+            if not self._persisted:
+                self._unsaved.extend(lines)
+                return
+            if self._file is None:
+                self._file = open(self.path, 'a', encoding='utf-8')
+            self._file.write(''.join(lines))
+            self._file.flush()
+
+    def size(self):
+        """Number of distinct keys indexed"""
+        with self._lock:
+            return len(self._keys[EMAIL]) + len(self._keys[PHONE])
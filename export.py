@@ -0,0 +1,172 @@
+"""Streaming export of leads as CSV, XLSX or Parquet.
+
+Each stream_* function takes an iterable of lead dicts and yields the file
+as bytes, working through the leads in fixed-size chunks so memory stays
+bounded however many leads are exported. CSV and Parquet bytes are yielded
+as each chunk (or Parquet row group) is encoded, so a download can start
+straight away. An XLSX file is a zip that is only complete once every row is
+written, so it is built with openpyxl's write-only mode in a temporary file
+and streamed from there. Usage:
+
+    python export.py --format xlsx --out leads.xlsx [--source csv|sqlite|sheets]
+        [--start 2024-01-01] [--end 2024-12-31] [--state Ohio] [--type Medicare]
+"""
+import argparse
+import csv
+import io
+import itertools
+import os
+import tempfile
+
+from lead_store import open_store
+from storage import LEAD_COLUMNS
+
+CHUNK_ROWS = 5000
+PARQUET_ROW_GROUP_ROWS = 20000
+FILE_CHUNK_BYTES = 1024 * 1024
+
+
+def filter_leads(leads, start=None, end=None, states=None, types=None):
+    """Leads whose date is within the inclusive 'YYYY-MM-DD' bounds and whose state and type are listed"""
+    states = set(states) if states else None
+    types = set(types) if types else None
+    for data in leads:
+        day = (data.get('Timestamp') or '')[:10]
+        if start and day < start:
+            continue
+        if end and day > end:
+            continue
+        if states is not None and data.get('State') not in states:
+            continue
+        if types is not None and data.get('Insurance_Type') not in types:
+            continue
+        yield data
+
+
+def chunked(leads, size):
+    """Lists of up to size lead rows in LEAD_COLUMNS order"""
+    rows = ([data.get(column, '') for column in LEAD_COLUMNS] for data in leads)
+    while True:
+        chunk = list(itertools.islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def stream_csv(leads, chunk_rows=CHUNK_ROWS):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    writer.writerow(LEAD_COLUMNS)
+    for chunk in chunked(leads, chunk_rows):
+        writer.writerows(chunk)
+        yield buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+    # Header only when nothing matched
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+
+def stream_xlsx(leads, chunk_rows=CHUNK_ROWS):
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet('Leads')
+    sheet.append(LEAD_COLUMNS)
+    for chunk in chunked(leads, chunk_rows):
+        for row in chunk:
+            sheet.append(row)
+    with tempfile.TemporaryFile() as f:
+        workbook.save(f)
+        f.seek(0)
+        while True:
+            data = f.read(FILE_CHUNK_BYTES)
+            if not data:
+                return
+            yield data
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands everything written so far to the caller via take()"""
+
+    def __init__(self):
+        self._parts = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._parts.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def take(self):
+        data = b''.join(self._parts)
+        self._parts = []
+        return data
+
+
+def stream_parquet(leads, row_group_rows=PARQUET_ROW_GROUP_ROWS):
+    import pyarrow.parquet as pq
+
+    from archive import SCHEMA, lead_table
+
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, SCHEMA, compression='zstd')
+    for chunk in chunked(leads, row_group_rows):
+        # One row group per chunk, yielded as soon as it is encoded
+        writer.write_table(lead_table(chunk), row_group_size=row_group_rows)
+        yield sink.take()
+    writer.close()
+    yield sink.take()
+
+
+FORMATS = {
+    'csv': (stream_csv, 'text/csv', 'csv'),
+    'xlsx': (stream_xlsx, 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', 'xlsx'),
+    'parquet': (stream_parquet, 'application/vnd.apache.parquet', 'parquet'),
+}
+
+
+def export_to_file(leads, file_format, f):
+    """Stream an export into an open binary file; returns the number of bytes written"""
+    stream = FORMATS[file_format][0]
+    written = 0
+    for data in stream(leads):
+        f.write(data)
+        written += len(data)
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Export leads as CSV, XLSX or Parquet')
+    parser.add_argument('--format', choices=sorted(FORMATS), default='csv')
+    parser.add_argument('--out', required=True)
+    parser.add_argument('--source', choices=['csv', 'sqlite', 'sheets'], default='csv')
+    parser.add_argument('--csv', default='insurance_leads_backup.csv')
+    parser.add_argument('--sqlite', default='insurance_leads.db')
+    parser.add_argument('--secrets', default=os.path.join('.streamlit', 'secrets.toml'))
+    parser.add_argument('--sheet', default='Insurance Leads')
+    parser.add_argument('--worksheet', default='Sheet1')
+    parser.add_argument('--start', help='first day, YYYY-MM-DD')
+    parser.add_argument('--end', help='last day, YYYY-MM-DD')
+    parser.add_argument('--state', action='append', help='repeat for several states')
+    parser.add_argument('--type', action='append', help='repeat for several insurance types')
+    args = parser.parse_args()
+
+    store = open_store(args.source, args.csv, args.sqlite, args.secrets, args.sheet, args.worksheet)
+    try:
+        leads = filter_leads(store.leads(), args.start, args.end, args.state, args.type)
+        with open(args.out, 'wb') as f:
+            written = export_to_file(leads, args.format, f)
+    finally:
+        store.close()
+    print(f'wrote {written:,} bytes to {args.out}')
+
+
+if __name__ == '__main__':
+    main()
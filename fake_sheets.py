@@ -0,0 +1,217 @@
+"""In-process stand-in for the parts of a gspread Worksheet the app uses"""
+import copy
+import math
+import os
+import random
+import threading
+import time
+from collections import deque
+
+READ = 'read'
+WRITE = 'write'
+
+
+class FakeAPIError(Exception):
+    """Raised in place of gspread's APIError when gspread is not installed"""
+
+    def __init__(self, code, message):
+        super().__init__(f'{code}: {message}')
+        self.code = code
+
+
+def api_error(code, message):
+    """Build the error a real worksheet call would raise for an HTTP error code"""
+    try:
+        import requests
+        from gspread.exceptions import APIError
+    except ImportError:
+        return FakeAPIError(code, message)
+    response = requests.Response()
+    response.status_code = code
+    response._content = (
+        '{"error": {"code": %d, "message": "%s", "status": "FAKE"}}' % (code, message)
+    ).encode()
+    return APIError(response)
+
+
+def fixed_latency(seconds):
+    return lambda rng: seconds
+
+
+def uniform_latency(low, high):
+    return lambda rng: rng.uniform(low, high)
+
+
+def lognormal_latency(median, sigma=0.5):
+    """Long-tailed latency, which is closer to real API round trips than a uniform spread"""
+    mu = math.log(median)
+    return lambda rng: rng.lognormvariate(mu, sigma)
+
+
+class FakeWorksheet:
+    """Worksheet backed by a list of rows, for benchmarks and local runs without network.
+
+    Remote conditions can be injected: latency(rng) returns the seconds each
+    call sleeps, failure_rate is the chance a call fails with a 503, and
+    read_quota/write_quota cap calls per rolling minute the way the Sheets API
+    does, failing excess calls with a 429. Set down=True to simulate an outage.
+    connect_delay is the seconds shared_worksheet() takes to hand the sheet
+    out, standing in for service-account auth and the spreadsheet lookup.
+    """
+
+    def __init__(self, rows=None, title='Sheet1', latency=None, failure_rate=0.0,
+                 read_quota=None, write_quota=None, seed=None, connect_delay=0.0):
+        self.title = title
+        self.latency = latency
+        self.connect_delay = connect_delay
+        self.failure_rate = failure_rate
+        self.quotas = {READ: read_quota, WRITE: write_quota}
+        self.down = False
+        self._rng = random.Random(seed)
+        self._rows = [list(row) for row in rows or []]
+        self._lock = threading.Lock()
+        self._recent = {READ: deque(), WRITE: deque()}
+        self.calls = {}
+        self.errors = {}
+
+    def _count(self, method):
+        self.calls[method] = self.calls.get(method, 0) + 1
+
+    def _remote(self, method, kind):
+        """Apply injected latency, outages, random failures and quota to one call"""
+        with self._lock:
+            self._count(method)
+            delay = self.latency(self._rng) if self.latency else 0.0
+            error = None
+            if self.down:
+                error = api_error(503, 'The service is currently unavailable.')
+            elif self.failure_rate and self._rng.random() < self.failure_rate:
+                error = api_error(503, 'Injected random failure.')
+            else:
+                error = self._check_quota(kind)
+            if error is not None:
+                self.errors[method] = self.errors.get(method, 0) + 1
+        if delay:
+            time.sleep(delay)
+        if error is not None:
+            raise error
+
+    def _check_quota(self, kind):
+        quota = self.quotas[kind]
+        if quota is None:
+            return None
+        now = time.monotonic()
+        recent = self._recent[kind]
+        while recent and now - recent[0] >= 60:
+            recent.popleft()
+        if len(recent) >= quota:
+            return api_error(429, f"Quota exceeded for quota metric '{kind.title()} requests'.")
+        recent.append(now)
+        return None
+
+    def get_all_values(self):
+        self._remote('get_all_values', READ)
+        with self._lock:
+            # A real call downloads every cell, so hand back a full copy
+            return copy.deepcopy(self._rows)
+
+    def row_values(self, row):
+        self._remote('row_values', READ)
+        with self._lock:
+            if row > len(self._rows):
+                return []
+            return list(self._rows[row - 1])
+
+    def col_values(self, col):
+        self._remote('col_values', READ)
+        with self._lock:
+            return [row[col - 1] if len(row) >= col else '' for row in self._rows]
+
+    def get(self, range_name, **kwargs):
+        """Values of an A1 range such as 'A2:I5001', trimmed of trailing empty rows and cells like the API"""
+        self._remote('get', READ)
+        (first_col, first_row), (last_col, last_row) = (_a1_cell(cell) for cell in range_name.split(':'))
+        with self._lock:
+            rows = [row[first_col - 1:last_col] for row in self._rows[first_row - 1:last_row]]
+        rows = [row[:max((i + 1 for i, value in enumerate(row) if value != ''), default=0)] for row in rows]
+        while rows and not rows[-1]:
+            rows.pop()
+        return rows
+
+    def append_row(self, values, **kwargs):
+        self._remote('append_row', WRITE)
+        with self._lock:
+            self._rows.append([str(v) for v in values])
+
+    def append_rows(self, values, **kwargs):
+        self._remote('append_rows', WRITE)
+        with self._lock:
+            self._rows.extend([str(v) for v in row] for row in values)
+
+    def insert_row(self, values, index=1, **kwargs):
+        self._remote('insert_row', WRITE)
+        with self._lock:
+            self._rows.insert(index - 1, [str(v) for v in values])
+
+    def update(self, range_name=None, values=None, **kwargs):
+        """Support the single-cell anchored writes the app makes, e.g. range_name='A1'"""
+        self._remote('update', WRITE)
+        with self._lock:
+            start_row = int(''.join(ch for ch in range_name if ch.isdigit()) or 1)
+            for offset, values_row in enumerate(values):
+                index = start_row - 1 + offset
+                while len(self._rows) <= index:
+                    self._rows.append([])
+                self._rows[index][:len(values_row)] = [str(v) for v in values_row]
+
+    def row_count(self):
+        """Rows currently stored; not an API call, so no latency or quota applies"""
+        with self._lock:
+            return len(self._rows)
+
+
+def _a1_cell(cell):
+    """(column, row) numbers of an A1 cell reference such as 'AB12'"""
+    letters = cell.rstrip('0123456789')
+    col = 0
+    for letter in letters.upper():
+        col = col * 26 + ord(letter) - ord('A') + 1
+    return col, int(cell[len(letters):])
+
+
+def from_env(value):
+    """Build a FakeWorksheet from a UIS_FAKE_SHEETS value.
+
+    '1' gives a healthy worksheet. Conditions can be given as comma separated
+    key=value pairs, e.g. 'latency=0.8,sigma=0.6,failure_rate=0.05,write_quota=60'
+    where latency is the median seconds per call and connect the seconds each
+    connection takes to open.
+    """
+    options = dict(item.split('=', 1) for item in value.split(',') if '=' in item)
+    latency = None
+    if 'latency' in options:
+        latency = lognormal_latency(float(options['latency']), float(options.get('sigma', 0.5)))
+    return FakeWorksheet(
+        latency=latency,
+        failure_rate=float(options.get('failure_rate', 0.0)),
+        read_quota=int(options['read_quota']) if 'read_quota' in options else None,
+        write_quota=int(options['write_quota']) if 'write_quota' in options else None,
+        seed=int(options['seed']) if 'seed' in options else None,
+        connect_delay=float(options.get('connect', 0.0)),
+    )
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def shared_worksheet():
+    """Process-wide fake worksheet, so a benchmark can inspect what the app wrote"""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = from_env(os.environ.get('UIS_FAKE_SHEETS', '1'))
+        worksheet = _shared
+    if worksheet.connect_delay:
+        time.sleep(worksheet.connect_delay)
+    return worksheet
@@ -0,0 +1,64 @@
+"""Pooled keep-alive HTTP sessions for the Google Sheets client.
+
+Imported only once Sheets is configured, alongside gspread.
+"""
+import socket
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+
+POOL_SIZE = 4
+# One pool per host: the Sheets API, the Drive API behind client.open() and the token endpoint
+POOL_HOSTS = 3
+CONNECT_TIMEOUT = 5.0
+READ_TIMEOUT = 30.0
+# Probe idle connections so NATs and load balancers do not drop them between leads
+KEEPALIVE_IDLE = 60
+KEEPALIVE_INTERVAL = 15
+KEEPALIVE_PROBES = 4
+
+
+def keepalive_socket_options(idle=KEEPALIVE_IDLE, interval=KEEPALIVE_INTERVAL, probes=KEEPALIVE_PROBES):
+    """urllib3's default socket options plus TCP keep-alive, tuned where the platform allows"""
+    options = list(HTTPConnection.default_socket_options)
+    options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+    for name, value in (('TCP_KEEPIDLE', idle), ('TCP_KEEPINTVL', interval), ('TCP_KEEPCNT', probes)):
+        if hasattr(socket, name):
+            options.append((socket.IPPROTO_TCP, getattr(socket, name), value))
+    return options
+
+
+class KeepAliveAdapter(HTTPAdapter):
+    """HTTPAdapter with an explicitly sized pool whose sockets use TCP keep-alive.
+
+    Retries are left to the circuit breaker, so max_retries is 0.
+    """
+
+    def __init__(self, pool_size=POOL_SIZE, socket_options=None):
+        self.socket_options = socket_options or keepalive_socket_options()
+        super().__init__(pool_connections=POOL_HOSTS, pool_maxsize=pool_size, max_retries=0)
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs['socket_options'] = self.socket_options
+        super().init_poolmanager(*args, **kwargs)
+
+
+def pool_session(session, pool_size=POOL_SIZE):
+    """Mount a keep-alive pool on a requests session for HTTPS and ask for gzip responses"""
+    session.mount('https://', KeepAliveAdapter(pool_size))
+    # Google APIs only compress responses for clients whose user agent mentions gzip;
+    # requests already sends Accept-Encoding: gzip and decodes the body
+    user_agent = session.headers.get('User-Agent', '')
+    if 'gzip' not in user_agent:
+        session.headers['User-Agent'] = f'{user_agent} (gzip)'.strip()
+    return session
+
+
+def pooled_client(credentials, pool_size=POOL_SIZE, connect_timeout=CONNECT_TIMEOUT, read_timeout=READ_TIMEOUT):
+    """gspread client whose session keeps pool_size connections alive, with connect/read timeouts"""
+    import gspread
+
+    client = gspread.authorize(credentials)
+    pool_session(client.http_client.session, pool_size)
+    client.set_timeout((connect_timeout, read_timeout))
+    return client
@@ -0,0 +1,73 @@
+"""Periodic snapshot of the app's in-process metrics for admin.py, which runs as a separate process"""
+import json
+import os
+import threading
+import time
+
+
+def load_health(path):
+    """Return the last snapshot written, or None if there is none yet"""
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+class HealthReporter:
+    """Writes the stats() of registered components to a JSON file.
+
+    A background thread rewrites the file every interval seconds, e.g. with
+    the circuit breaker state, quota levels, batching and token refresh
+    metrics of one server process. Each write replaces the whole file, so
+    with several server processes it shows the one that wrote last.
+    """
+
+    def __init__(self, path, interval=15.0):
+        # The final write runs at exit, after the working directory may have changed
+        self.path = os.path.abspath(path)
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._sources = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='health-reporter', daemon=True)
+
+    def add(self, name, stats):
+        """Report stats(), a callable returning a JSON-serializable dict, under name"""
+        with self._lock:
+            self._sources[name] = stats
+        return self
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def write(self):
+        with self._lock:
+            sources = dict(self._sources)
+        snapshot = {'updated': time.time(), 'pid': os.getpid()}
+        for name, stats in sources.items():
+            try:
+                snapshot[name] = stats()
+            except Exception as e:
+                snapshot[name] = {'error': repr(e)}
+        tmp_path = f'{self.path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f, sort_keys=True, default=str)
+        # Readers get the old or the new snapshot, never a partial one
+        os.replace(tmp_path, self.path)
+
+    def _run(self):
+        while True:
+            try:
+                self.write()
+            except Exception:
+                pass
+            if self._stop.wait(self.interval):
+                return
+
+    def close(self):
+        self._stop.set()
+        try:
+            self.write()
+        except Exception:
+            pass
@@ -0,0 +1,269 @@
+"""Write-ahead journal so a lead is durable locally before any remote write"""
+import json
+import os
+import threading
+import uuid
+from concurrent.futures import Future
+
+from storage import try_lock_file, unlock_file
+
+LEAD = 'lead'
+ACK = 'ack'
+
+
+def slot_path(path, slot):
+    """Journal file for one writer slot: slot 0 is path itself, then name.1.jsonl, ..."""
+    if slot == 0:
+        return path
+    root, ext = os.path.splitext(path)
+    return f'{root}.{slot}{ext}'
+
+
+def read_pending(path):
+    """Return the un-acknowledged leads in a journal file as an ordered id -> data dict"""
+    pending = {}
+    if not os.path.exists(path):
+        return pending
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # Torn write from a crash mid-append, nothing after it can be trusted
+                break
+            if record.get('op') == LEAD:
+                pending[record['id']] = record['data']
+            elif record.get('op') == ACK:
+                pending.pop(record['id'], None)
+    return pending
+
+
+class LeadJournal:
+    """Append-only JSONL journal of submitted leads.
+
+    Every lead is written as a ``lead`` record and fsynced before append()
+    returns. Once the lead has reached its destination it is acknowledged with
+    an ``ack`` record. Records without an ack are replayed after a restart.
+    Concurrent appends share fsync calls: while one thread is syncing, the
+    others queue up and are covered by the next single fsync.
+
+    Each journal file has a single writer. Every process locks the first free
+    slot file next to path, so server processes sharing a directory never
+    append to or compact each other's journal. Slots left behind by processes
+    that have exited are adopted: their pending leads move into this journal.
+    """
+
+    def __init__(self, path, compact_bytes=1024 * 1024, max_slots=16):
+        self.base_path = path
+        self.compact_bytes = compact_bytes
+        self.max_slots = max_slots
+        self._slot_lock = self._claim_slot()
+        self._cond = threading.Condition(threading.Lock())
+        self._pending = {}
+        self._claimed = set()
+        self._written = 0
+        self._synced = 0
+        self._syncing = False
+        self._recover()
+        self._file = open(self.path, 'a', encoding='utf-8')
+        self.adopt_orphans()
+
+    def _claim_slot(self):
+        """Lock the first journal slot no other live process holds and make it self.path"""
+        for slot in range(self.max_slots):
+            candidate = slot_path(self.base_path, slot)
+            lock = open(candidate + '.lock', 'a')
+            if try_lock_file(lock):
+                self.path = candidate
+                return lock
+            lock.close()
+        raise RuntimeError(f'All {self.max_slots} journal slots for {self.base_path} are in use')
+
+    def adopt_orphans(self):
+        """Move pending leads out of unlocked slots whose writer process has gone"""
+        for slot in range(self.max_slots):
+            candidate = slot_path(self.base_path, slot)
+            if candidate == self.path or not os.path.exists(candidate):
+                continue
+            with open(candidate + '.lock', 'a') as lock:
+                if not try_lock_file(lock):
+                    continue
+                try:
+                    seq = 0
+                    with self._cond:
+                        for record_id, data in read_pending(candidate).items():
+                            if record_id not in self._pending:
+                                seq = self._write({'op': LEAD, 'id': record_id, 'data': data})
+                                self._pending[record_id] = data
+                    self._sync_to(seq)
+                    os.remove(candidate)
+                finally:
+                    unlock_file(lock)
+
+    def _recover(self):
+        """Load un-acknowledged leads and rewrite the journal with only those records"""
+        if not os.path.exists(self.path):
+            return
+        self._pending.update(read_pending(self.path))
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for record_id, data in self._pending.items():
+                f.write(json.dumps({'op': LEAD, 'id': record_id, 'data': data}) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def _write(self, record):
+        self._file.write(json.dumps(record) + '\n')
+        self._file.flush()
+        self._written += 1
+        return self._written
+
+    def append(self, data):
+        """Durably record a lead and return its journal id"""
+        record_id = uuid.uuid4().hex
+        with self._cond:
+            seq = self._write({'op': LEAD, 'id': record_id, 'data': data})
+            self._pending[record_id] = data
+        self._sync_to(seq)
+        return record_id
+
+    def _sync_to(self, seq):
+        """Block until record seq is on disk, fsyncing for every writer waiting alongside"""
+        with self._cond:
+            while self._synced < seq:
+                if self._syncing:
+                    self._cond.wait()
+                    continue
+                self._syncing = True
+                target = self._written
+                fd = self._file.fileno()
+                self._cond.release()
+                try:
+                    os.fsync(fd)
+                except BaseException:
+                    self._cond.acquire()
+                    self._syncing = False
+                    self._cond.notify_all()
+                    raise
+                self._cond.acquire()
+                self._syncing = False
+                self._synced = max(self._synced, target)
+                self._cond.notify_all()
+
+    def ack(self, record_id):
+        """Mark a lead as delivered.
+
+        Acks are not fsynced; losing one in a crash only means the lead is
+        delivered again on replay.
+        """
+        with self._cond:
+            self._claimed.discard(record_id)
+            if self._pending.pop(record_id, None) is None:
+                return
+            self._write({'op': ACK, 'id': record_id})
+            if not self._pending and self._file.tell() > self.compact_bytes:
+                self._file.truncate(0)
+
+    def claim(self, record_id):
+        """Reserve a pending lead for one deliverer; False if it is already claimed or acked"""
+        with self._cond:
+            if record_id not in self._pending or record_id in self._claimed:
+                return False
+            self._claimed.add(record_id)
+            return True
+
+    def claim_pending(self):
+        """Claim every unclaimed lead and return them as (id, data) pairs in submission order"""
+        with self._cond:
+            claimed = [(record_id, data) for record_id, data in self._pending.items()
+                       if record_id not in self._claimed]
+            self._claimed.update(record_id for record_id, _ in claimed)
+            return claimed
+
+    def release(self, record_id):
+        """Give up a claim after a failed delivery so the lead is retried later"""
+        with self._cond:
+            self._claimed.discard(record_id)
+
+    def pending(self):
+        """Return un-acknowledged leads as (id, data) pairs in submission order"""
+        with self._cond:
+            return list(self._pending.items())
+
+    def close(self):
+        with self._cond:
+            self._file.close()
+            unlock_file(self._slot_lock)
+            self._slot_lock.close()
+
+
+def call_now(fn, *args):
+    """Run a synchronous delivery function and wrap its outcome in a finished Future"""
+    future = Future()
+    try:
+        future.set_result(fn(*args))
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
+
+def replay_pending(journal, submit):
+    """Submit unclaimed pending leads and acknowledge each one that succeeds.
+
+    submit(data) returns a concurrent.futures.Future, which lets a batching
+    writer deliver many pending leads in one remote call. Leads whose delivery
+    failed are released and stay in the journal for the next replay. Returns
+    the number of leads delivered.
+    """
+    submitted = []
+    for record_id, data in journal.claim_pending():
+        try:
+            submitted.append((record_id, submit(data)))
+        except Exception:
+            journal.release(record_id)
+    delivered = 0
+    for record_id, future in submitted:
+        try:
+            future.result()
+        except Exception:
+            journal.release(record_id)
+            continue
+        journal.ack(record_id)
+        delivered += 1
+    return delivered
+
+
+class JournalReplayer:
+    """Background thread that drains the journal through submit().
+
+    It runs once at start, whenever notify() is called, and every
+    retry_interval seconds so leads stuck behind an outage are retried. Each
+    pass first adopts journals left by server processes that have exited.
+    """
+
+    def __init__(self, journal, submit, retry_interval=30.0):
+        self.journal = journal
+        self.submit = submit
+        self.retry_interval = retry_interval
+        self._wake = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='lead-journal-replayer', daemon=True)
+
+    def start(self):
+        self._wake.set()
+        self._thread.start()
+        return self
+
+    def notify(self):
+        self._wake.set()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.retry_interval)
+            self._wake.clear()
+            try:
+                self.journal.adopt_orphans()
+            except OSError:
+                # An unreadable orphan must not stop delivery of this process's own leads
+                pass
+            replay_pending(self.journal, self.submit)
@@ -0,0 +1,163 @@
+"""Lead counters maintained at write time for the admin dashboard"""
+import json
+import os
+import threading
+
+from storage import locked_file
+
+DAY = 'day'
+STATE = 'state'
+TYPE = 'type'
+# Email and Phone tell a stored lead apart from a pending one during a rebuild
+STATS_COLUMNS = ('Timestamp', 'Email', 'Phone', 'State', 'Insurance_Type')
+
+
+def empty_counts():
+    return {'total': 0, DAY: {}, STATE: {}, TYPE: {}}
+
+
+def _add(counts, data, n=1):
+    counts['total'] += n
+    for bucket, key in ((DAY, (data.get('Timestamp') or '')[:10]),
+                        (STATE, data.get('State') or ''),
+                        (TYPE, data.get('Insurance_Type') or '')):
+        counts[bucket][key] = counts[bucket].get(key, 0) + n
+
+
+def _merge(counts, delta):
+    counts['total'] += delta['total']
+    for bucket in (DAY, STATE, TYPE):
+        for key, n in delta[bucket].items():
+            counts[bucket][key] = counts[bucket].get(key, 0) + n
+
+
+def load_snapshot(path):
+    """Return the persisted counts, or empty counts if there is no snapshot yet"""
+    if not os.path.exists(path):
+        return empty_counts()
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def lead_key(data):
+    """What identifies one lead across the store and the journal"""
+    return data.get('Timestamp') or '', data.get('Email') or '', data.get('Phone') or ''
+
+
+def count_leads(leads):
+    """Counts for an iterable of lead dicts, e.g. a store's leads(STATS_COLUMNS)"""
+    counts = empty_counts()
+    for data in leads:
+        _add(counts, data)
+    return counts
+
+
+class LeadStats:
+    """Leads per day, per state and per insurance type.
+
+    record() only touches in-memory counters. flush() merges what was
+    recorded since the last flush into a JSON snapshot under a file lock, so
+    several server processes can share one snapshot; a background thread
+    flushes every flush_interval seconds. Reading the snapshot costs the
+    number of buckets, not the number of leads.
+
+    Only rebuild() creates the snapshot. Until one exists, flush() drops what
+    was recorded: those leads are in the store or the journal, where the
+    rebuild that creates the snapshot counts them.
+    """
+
+    def __init__(self, path, flush_interval=5.0):
+        self.path = path
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._delta = empty_counts()
+        # lead_key -> data of leads recorded while a rebuild reads the store, None otherwise
+        self._recorded = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='lead-stats-flusher', daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def record(self, data):
+        with self._lock:
+            if self._recorded is not None:
+                self._recorded[lead_key(data)] = data
+            else:
+                _add(self._delta, data)
+
+    def _write(self, counts):
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(counts, f, sort_keys=True)
+        # Readers never take the lock; os.replace gives them the old or the new snapshot
+        os.replace(tmp_path, self.path)
+
+    def flush(self):
+        """Merge counts recorded since the last flush into the snapshot"""
+        with self._lock:
+            delta, self._delta = self._delta, empty_counts()
+        if not delta['total'] or not self.exists():
+            return
+        try:
+            with open(self.path + '.lock', 'a') as lock, locked_file(lock):
+                counts = load_snapshot(self.path)
+                _merge(counts, delta)
+                self._write(counts)
+        except Exception:
+            # Keep the counts for the next attempt
+            with self._lock:
+                _merge(self._delta, delta)
+            raise
+
+    def rebuild(self, leads, pending=()):
+        """Replace the snapshot with counts recomputed from every lead in leads.
+
+        pending holds the lead dicts still in the journal when the rebuild
+        starts, and leads recorded during it are collected too. Each of those
+        is counted once: from leads if the store already has it, otherwise
+        on its own. Nothing recorded before or during the rebuild is left
+        for the next flush.
+        """
+        with self._lock:
+            self._delta = empty_counts()
+            self._recorded = {}
+        try:
+            candidates = {lead_key(data): data for data in pending}
+            counts = empty_counts()
+            stored = set()
+            for data in leads:
+                _add(counts, data)
+                key = lead_key(data)
+                if key in candidates or key in self._recorded:
+                    stored.add(key)
+        except BaseException:
+            with self._lock:
+                recorded, self._recorded = self._recorded, None
+                for data in recorded.values():
+                    _add(self._delta, data)
+            raise
+        with self._lock:
+            recorded, self._recorded = self._recorded, None
+        candidates.update(recorded)
+        for key, data in candidates.items():
+            if key not in stored:
+                _add(counts, data)
+        with open(self.path + '.lock', 'a') as lock, locked_file(lock):
+            self._write(counts)
+        return counts
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception:
+                pass
+
+    def close(self):
+        self._stop.set()
+        self.flush()
@@ -0,0 +1,199 @@
+"""Destinations a submitted lead can be stored in.
+
+Every store offers the same small interface:
+
+- ``submit(data)`` queues a lead and returns a concurrent.futures.Future that
+  resolves once it is stored. Stores that benefit from batching group leads
+  from every session into one write.
+- ``save(data)`` stores one lead synchronously and raises on failure.
+- ``save_many(leads)`` stores a batch of leads synchronously, for imports.
+- ``leads(columns)`` iterates over every stored lead as a dict holding at
+  least the given LEAD_COLUMNS, for rebuilding derived data such as stats.
+- ``close(timeout)`` flushes queued leads and releases resources.
+"""
+import csv
+import os
+import sqlite3
+import threading
+
+from batching import RowBatcher
+from journal import call_now
+from sheets import QuotaGovernor, SheetsConnection, column_letter, open_worksheet
+from storage import LEAD_COLUMNS, append_lead_csv, append_leads_csv, lead_row
+
+SQL_COLUMNS = [column.lower() for column in LEAD_COLUMNS]
+# Rows fetched per read when iterating over the leads in a sheet
+PAGE_ROWS = 5000
+
+CREATE_LEADS = f"""
+CREATE TABLE IF NOT EXISTS leads (
+    id INTEGER PRIMARY KEY,
+    {', '.join(f'{column} TEXT NOT NULL' for column in SQL_COLUMNS)}
+);
+CREATE INDEX IF NOT EXISTS leads_timestamp ON leads (timestamp);
+"""
+
+INSERT_LEAD = f"INSERT INTO leads ({', '.join(SQL_COLUMNS)}) VALUES ({', '.join('?' * len(SQL_COLUMNS))})"
+
+
+class CsvLeadStore:
+    """The local backup CSV, written one lead at a time under a file lock"""
+
+    name = 'csv'
+
+    def __init__(self, path):
+        self.path = path
+
+    def submit(self, data):
+        return call_now(self.save, data)
+
+    def save(self, data):
+        append_lead_csv(self.path, data)
+
+    def save_many(self, leads):
+        append_leads_csv(self.path, leads)
+
+    def leads(self, columns=LEAD_COLUMNS):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, newline='', encoding='utf-8') as f:
+            yield from csv.DictReader(f)
+
+    def close(self, timeout=None):
+        pass
+
+
+class SheetsLeadStore:
+    """Google Sheets through a SheetsConnection, with rows batched into append_rows calls"""
+
+    name = 'sheets'
+
+    def __init__(self, connection, max_rows=100, max_delay=0.5):
+        self.connection = connection
+        self._batcher = RowBatcher(connection.append_rows, max_rows=max_rows, max_delay=max_delay,
+                                   name='sheets-batcher')
+
+    def submit(self, data):
+        return self._batcher.submit(lead_row(data))
+
+    def save(self, data):
+        self.connection.append_row(lead_row(data))
+
+    def save_many(self, leads):
+        self.connection.append_rows([lead_row(data) for data in leads])
+
+    def leads(self, columns=LEAD_COLUMNS, page_rows=PAGE_ROWS):
+        """Fetch the requested columns page_rows rows at a time, yielding each page as it arrives.
+
+        Only the span of columns from the first to the last requested one is
+        read. The API leaves blank rows out of the end of a range, so a short
+        page can be followed by more leads after a cleared row; paging stops
+        at the first page that comes back empty. Blank rows are skipped.
+        """
+        header = self.connection.row_values(1)
+        positions = {column: header.index(column) for column in columns if column in header}
+        if not positions:
+            return
+        first, last = min(positions.values()), max(positions.values())
+        start = 2
+        while True:
+            end = start + page_rows - 1
+            page = self.connection.get(f'{column_letter(first + 1)}{start}:{column_letter(last + 1)}{end}')
+            if not page:
+                return
+            for row in page:
+                if row:
+                    yield {column: row[i - first] if i - first < len(row) else ''
+                           for column, i in positions.items()}
+            start = end + 1
+
+    def stats(self):
+        return self._batcher.stats()
+
+    def close(self, timeout=None):
+        self._batcher.close(timeout)
+
+
+class SqliteLeadStore:
+    """SQLite database in WAL mode, safe to share between server processes.
+
+    Leads submitted concurrently are inserted by one writer thread in a single
+    transaction per batch, so the cost of a commit is shared. With the default
+    max_delay of 0 nothing waits for a batch to fill: whatever queued while the
+    previous commit ran goes into the next one. Inserts reuse one prepared
+    statement from the connection's statement cache.
+    """
+
+    name = 'sqlite'
+
+    def __init__(self, path, max_rows=500, max_delay=0.0, timeout=30.0):
+        self.path = path
+        self._lock = threading.Lock()
+        # Transactions are opened explicitly, so the module must not start its own
+        self._conn = sqlite3.connect(path, timeout=timeout, isolation_level=None, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        # A lead is acked in the journal once its commit returns, so commits must reach disk
+        self._conn.execute('PRAGMA synchronous=FULL')
+        self._conn.executescript(CREATE_LEADS)
+        self._batcher = RowBatcher(self.append_rows, max_rows=max_rows, max_delay=max_delay,
+                                   name='sqlite-writer')
+
+    def append_rows(self, rows):
+        """Insert rows given in LEAD_COLUMNS order in one transaction"""
+        with self._lock:
+            # IMMEDIATE takes the write lock up front, waiting out other processes' commits
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                self._conn.executemany(INSERT_LEAD, rows)
+                self._conn.execute('COMMIT')
+            except BaseException:
+                # A failed COMMIT leaves the transaction open; later BEGINs would fail
+                if self._conn.in_transaction:
+                    self._conn.execute('ROLLBACK')
+                raise
+
+    def submit(self, data):
+        return self._batcher.submit(lead_row(data))
+
+    def save(self, data):
+        self.append_rows([lead_row(data)])
+
+    def save_many(self, leads):
+        self.append_rows([lead_row(data) for data in leads])
+
+    def leads(self, columns=LEAD_COLUMNS):
+        # A separate connection reads a consistent WAL snapshot without blocking the writer
+        conn = sqlite3.connect(self.path)
+        try:
+            select = ', '.join(SQL_COLUMNS[LEAD_COLUMNS.index(column)] for column in columns)
+            for row in conn.execute(f'SELECT {select} FROM leads ORDER BY id'):
+                yield dict(zip(columns, row))
+        finally:
+            conn.close()
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM leads').fetchone()[0]
+
+    def stats(self):
+        return self._batcher.stats()
+
+    def close(self, timeout=None):
+        self._batcher.close(timeout)
+        with self._lock:
+            self._conn.close()
+
+
+def open_store(source, csv_file, sqlite_file, secrets_file=None, sheet_name=None, worksheet_name=None,
+               governor=None):
+    """Open a store by name for command line tools; 'sheets' reads credentials from secrets_file.
+
+    Sheets calls go through governor, by default one with the standard
+    per-minute quotas, so bulk imports and exports are admitted like the app's.
+    """
+    if source == 'sqlite':
+        return SqliteLeadStore(sqlite_file)
+    if source == 'sheets':
+        worksheet = open_worksheet(secrets_file, sheet_name, worksheet_name)
+        return SheetsLeadStore(SheetsConnection(lambda: worksheet, governor=governor or QuotaGovernor()))
+    return CsvLeadStore(csv_file)
@@ -0,0 +1,224 @@
+"""Per-rerun performance profile of app.py, enabled by setting UIS_PERF=1, and latency histograms"""
+import bisect
+import itertools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+
+ENABLED = os.environ.get('UIS_PERF', '') not in ('', '0')
+LOG_FILE = os.environ.get('UIS_PERF_LOG', 'perf_summary.jsonl')
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class LatencyHistogram:
+    """Counts of latencies in fixed millisecond buckets, cheap enough to keep always on.
+
+    Buckets are bounded above by BOUNDS_MS plus an overflow bucket, so rare
+    spikes such as a token refresh stay visible where a mean would hide them.
+    """
+
+    BOUNDS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = [0] * (len(self.BOUNDS_MS) + 1)
+        self._max_ms = 0.0
+
+    def record(self, seconds):
+        ms = seconds * 1000
+        index = bisect.bisect_left(self.BOUNDS_MS, ms)
+        with self._lock:
+            self._counts[index] += 1
+            self._max_ms = max(self._max_ms, ms)
+
+    def buckets(self):
+        """(label, count) for every bucket, e.g. ('<=50ms', 12), ending with the overflow bucket"""
+        with self._lock:
+            counts = list(self._counts)
+        labels = [f'<={bound}ms' for bound in self.BOUNDS_MS] + [f'>{self.BOUNDS_MS[-1]}ms']
+        return list(zip(labels, counts))
+
+    def summary(self):
+        """Call count, the upper bound of the buckets p50 and p99 fall in, max, and non-empty buckets"""
+        with self._lock:
+            counts = list(self._counts)
+            max_ms = self._max_ms
+        total = sum(counts)
+
+        def bound(pct):
+            if not total:
+                return 0.0
+            rank = max(1, round(pct / 100 * total))
+            for index, running in enumerate(itertools.accumulate(counts)):
+                if running >= rank:
+                    return round(min(self.BOUNDS_MS[index], max_ms) if index < len(self.BOUNDS_MS) else max_ms, 3)
+
+        return {
+            'count': total,
+            'p50_ms': bound(50),
+            'p99_ms': bound(99),
+            'max_ms': round(max_ms, 3),
+            'buckets': {label: n for label, n in self.buckets() if n},
+        }
+
+
+class PerfRecorder:
+    """Rolling window of script run profiles with percentile summaries.
+
+    Every log_every runs the current summary is appended to log_file as one
+    JSON line, so it can be followed with tail -f.
+    """
+
+    def __init__(self, window=1000, log_file=LOG_FILE, log_every=100):
+        self.log_file = log_file
+        self.log_every = log_every
+        self._runs = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self._since_log = 0
+
+    def record(self, run):
+        with self._lock:
+            self._runs.append(run)
+            self._since_log += 1
+            due = self.log_file and self._since_log >= self.log_every
+            if due:
+                self._since_log = 0
+        if due:
+            self.write_summary()
+
+    def summary(self):
+        """Return p50/p90/p99/max for run time, element counts, bytes and each section"""
+        with self._lock:
+            runs = list(self._runs)
+        series = {}
+        for run in runs:
+            for key in ('total_ms', 'elements', 'delta_bytes', 'html_bytes'):
+                series.setdefault(key, []).append(run[key])
+            for name, ms in run['sections'].items():
+                series.setdefault(f'section.{name}_ms', []).append(ms)
+        metrics = {}
+        for key, values in series.items():
+            values.sort()
+            metrics[key] = {
+                'p50': percentile(values, 50),
+                'p90': percentile(values, 90),
+                'p99': percentile(values, 99),
+                'max': values[-1],
+            }
+        return {'runs': len(runs), 'metrics': metrics}
+
+    def write_summary(self):
+        line = json.dumps({'time': time.strftime('%Y-%m-%d %H:%M:%S'), **self.summary()})
+        with open(self.log_file, 'a', encoding='utf-8') as f:
+            f.write(line + '\n')
+
+
+class RunProfile:
+    """Timings and output size of a single script run"""
+
+    def __init__(self, recorder):
+        self.recorder = recorder
+        self.started = time.perf_counter()
+        self.last_message_at = self.started
+        self.sections = {}
+        self.elements = 0
+        self.delta_bytes = 0
+        self.html_bytes = 0
+        self._finished = False
+
+    @contextmanager
+    def section(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            self.sections[name] = self.sections.get(name, 0.0) + elapsed
+
+    def count_message(self, msg):
+        if not msg.HasField('delta'):
+            return
+        self.last_message_at = time.perf_counter()
+        self.elements += 1
+        self.delta_bytes += msg.ByteSize()
+        if msg.delta.HasField('new_element'):
+            element = msg.delta.new_element
+            kind = element.WhichOneof('type')
+            if kind == 'markdown':
+                self.html_bytes += len(element.markdown.body.encode('utf-8'))
+            elif kind == 'html':
+                self.html_bytes += len(element.html.body.encode('utf-8'))
+
+    def finish(self, completed=True):
+        """Record the run; runs cut short by st.stop() or st.rerun() end at their last message"""
+        if self._finished:
+            return
+        self._finished = True
+        end = time.perf_counter() if completed else self.last_message_at
+        self.recorder.record({
+            'total_ms': (end - self.started) * 1000,
+            'sections': self.sections,
+            'elements': self.elements,
+            'delta_bytes': self.delta_bytes,
+            'html_bytes': self.html_bytes,
+            'completed': completed,
+        })
+
+
+class _NullProfile:
+    """Stand-in used when profiling is disabled, so instrumented code costs next to nothing"""
+
+    _section = nullcontext()
+
+    def section(self, name):
+        return self._section
+
+    def finish(self, completed=True):
+        pass
+
+
+NULL_PROFILE = _NullProfile()
+RECORDER = PerfRecorder()
+
+
+def _attach(ctx, profile):
+    """Route the session's outgoing messages through profile.count_message"""
+    previous = getattr(ctx, '_uis_profile', None)
+    if previous is not None:
+        # The previous run ended early (st.stop/st.rerun) without calling finish()
+        previous.finish(completed=False)
+    ctx._uis_profile = profile
+    if getattr(ctx, '_uis_counting', False):
+        return
+    enqueue = ctx._enqueue
+
+    def counting_enqueue(msg):
+        current = getattr(ctx, '_uis_profile', None)
+        if current is not None:
+            current.count_message(msg)
+        enqueue(msg)
+
+    ctx._enqueue = counting_enqueue
+    ctx._uis_counting = True
+
+
+def start_run():
+    """Begin profiling the current script run; returns a no-op profile when disabled"""
+    if not ENABLED:
+        return NULL_PROFILE
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+    profile = RunProfile(RECORDER)
+    ctx = get_script_run_ctx()
+    if ctx is not None:
+        _attach(ctx, profile)
+    return profile
@@ -0,0 +1,442 @@
+"""Helpers for writing leads to Google Sheets"""
+import copy
+import random
+import threading
+import time
+from collections import Counter, deque
+from datetime import datetime, timezone
+
+from perf import LatencyHistogram
+
+READ = 'read'
+WRITE = 'write'
+READ_METHODS = {'get_all_values', 'get_values', 'get', 'row_values', 'col_values', 'acell', 'cell'}
+# Opening the spreadsheet, looking up the worksheet and checking its header
+CONNECT_READS = 3
+
+
+def open_worksheet(secrets_file, sheet_name, worksheet_name):
+    """Open a worksheet with the service account in a Streamlit secrets.toml, for command line tools"""
+    import tomllib
+
+    import gspread
+    with open(secrets_file, 'rb') as f:
+        creds_dict = tomllib.load(f)['gcp_service_account']
+    return gspread.service_account_from_dict(creds_dict).open(sheet_name).worksheet(worksheet_name)
+
+
+def column_letter(col):
+    """A1-notation letters of a 1-based column number, e.g. 1 -> 'A', 27 -> 'AA'"""
+    letters = ''
+    while col:
+        col, remainder = divmod(col - 1, 26)
+        letters = chr(ord('A') + remainder) + letters
+    return letters
+
+
+def ensure_header(worksheet, header):
+    """Make sure row 1 of the worksheet holds header, reading only that row.
+
+    An empty sheet or a header missing trailing columns is rewritten in place.
+    If row 1 holds a lead instead of a header, the header is inserted above
+    it. A row 1 that looks like a differently named header is left alone.
+    Returns True when the sheet was changed.
+    """
+    first_row = worksheet.row_values(1)
+    if first_row == header:
+        return False
+    if first_row == header[:len(first_row)]:
+        worksheet.update(range_name='A1', values=[header])
+        return True
+    if any(cell in header for cell in first_row):
+        return False
+    worksheet.insert_row(header, 1)
+    return True
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling Google Sheets while the circuit breaker is open"""
+
+
+class CircuitBreaker:
+    """Closed/open/half-open breaker with exponential backoff and jitter.
+
+    After failure_threshold consecutive failures the breaker opens and calls
+    fail fast. Once the backoff delay has passed a single trial call is let
+    through (half-open); its outcome closes the breaker or opens it again with
+    a doubled delay, capped at max_delay.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold=3, base_delay=1.0, max_delay=300.0):
+        self.failure_threshold = failure_threshold
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_count = 0
+        self._total_opens = 0
+        self._retry_at = 0.0
+        self._last_error = None
+
+    def allow(self):
+        """Return True if a call may go through now"""
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN and time.monotonic() >= self._retry_at:
+                self._state = self.HALF_OPEN
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._opened_count = 0
+            self._last_error = None
+
+    def abort_trial(self):
+        """Hand back a half-open trial that was never attempted so the next call can take it"""
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                self._state = self.OPEN
+                self._retry_at = time.monotonic()
+
+    def record_failure(self, error=None):
+        with self._lock:
+            self._failures += 1
+            self._last_error = repr(error) if error is not None else None
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                delay = min(self.max_delay, self.base_delay * 2 ** self._opened_count)
+                # Equal jitter keeps processes that failed together from retrying together
+                self._retry_at = time.monotonic() + delay / 2 + random.uniform(0, delay / 2)
+                self._opened_count += 1
+                self._total_opens += 1
+                self._state = self.OPEN
+
+    def stats(self):
+        with self._lock:
+            return {
+                'state': self._state,
+                'consecutive_failures': self._failures,
+                'times_opened': self._total_opens,
+                'retry_in': max(0.0, self._retry_at - time.monotonic()) if self._state == self.OPEN else 0.0,
+                'last_error': self._last_error,
+            }
+
+
+class QuotaDeferred(Exception):
+    """Raised when a call would have to wait longer than the governor allows for quota"""
+
+
+class TokenBucket:
+    """Tokens refill continuously at rate per second up to capacity"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, tokens, max_wait):
+        """Take tokens, returning how long the caller must wait before using them.
+
+        Returns None without taking anything if the wait would exceed max_wait.
+        Tokens may go negative, which queues later callers behind this one.
+        """
+        now = time.monotonic()
+        self._refill(now)
+        wait = max(0.0, (tokens - self._tokens) / self.rate)
+        if wait > max_wait:
+            return None
+        self._tokens -= tokens
+        return wait
+
+    def level(self):
+        self._refill(time.monotonic())
+        return self._tokens
+
+
+class QuotaGovernor:
+    """Process-wide token buckets keeping Sheets API calls under the per-minute quotas.
+
+    Google Sheets allows a fixed number of read and write requests per minute.
+    Each bucket refills at headroom * quota per minute, and its burst capacity
+    is the rest of the quota, so no rolling minute can exceed the quota. Calls
+    over the rate wait their turn; a call that would wait longer than max_wait
+    raises QuotaDeferred so the caller can retry later instead of burning quota
+    on a 429.
+    """
+
+    def __init__(self, reads_per_minute=60, writes_per_minute=60, headroom=0.9, max_wait=10.0):
+        self.max_wait = max_wait
+        self._lock = threading.Lock()
+        self._buckets = {
+            READ: TokenBucket(reads_per_minute * headroom / 60, max(1, round(reads_per_minute * (1 - headroom)))),
+            WRITE: TokenBucket(writes_per_minute * headroom / 60, max(1, round(writes_per_minute * (1 - headroom)))),
+        }
+        self._waits = {READ: deque(maxlen=1000), WRITE: deque(maxlen=1000)}
+        self._throttled = Counter()
+        self._deferred = Counter()
+        self._total_wait = Counter()
+
+    @staticmethod
+    def kind(method):
+        return READ if method in READ_METHODS else WRITE
+
+    def acquire(self, kind, tokens=1):
+        """Block until tokens are available; returns the seconds waited"""
+        with self._lock:
+            wait = self._buckets[kind].reserve(tokens, self.max_wait)
+            if wait is None:
+                self._deferred[kind] += 1
+            else:
+                self._waits[kind].append(wait)
+                self._total_wait[kind] += wait
+                if wait > 0:
+                    self._throttled[kind] += 1
+        if wait is None:
+            raise QuotaDeferred(f'Sheets {kind} quota exhausted, deferring call')
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def stats(self):
+        """Current token levels and throttle wait times, for sizing campaigns"""
+        with self._lock:
+            result = {}
+            for kind, bucket in self._buckets.items():
+                waits = sorted(self._waits[kind])
+                result[kind] = {
+                    'tokens': round(bucket.level(), 2),
+                    'capacity': bucket.capacity,
+                    'per_minute': bucket.rate * 60,
+                    'calls': len(waits),
+                    'throttled_calls': self._throttled[kind],
+                    'deferred_calls': self._deferred[kind],
+                    'total_wait_s': round(self._total_wait[kind], 3),
+                    'wait_p50_ms': waits[len(waits) // 2] * 1000 if waits else 0.0,
+                    'wait_p99_ms': waits[min(len(waits) - 1, int(len(waits) * 0.99))] * 1000 if waits else 0.0,
+                    'wait_max_ms': waits[-1] * 1000 if waits else 0.0,
+                }
+            return result
+
+
+class SheetsConnection:
+    """Owns the worksheet and reconnects through a circuit breaker.
+
+    connect() opens a fresh worksheet. It is called lazily on first use and
+    again on the first trial call after the breaker has opened, so a transient
+    failure at startup or a dead worksheet heals without a restart, while
+    calls made during an outage fail fast with CircuitOpenError. With a
+    governor, every call (and each reconnect) first waits for quota.
+    warm_up() opens the worksheet in a background thread instead; calls made
+    while it is still running wait for it rather than connecting again.
+    """
+
+    def __init__(self, connect, breaker=None, governor=None):
+        self.connect = connect
+        self.breaker = breaker or CircuitBreaker()
+        self.governor = governor
+        self._lock = threading.Lock()
+        self._worksheet = None
+        self._warm_up = None
+        # Per worksheet method, so the form's synchronous append_row shows next to batched append_rows
+        self._latency = {}
+
+    def call(self, method, *args, **kwargs):
+        """Call a worksheet method, reconnecting or failing fast as the breaker dictates"""
+        self.wait_ready()
+        if not self.breaker.allow():
+            raise CircuitOpenError(f'Google Sheets unavailable, retry in {self.breaker.stats()["retry_in"]:.0f}s')
+        if self.governor is not None:
+            try:
+                if self._worksheet is None:
+                    self.governor.acquire(READ, CONNECT_READS)
+                self.governor.acquire(self.governor.kind(method))
+            except QuotaDeferred:
+                self.breaker.abort_trial()
+                raise
+        try:
+            with self._lock:
+                if self._worksheet is None:
+                    self._worksheet = self.connect()
+                worksheet = self._worksheet
+            started = time.perf_counter()
+            result = getattr(worksheet, method)(*args, **kwargs)
+        except Exception as e:
+            self.breaker.record_failure(e)
+            if self.breaker.stats()['state'] == CircuitBreaker.OPEN:
+                # Start from a fresh connection on the next trial call
+                with self._lock:
+                    self._worksheet = None
+            raise
+        self.breaker.record_success()
+        latency = self._latency.get(method)
+        if latency is None:
+            latency = self._latency.setdefault(method, LatencyHistogram())
+        latency.record(time.perf_counter() - started)
+        return result
+
+    def try_connect(self):
+        """Open the worksheet now if possible; returns True on success"""
+        try:
+            self.call('row_values', 1)
+        except Exception:
+            return False
+        return True
+
+    def warm_up(self):
+        """Start connecting in a background thread and return self without waiting"""
+        with self._lock:
+            if self._warm_up is None:
+                self._warm_up = threading.Thread(target=self.try_connect, name='sheets-warm-up', daemon=True)
+                self._warm_up.start()
+        return self
+
+    def wait_ready(self, timeout=None):
+        """Wait for a warm-up still in progress; returns True once the worksheet is open"""
+        thread = self._warm_up
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+        return self._worksheet is not None
+
+    def row_values(self, row, **kwargs):
+        return self.call('row_values', row, **kwargs)
+
+    def col_values(self, col, **kwargs):
+        return self.call('col_values', col, **kwargs)
+
+    def get(self, range_name, **kwargs):
+        return self.call('get', range_name, **kwargs)
+
+    def append_row(self, values, **kwargs):
+        return self.call('append_row', values, **kwargs)
+
+    def append_rows(self, values, **kwargs):
+        return self.call('append_rows', values, **kwargs)
+
+    def stats(self):
+        warming_up = self._warm_up is not None and self._warm_up.is_alive()
+        stats = {'connected': self._worksheet is not None, 'warming_up': warming_up, **self.breaker.stats(),
+                 'latency': {method: latency.summary() for method, latency in list(self._latency.items())}}
+        if self.governor is not None:
+            stats['quota'] = self.governor.stats()
+        return stats
+
+
+class TokenRefresher:
+    """Renew OAuth credentials from a background thread before they expire.
+
+    google-auth refreshes an access token inside the first request made once
+    the token is close to expiry, so about once an hour one Sheets call also
+    waits for the token round trip. Credentials passed to watch() are instead
+    renewed margin seconds before they expire: a copy is refreshed and its
+    token swapped into the live credentials, which requests keep using
+    throughout. margin must exceed google-auth's own refresh threshold
+    (3 min 45 s) or requests would still refresh first.
+    """
+
+    def __init__(self, margin=300.0, retry_delay=30.0, request=None):
+        self.margin = margin
+        self.retry_delay = retry_delay
+        self.request = request
+        self._cond = threading.Condition()
+        self._credentials = None
+        self._retry_at = 0.0
+        self._closed = False
+        self._thread = None
+        self._refreshes = 0
+        self._failures = 0
+        self._last_error = None
+        self._latency = LatencyHistogram()
+
+    def watch(self, credentials):
+        """Keep credentials fresh from now on, in place of any watched before (e.g. after a reconnect)"""
+        with self._cond:
+            self._credentials = credentials
+            self._retry_at = 0.0
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='sheets-token-refresher', daemon=True)
+                self._thread.start()
+            self._cond.notify()
+        return self
+
+    def due_in(self, credentials):
+        """Seconds until credentials should be renewed, 0 if they already should be"""
+        if not credentials.token or credentials.expiry is None:
+            return 0.0
+        # google-auth keeps expiry as a naive UTC datetime
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        return max(0.0, (credentials.expiry - now).total_seconds() - self.margin)
+
+    def refresh(self, credentials):
+        """Refresh a copy of credentials and swap its token into the live object"""
+        request = self.request
+        if request is None:
+            from google.auth.transport.requests import Request
+            request = Request()
+        fresh = copy.copy(credentials)
+        fresh.refresh(request)
+        # Token first: until the expiry follows, requests pair the new token with
+        # the old expiry, which is still margin seconds away and so still valid
+        credentials.token = fresh.token
+        credentials.expiry = fresh.expiry
+
+    def _next(self):
+        """Wait until the watched credentials are due; returns them, or None once closed"""
+        with self._cond:
+            while not self._closed:
+                credentials = self._credentials
+                delay = max(self.due_in(credentials), self._retry_at - time.monotonic())
+                if delay <= 0:
+                    return credentials
+                self._cond.wait(delay)
+            return None
+
+    def _run(self):
+        while True:
+            credentials = self._next()
+            if credentials is None:
+                return
+            started = time.perf_counter()
+            try:
+                self.refresh(credentials)
+            except Exception as e:
+                with self._cond:
+                    self._failures += 1
+                    self._last_error = repr(e)
+                    # Still margin seconds of validity left, so retry well before it runs out
+                    self._retry_at = time.monotonic() + self.retry_delay
+                continue
+            self._latency.record(time.perf_counter() - started)
+            with self._cond:
+                self._refreshes += 1
+                self._last_error = None
+                self._retry_at = 0.0
+
+    def stats(self):
+        with self._cond:
+            credentials = self._credentials
+            stats = {
+                'refreshes': self._refreshes,
+                'failures': self._failures,
+                'last_error': self._last_error,
+                'refresh_latency': self._latency.summary(),
+            }
+        stats['refresh_in'] = self.due_in(credentials) if credentials is not None else None
+        return stats
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
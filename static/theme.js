@@ -0,0 +1,54 @@
+// Theme behaviour that CSS alone cannot express.
+//
+// All static styling (selectbox text colours and sizes, dropdown arrows, the
+// text input error state) lives in theme.css. The only thing left here is the
+// selectbox error state: a select showing a "⚠️ Please select..." prompt gets
+// the uis-error class, because CSS cannot match on text content.
+//
+// One observer watches the app container and re-checks at most once per
+// debounce window after Streamlit re-renders. Classes are only written when
+// they change and attribute mutations are not observed, so our own writes
+// never trigger another pass.
+(function () {
+    const WARNING = '⚠️';
+    const DEBOUNCE_MS = 100;
+    let timer = null;
+
+    // Count of DOM style/class writes; read window.uisStyleWrites in the console to measure
+    window.uisStyleWrites = 0;
+
+    function markSelectErrors() {
+        timer = null;
+        document.querySelectorAll('.stSelectbox').forEach(select => {
+            const control = select.querySelector('[data-baseweb="select"]');
+            const hasError = !!control && control.textContent.includes(WARNING);
+            if (select.classList.contains('uis-error') !== hasError) {
+                select.classList.toggle('uis-error', hasError);
+                window.uisStyleWrites++;
+            }
+        });
+    }
+
+    function scheduleCheck() {
+        if (timer !== null) {
+            clearTimeout(timer);
+        }
+        timer = setTimeout(markSelectErrors, DEBOUNCE_MS);
+    }
+
+    function start() {
+        const root = document.querySelector('[data-testid="stAppViewContainer"]') || document.body;
+        new MutationObserver(scheduleCheck).observe(root, {
+            childList: true,
+            subtree: true,
+            characterData: true
+        });
+        markSelectErrors();
+    }
+
+    if (document.readyState === 'loading') {
+        document.addEventListener('DOMContentLoaded', start);
+    } else {
+        start();
+    }
+})();
@@ -0,0 +1,120 @@
+"""Local lead storage used when Google Sheets is unavailable"""
+import csv
+import io
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+LEAD_COLUMNS = ['Timestamp', 'Name', 'Email', 'Phone', 'State', 'Insurance_Type', 'Notes', 'Status', 'Source']
+
+
+_thread_locks = {}
+_thread_locks_guard = threading.Lock()
+
+
+def _thread_lock(path):
+    """One lock per file so threads of this process queue up before taking the file lock"""
+    key = os.path.abspath(path)
+    with _thread_locks_guard:
+        return _thread_locks.setdefault(key, threading.Lock())
+
+
+def try_lock_file(f):
+    """Take an exclusive advisory lock on an open file without waiting; True on success"""
+    try:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            # msvcrt locks a byte range from the current position, so always lock byte 0
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+    except OSError:
+        return False
+    return True
+
+
+def unlock_file(f):
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+@contextmanager
+def locked_file(f):
+    """Hold an exclusive advisory lock on f, shared by every thread and process using the file"""
+    with _thread_lock(f.name):
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            while not try_lock_file(f):
+                time.sleep(0.01)
+        try:
+            yield f
+        finally:
+            unlock_file(f)
+
+
+def lead_row(data):
+    """Return the lead as a list of values in LEAD_COLUMNS order"""
+    return [data.get(column, '') for column in LEAD_COLUMNS]
+
+
+def _read_header(f):
+    """Return the header of an already opened CSV file, or None if it is empty"""
+    f.seek(0)
+    first_line = f.readline()
+    if not first_line:
+        return None
+    return next(csv.reader([first_line]))
+
+
+def _missing_trailing_newline(csv_file):
+    """Check the last byte so a truncated final row is not glued to the next one"""
+    with open(csv_file, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        if f.tell() == 0:
+            return False
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) not in (b'\n', b'\r')
+
+
+def _format_rows(rows):
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator='\n').writerows(rows)
+    return buffer.getvalue()
+
+
+def append_lead_csv(csv_file, data):
+    """Append one lead to csv_file without rewriting the existing rows.
+
+    Only the header line and the last byte of the file are read, so the cost
+    of a write does not depend on how many leads the file already holds. The
+    file is locked for the whole read-then-append, so several server processes
+    can share one backup file without losing rows, interleaving partial rows or
+    writing the header twice.
+    """
+    append_leads_csv(csv_file, [data])
+
+
+def append_leads_csv(csv_file, leads):
+    """Append several leads to csv_file in one locked write, see append_lead_csv"""
+    with open(csv_file, 'a+', newline='', encoding='utf-8') as f, locked_file(f):
+        header = _read_header(f)
+        text = '\n' if _missing_trailing_newline(csv_file) else ''
+        rows = []
+        if header is None:
+            header = LEAD_COLUMNS
+            rows.append(header)
+        # Follow the column order of the existing file so older backups stay consistent
+        rows.extend([data.get(column, '') for column in header] for data in leads)
+        f.write(text + _format_rows(rows))
+        f.flush()
@@ -0,0 +1,76 @@
+"""Elements app.py sends per run, checked headlessly with Streamlit's AppTest.
+
+Every element and block costs a delta on the websocket on every rerun, so a
+change that adds some should update these counts on purpose.
+"""
+import os
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+APP = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'app.py')
+
+VALID_FORM = {
+    'first_name': 'Jane',
+    'last_name': 'Doe',
+    'email': 'Jane.Doe@Example.com',
+    'phone': '(555) 123-4567',
+    'state': 'Massachusetts',
+    'insurance_type': 'Medicare',
+}
+
+
+@pytest.fixture(autouse=True)
+def local_storage(tmp_path_factory, monkeypatch):
+    # Sheets is not configured, so leads go to the CSV and journal in the working directory;
+    # st.cache_resource keeps the files it opened first, so every test shares one directory
+    monkeypatch.chdir(tmp_path_factory.getbasetemp())
+    monkeypatch.delenv('UIS_FAKE_SHEETS', raising=False)
+    monkeypatch.setenv('UIS_LEAD_STORE', 'csv')
+
+
+def new_app():
+    at = AppTest.from_file(APP, default_timeout=30).run()
+    assert not at.exception
+    return at
+
+
+def fill_form(at, form):
+    for key in ('first_name', 'last_name', 'email', 'phone'):
+        at.text_input(key=key).input(form[key])
+    at.selectbox(key='state').select(form['state'])
+    at.selectbox(key='insurance_type').select(form['insurance_type'])
+
+
+def element_count(at):
+    """Elements and blocks below the page's root containers, i.e. the deltas of the last run"""
+    def descendants(node):
+        children = getattr(node, 'children', None) or {}
+        return sum(1 + descendants(child) for child in children.values())
+    return descendants(at.main) + descendants(at.sidebar)
+
+
+def test_first_render():
+    assert element_count(new_app()) == 24
+
+
+def test_rerun():
+    at = new_app().run()
+    assert not at.exception
+    assert element_count(at) == 24
+
+
+def test_invalid_submit():
+    at = new_app()
+    fill_form(at, {**VALID_FORM, 'email': 'not-an-email'})
+    at.button[0].click().run()
+    assert at.session_state.show_errors
+    assert element_count(at) == 24
+
+
+def test_valid_submit():
+    at = new_app()
+    fill_form(at, VALID_FORM)
+    at.button[0].click().run()
+    assert at.session_state.show_success
+    assert element_count(at) == 16
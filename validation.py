@@ -0,0 +1,75 @@
+"""Lead validation rules shared by the web form and the bulk importer"""
+import re
+
+from catalog import INSURANCE_TYPES, LICENSED_STATES
+
+EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+NON_DIGITS = re.compile(r'\D')
+PHONE_DIGITS = 10
+MIN_NAME_LENGTH = 2
+
+# Case and spacing of partner data varies, so look values up by their folded form
+STATE_LOOKUP = {state.lower(): state for state in LICENSED_STATES}
+INSURANCE_TYPE_LOOKUP = {insurance_type.lower(): insurance_type for insurance_type in INSURANCE_TYPES}
+
+
+def validate_email(email):
+    return EMAIL_PATTERN.match(email) is not None
+
+
+def validate_phone(phone):
+    return len(NON_DIGITS.sub('', phone)) == PHONE_DIGITS
+
+
+def validate_name(name):
+    return len(name.strip()) >= MIN_NAME_LENGTH
+
+
+def normalize_email(email):
+    return str(email).strip().lower()
+
+
+def normalize_phone(phone):
+    return NON_DIGITS.sub('', str(phone))
+
+
+def validate_frame(frame):
+    """Validate and normalize a DataFrame of leads a whole column at a time.
+
+    frame holds strings in First_Name, Last_Name, Email, Phone, State and
+    Insurance_Type. Returns (accepted, rejected): accepted has the normalized
+    Name, Email, Phone, State and Insurance_Type of valid rows, the way the
+    web form stores them; rejected has a Reasons column for every other row.
+    Both keep the index of frame so rows can be traced back to the file.
+    """
+    first = frame['First_Name'].str.strip()
+    last = frame['Last_Name'].str.strip()
+    email = frame['Email'].str.strip()
+    phone = frame['Phone'].str.replace(NON_DIGITS, '', regex=True)
+    state = frame['State'].str.strip().str.lower().map(STATE_LOOKUP)
+    insurance_type = frame['Insurance_Type'].str.strip().str.lower().map(INSURANCE_TYPE_LOOKUP)
+    checks = [
+        (first.str.len() < MIN_NAME_LENGTH, 'first name too short'),
+        (last.str.len() < MIN_NAME_LENGTH, 'last name too short'),
+        (~email.str.match(EMAIL_PATTERN), 'invalid email'),
+        (phone.str.len() != PHONE_DIGITS, f'phone is not {PHONE_DIGITS} digits'),
+        (state.isna(), 'state not licensed'),
+        (insurance_type.isna(), 'unknown insurance type'),
+    ]
+    failed = checks[0][0]
+    for mask, _ in checks[1:]:
+        failed = failed | mask
+    accepted = (first[~failed] + ' ' + last[~failed]).to_frame('Name')
+    accepted['Email'] = email[~failed].str.lower()
+    accepted['Phone'] = phone[~failed]
+    accepted['State'] = state[~failed]
+    accepted['Insurance_Type'] = insurance_type[~failed]
+    # Reasons are only built for the (usually few) rejected rows
+    rejected = frame[failed].copy()
+    # An all-empty string column on the rejected index, to append reasons to
+    reasons = rejected['Email'].str.slice(0, 0)
+    for mask, reason in checks:
+        hit = mask[failed]
+        reasons = reasons.where(~hit, reasons + reason + '; ')
+    rejected['Reasons'] = reasons.str.rstrip('; ')
+    return accepted, rejected
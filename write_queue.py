@@ -0,0 +1,89 @@
+"""Background delivery of journaled leads off the Streamlit script thread"""
+import queue
+import threading
+
+_STOP = object()
+
+
+class LeadWriteQueue:
+    """Bounded queue of journaled leads drained by a small pool of worker threads.
+
+    put() never blocks: when the queue is full the lead is left in the journal
+    (it is already on disk) and the journal replayer picks it up later. Workers
+    hand leads to submit(data), which returns a Future; at most max_in_flight
+    deliveries are outstanding so a slow destination pushes back on the queue.
+    """
+
+    def __init__(self, journal, submit, maxsize=500, workers=2, max_in_flight=200):
+        self.journal = journal
+        self.submit = submit
+        self._queue = queue.Queue(maxsize)
+        self._in_flight = threading.BoundedSemaphore(max_in_flight)
+        self._cond = threading.Condition()
+        self._outstanding = 0
+        self._closed = False
+        self._spilled = 0
+        self._workers = [
+            threading.Thread(target=self._run, name=f'lead-writer-{i}', daemon=True)
+            for i in range(workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def put(self, record_id, data):
+        """Queue a journaled lead; returns False if it was spilled to the journal instead"""
+        with self._cond:
+            if self._closed or not self.journal.claim(record_id):
+                return False
+            try:
+                self._queue.put_nowait((record_id, data))
+            except queue.Full:
+                self.journal.release(record_id)
+                self._spilled += 1
+                return False
+            self._outstanding += 1
+        return True
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            record_id, data = item
+            self._in_flight.acquire()
+            try:
+                future = self.submit(data)
+            except Exception:
+                self._finish(record_id, None)
+                continue
+            future.add_done_callback(lambda f, record_id=record_id: self._finish(record_id, f))
+
+    def _finish(self, record_id, future):
+        if future is not None and future.exception() is None:
+            self.journal.ack(record_id)
+        else:
+            self.journal.release(record_id)
+        self._in_flight.release()
+        with self._cond:
+            self._outstanding -= 1
+            self._cond.notify_all()
+
+    def stats(self):
+        with self._cond:
+            return {
+                'queued': self._queue.qsize(),
+                'outstanding': self._outstanding,
+                'spilled': self._spilled,
+            }
+
+    def close(self, timeout=10.0):
+        """Stop accepting leads and wait up to timeout seconds for queued ones to be delivered.
+
+        Anything not delivered in time stays in the journal for the next start.
+        """
+        with self._cond:
+            self._closed = True
+        for _ in self._workers:
+            self._queue.put(_STOP)
+        with self._cond:
+            self._cond.wait_for(lambda: self._outstanding == 0, timeout)